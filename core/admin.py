@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
-from .models import User, Category, Tag, BlogPost, Event, ContactMessage
+from .dashboard import invalidate_stats
+from .models import User, Category, Tag, BlogPost, Event, Registration, ContactMessage, Task
 
 
 @admin.register(User)
@@ -132,6 +133,15 @@ class EventAdmin(admin.ModelAdmin):
     registered_capacity.short_description = 'Inscritos/Capacidade'
 
 
+@admin.register(Registration)
+class RegistrationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'created_at')
+    list_filter = ('event', 'created_at')
+    search_fields = ('user__username', 'user__email', 'event__title')
+    raw_id_fields = ('user', 'event')
+    ordering = ('-created_at',)
+
+
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'subject', 'is_read', 'created_at')
@@ -147,15 +157,28 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         queryset.update(is_read=True)
+        invalidate_stats()
         self.message_user(request, f'{queryset.count()} mensagens marcadas como lidas.')
     mark_as_read.short_description = 'Marcar como lida'
     
     def mark_as_unread(self, request, queryset):
         queryset.update(is_read=False)
+        invalidate_stats()
         self.message_user(request, f'{queryset.count()} mensagens marcadas como não lidas.')
     mark_as_unread.short_description = 'Marcar como não lida'
 
 
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('name', 'args', 'kwargs', 'attempts', 'locked_at', 'last_error', 'created_at', 'updated_at')
+    ordering = ('-created_at',)
+    
+    def has_add_permission(self, request):
+        return False  # Tasks are queued by the application
+
+
 # Customize admin site
 admin.site.site_header = 'NEABI - Administração'
 admin.site.site_title = 'NEABI Admin'
@@ -0,0 +1,73 @@
+"""Precompiled Tailwind stylesheet.
+
+``manage.py build_css`` runs the Tailwind CLI over the project templates
+and writes a minified ``static/css/tailwind.css`` containing only the
+classes in use. ``collectstatic`` then copies it under a content-hashed
+name through ``ManifestStaticFilesStorage``, so the bundle can be cached
+forever and browsers no longer compile CSS at runtime.
+
+The CLI is looked up in ``TAILWIND_CLI``, the project's
+``node_modules/.bin`` (``npm install`` once, from ``package.json``) and
+finally ``PATH``; the standalone binary works as well. Nothing is
+downloaded during the build.
+"""
+import logging
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+
+from .staticfiles import CompressedManifestStaticFilesStorage
+
+logger = logging.getLogger(__name__)
+
+BUNDLE = 'css/tailwind.css'
+
+
+def content_globs():
+    """Files scanned for class names, both template trees by default."""
+    default = [
+        settings.BASE_DIR / 'templates' / '**' / '*.html',
+        settings.BASE_DIR / 'django_backend' / 'templates' / '**' / '*.html',
+        settings.BASE_DIR / 'core' / '**' / '*.py',
+    ]
+    return [str(path) for path in getattr(settings, 'TAILWIND_CONTENT', default)]
+
+
+def output_path():
+    return Path(settings.STATICFILES_DIRS[0]) / BUNDLE
+
+
+def find_cli():
+    """Return the Tailwind CLI command as an argument list, or None."""
+    configured = getattr(settings, 'TAILWIND_CLI', None) or os.environ.get('TAILWIND_CLI')
+    if configured:
+        return [configured]
+    local = Path(settings.BASE_DIR) / 'node_modules' / '.bin' / 'tailwindcss'
+    if local.exists():
+        return [str(local)]
+    found = shutil.which('tailwindcss')
+    if found:
+        return [found]
+    return None
+
+
+def bundle_available():
+    from django.contrib.staticfiles import finders
+    return finders.find(BUNDLE) is not None
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Compressed manifest storage that serves unknown files unhashed instead of failing.
+
+    ``includes/meta_tags.html`` points at icons that are not checked in yet;
+    with the stock storage every page would raise once DEBUG is off.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            logger.warning('Static file %s is missing from the manifest', name)
+            return name
@@ -0,0 +1,115 @@
+"""Async versions of the read-heavy public views.
+
+``neabi_django/asgi.py`` turns on ``ASYNC_VIEWS``, and ``core.urls`` then
+routes the home page, the blog and event lists and their detail pages to
+the views below instead of those in ``core.views``. They subclass the sync
+views and keep their querysets, templates, content cache entries,
+conditional GET and keyset pagination; only the steps that hit the
+database or the cache are replaced with async ORM and cache calls. While
+one request waits on those, or on a slow client, the worker's event loop
+keeps serving the others.
+
+Responses are ``TemplateResponse`` objects, which Django renders in its
+sync thread, because the templates read ``user`` and the flash messages
+lazily.
+"""
+from django.shortcuts import aget_object_or_404
+from django.template.response import TemplateResponse
+
+from . import content_cache, views
+from .conditional import alatest_update, arespond
+from .forms import SearchForm
+from .models import Event
+from .view_counter import arecord_view
+
+
+class AsyncListMixin:
+    """Async ``get`` for the conditional, keyset-paginated list views"""
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        return await arespond(
+            request, None, [request.get_full_path(), await alatest_update(request, self.object_list)],
+            self.arender,
+        )
+
+    async def arender(self):
+        queryset = self.object_list
+        paginator, page, object_list, is_paginated = await self.apaginate_queryset(
+            queryset, self.get_paginate_by(queryset)
+        )
+        context = {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': object_list,
+            self.get_context_object_name(object_list): object_list,
+            'view': self,
+            **self.get_page_context(page),
+            **await self.aget_extra_context(),
+        }
+        return TemplateResponse(self.request, self.get_template_names(), context)
+
+    async def aget_extra_context(self):
+        return {}
+
+
+class AsyncDetailMixin:
+    """Async ``get`` for the conditional detail views"""
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await arespond(request, None, self.get_validator_parts(), self.arender)
+
+    async def aget_object(self):
+        slug = self.kwargs[self.slug_url_kwarg]
+        return await aget_object_or_404(self.get_queryset(), **{self.slug_field: slug})
+
+    async def arender(self):
+        context = self.get_context_data(object=self.object)
+        return TemplateResponse(self.request, self.get_template_names(), context)
+
+
+async def home_view(request):
+    """Home page view"""
+    context = {
+        'featured_events': await views.featured_events(content_cache.acached_list),
+        'recent_posts': await views.recent_posts(content_cache.acached_list),
+    }
+    return TemplateResponse(request, 'pages/home.html', context)
+
+
+class BlogListView(AsyncListMixin, views.BlogListView):
+    """Blog posts list view"""
+
+    async def aget_extra_context(self):
+        return {
+            'categories': await views.blog_categories(content_cache.acached_list),
+            'featured_posts': await views.featured_posts(content_cache.acached_list),
+            'search_form': SearchForm(self.request.GET),
+        }
+
+
+class BlogDetailView(AsyncDetailMixin, views.BlogDetailView):
+    """Blog post detail view"""
+
+    async def aget_object(self):
+        obj = await super().aget_object()
+        await arecord_view(obj)
+        obj.views += 1
+        return obj
+
+
+class EventListView(AsyncListMixin, views.EventListView):
+    """Events list view"""
+
+    async def aget_extra_context(self):
+        return {
+            'featured_events': await views.featured_events(content_cache.acached_list),
+            'categories': await views.event_categories(content_cache.acached_list),
+            'event_types': Event.TYPE_CHOICES,
+        }
+
+
+class EventDetailView(AsyncDetailMixin, views.EventDetailView):
+    """Event detail view"""
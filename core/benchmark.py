@@ -0,0 +1,354 @@
+"""HTTP benchmark for the public pages.
+
+``manage.py benchmark_http`` drives a running server (by default
+``http://127.0.0.1:8000``) from a pool of worker threads, records the
+latency of every request and reports p50, p95 and p99 plus throughput per
+endpoint. Run it against a local server started on a
+``generate_load_data`` dataset, so detail pages and searches hit realistic
+table sizes.
+
+Results are plain JSON. ``compare`` checks them against a stored baseline:
+an endpoint regresses when its p95 grows, or its throughput drops, by more
+than the allowed fraction, when its error rate rises, or when it no longer
+completes any request.
+
+``arun_endpoint`` drives GET endpoints from a single asyncio event loop
+instead of threads, so ``manage.py benchmark_asgi`` can hold a thousand
+keep-alive connections open against a WSGI and an ASGI server.
+"""
+import asyncio
+import http.client
+import itertools
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.urls import reverse
+
+from .models import BlogPost, Event
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Endpoint:
+    """One request to repeat; ``expect`` is the status that counts as success"""
+    name: str
+    path: str
+    method: str = 'GET'
+    expect: int = 200
+    # form(connection, path) -> (body, headers), called before every request
+    form: callable = None
+
+
+@dataclass
+class Result:
+    """Latencies (in seconds) and status counts collected for one endpoint"""
+    endpoint: Endpoint
+    latencies: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    cache_hits: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def add(self, status, latency, cache_hit=False):
+        """Count one response; a ``status`` of None is a failed request."""
+        if status is None:
+            self.errors += 1
+            return
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status != self.endpoint.expect:
+            self.errors += 1
+        else:
+            self.latencies.append(latency)
+        if cache_hit:
+            self.cache_hits += 1
+
+    def summary(self):
+        completed = len(self.latencies)
+        data = {
+            'method': self.endpoint.method,
+            'path': self.endpoint.path,
+            'requests': completed + self.errors,
+            'errors': self.errors,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'throughput_rps': round(completed / self.elapsed, 1) if self.elapsed else 0.0,
+            'page_cache_hits': self.cache_hits,
+        }
+        if completed:
+            data['mean_ms'] = round(statistics.fmean(self.latencies) * 1000, 2)
+            data['max_ms'] = round(max(self.latencies) * 1000, 2)
+            for p in PERCENTILES:
+                data[f'p{p}_ms'] = round(percentile(self.latencies, p) * 1000, 2)
+        return data
+
+
+def public_endpoints(search):
+    """The public pages, the newest post and event, and the contact form POST."""
+    endpoints = [
+        Endpoint('home', reverse('home')),
+        Endpoint('blog', reverse('blog')),
+        Endpoint('blog_search', f"{reverse('blog')}?{urlencode({'search': search})}"),
+        Endpoint('eventos', reverse('eventos')),
+    ]
+    # The most recent rows: the pages visitors actually open
+    post = BlogPost.objects.filter(status='published').order_by('-published_date').only('slug').first()
+    if post:
+        endpoints.append(Endpoint('blog_detail', reverse('blog_detail', args=[post.slug])))
+    event = Event.objects.exclude(status='cancelled').order_by('-date').only('slug').first()
+    if event:
+        endpoints.append(Endpoint('event_detail', reverse('event_detail', args=[event.slug])))
+    endpoints.append(Endpoint(
+        'contact_post', reverse('contato'), method='POST', expect=302,
+        form=partial(contact_form, counter=itertools.count()),
+    ))
+    return endpoints
+
+
+def percentile(values, p):
+    """Linear-interpolated ``p``th percentile of ``values``."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Connection:
+    """A worker's HTTP client with its own cookie jar.
+
+    Without ``keep_alive`` every request opens a fresh connection, which is
+    what a WSGI server behind a proxy sees; it also keeps servers that
+    write headers and body separately (runserver) out of the Nagle /
+    delayed-ACK stall, which would add ~40 ms to every reused-socket
+    request.
+    """
+
+    def __init__(self, base_url, timeout, keep_alive=False):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.conn = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.keep_alive = keep_alive
+        self.cookies = SimpleCookie()
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={morsel.value}' for name, morsel in self.cookies.items())
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            if not self.keep_alive:
+                self.conn.close()
+        except (OSError, http.client.HTTPException):
+            # Let the next request reconnect
+            self.conn.close()
+            raise
+        for value in response.headers.get_all('Set-Cookie') or ():
+            self.cookies.load(value)
+        return response
+
+    def close(self):
+        self.conn.close()
+
+
+def contact_form(connection, path, counter):
+    """Body and headers for one contact-form POST, with a valid CSRF token."""
+    if settings.CSRF_COOKIE_NAME not in connection.cookies:
+        connection.request('GET', path)
+    # No cookie (the form page failed) is left for the server to answer with 403
+    morsel = connection.cookies.get(settings.CSRF_COOKIE_NAME)
+    token = morsel.value if morsel else ''
+    n = next(counter)
+    body = urlencode({
+        'csrfmiddlewaretoken': token,
+        'name': 'Teste de Carga',
+        'email': f'carga{n}@exemplo.com.br',
+        'subject': 'Benchmark do formulário de contato',
+        'message': 'Mensagem enviada pelo benchmark HTTP para medir o tempo de resposta do formulário.',
+    })
+    return body, {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+def _send(connection, endpoint):
+    """One request; returns ``(response, seconds)``."""
+    body, headers = None, {}
+    if endpoint.form:
+        body, headers = endpoint.form(connection, endpoint.path)
+    started = time.perf_counter()
+    response = connection.request(endpoint.method, endpoint.path, body, headers)
+    return response, time.perf_counter() - started
+
+
+def _run_phase(endpoint, connections, count, record=None):
+    lock = threading.Lock()
+    remaining = iter(range(count))
+
+    def worker(connection):
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            try:
+                response, latency = _send(connection, endpoint)
+            except (OSError, http.client.HTTPException):
+                response, latency = None, None
+            if record:
+                with lock:
+                    record(response, latency)
+
+    threads = [threading.Thread(target=worker, args=[connection], daemon=True) for connection in connections]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def run_endpoint(endpoint, base_url, requests, concurrency, warmup=0, keep_alive=False, timeout=30):
+    """Send ``requests`` measured requests to ``endpoint`` from ``concurrency`` connections."""
+    result = Result(endpoint)
+
+    def record(response, latency):
+        if response is None:
+            result.add(None, latency)
+        else:
+            result.add(response.status, latency, response.headers.get('X-Page-Cache') == 'hit')
+
+    connections = [Connection(base_url, timeout, keep_alive) for _ in range(concurrency)]
+    try:
+        # Warm up through the same clients, so cookies and open sockets carry over
+        _run_phase(endpoint, connections, warmup)
+        result.elapsed = _run_phase(endpoint, connections, requests, record)
+    finally:
+        for connection in connections:
+            connection.close()
+    return result
+
+
+class AsyncConnection:
+    """A keep-alive HTTP/1.1 connection on asyncio; GET and HEAD only."""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path):
+        """Send one request and read the whole response; returns ``(status, headers)``."""
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(
+            f'{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n\r\n'.encode('latin-1')
+        )
+        try:
+            return await asyncio.wait_for(self._read_response(method), self.timeout)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            # Let the next request reconnect
+            self.close()
+            raise
+
+    async def _read_response(self, method):
+        head = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split(' ', 2)[1])
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if method != 'HEAD':
+            await self._read_body(headers)
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, headers
+
+    async def _read_body(self, headers):
+        if headers.get('transfer-encoding', '').lower() != 'chunked':
+            await self.reader.readexactly(int(headers.get('content-length', 0)))
+            return
+        while True:
+            size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            # The chunk and its CRLF; the last, empty chunk is just the CRLF
+            await self.reader.readexactly(size + 2)
+            if not size:
+                return
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _arun_phase(endpoint, connections, count, result=None):
+    remaining = iter(range(count))
+
+    async def worker(connection):
+        # One event loop: workers take turns on the shared iterator
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                status, headers = await connection.request(endpoint.method, endpoint.path)
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                status, headers = None, {}
+            if result:
+                result.add(status, time.perf_counter() - started, headers.get('x-page-cache') == 'hit')
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(connection) for connection in connections))
+    return time.perf_counter() - started
+
+
+async def arun_endpoint(endpoint, base_url, requests, concurrency, warmup=0, timeout=30):
+    """``run_endpoint`` over ``concurrency`` keep-alive connections held by one event loop."""
+    parts = urlsplit(base_url)
+    result = Result(endpoint)
+    connections = [AsyncConnection(parts.hostname, parts.port or 80, timeout) for _ in range(concurrency)]
+    try:
+        # Open them all first, so the server holds every connection for the whole run
+        await asyncio.gather(*(connection.connect() for connection in connections))
+        await _arun_phase(endpoint, connections, warmup)
+        result.elapsed = await _arun_phase(endpoint, connections, requests, result)
+    finally:
+        for connection in connections:
+            connection.close()
+    return result
+
+
+def error_rate(summary):
+    """Share of the requests in ``summary`` that failed or got an unexpected status."""
+    return summary['errors'] / summary['requests'] if summary['requests'] else 0.0
+
+
+def compare(results, baseline, threshold):
+    """Return ``(name, message)`` for each endpoint that regressed against ``baseline``."""
+    regressions = []
+    for name, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        if error_rate(current) > error_rate(previous):
+            regressions.append((name, f"error rate {error_rate(previous):.1%} -> {error_rate(current):.1%}"))
+        if 'p95_ms' not in previous:
+            continue
+        if 'p95_ms' not in current:
+            regressions.append((name, f"p95 {previous['p95_ms']} ms -> no successful requests"))
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append((name, f"p95 {previous['p95_ms']} ms -> {current['p95_ms']} ms"))
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+            regressions.append((name, f"throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s"))
+    return regressions
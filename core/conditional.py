@@ -0,0 +1,142 @@
+"""Conditional GET (ETag / Last-Modified) for content pages.
+
+Validators are derived from ``updated_at``: the object's own for detail
+pages, the latest one in the filtered queryset for lists. The ETag also
+covers the content cache generation, which moves on deletes and on
+category/tag changes that ``updated_at`` does not see, and the user,
+since the navigation differs once logged in. Detail views add the
+counters listed in ``validator_fields``, which are written with
+``update()`` and leave ``updated_at`` alone. No response sends
+Last-Modified: a counter bump on a detail page or a deleted row in a list
+does not move ``updated_at``, so an ``If-Modified-Since`` check would
+answer 304 for a page that changed. Only the ETag notices.
+
+A matching ``If-None-Match``/``If-Modified-Since`` gets a 304 before any
+template is rendered, unless flash messages are waiting to be shown.
+Detail views still fetch the object first, so the view counter records
+revalidated visits too.
+"""
+import hashlib
+from calendar import timegm
+
+from asgiref.sync import sync_to_async
+from django.contrib.messages import get_messages
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from . import content_cache
+
+
+def _user_key(request):
+    return request.user.pk if request.user.is_authenticated else 0
+
+
+async def _auser_key(request):
+    user = await request.auser()
+    return user.pk if user.is_authenticated else 0
+
+
+def _validators(last_modified, generation, user_key, parts):
+    key = ':'.join(str(part) for part in (
+        last_modified.isoformat() if last_modified else '',
+        generation,
+        user_key,
+        *parts,
+    ))
+    return f'W/"{hashlib.md5(key.encode()).hexdigest()}"', last_modified
+
+
+def make_validators(request, last_modified, *parts):
+    """Return ``(etag, last_modified)`` for content last changed at ``last_modified``."""
+    return _validators(last_modified, content_cache.generation(), _user_key(request), parts)
+
+
+async def amake_validators(request, last_modified, *parts):
+    return _validators(last_modified, await content_cache.ageneration(), await _auser_key(request), parts)
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response when the client copy is current, otherwise None."""
+    # The cached copy lacks the flash message this response would show
+    if len(get_messages(request)):
+        return None
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code not in (200, 304):
+        return response
+    response.headers.setdefault('ETag', etag)
+    if last_modified:
+        response.headers.setdefault('Last-Modified', http_date(timegm(last_modified.utctimetuple())))
+    return response
+
+
+def latest_update(request, queryset):
+    """Newest ``updated_at`` in ``queryset``, cached per URL, user and content generation."""
+    return content_cache.get_or_build(
+        f'lastmod:{_user_key(request)}:{request.get_full_path()}',
+        lambda: queryset.order_by().aggregate(latest=Max('updated_at'))['latest'],
+    )
+
+
+async def alatest_update(request, queryset):
+    async def build():
+        return (await queryset.order_by().aaggregate(latest=Max('updated_at')))['latest']
+    return await content_cache.aget_or_build(
+        f'lastmod:{await _auser_key(request)}:{request.get_full_path()}', build,
+    )
+
+
+def respond(request, last_modified, parts, build):
+    """Answer with a 304 when the client copy is current, else ``build()``.
+
+    ``parts`` are whatever else the response depends on (object id, URL).
+    """
+    etag, last_modified = make_validators(request, last_modified, *parts)
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = build()
+    return set_validators(response, etag, last_modified)
+
+
+async def arespond(request, last_modified, parts, build):
+    """Like ``respond``, with ``build`` a coroutine function."""
+    etag, last_modified = await amake_validators(request, last_modified, *parts)
+    # Reading the messages may load the session from the database
+    response = await sync_to_async(not_modified)(request, etag, last_modified)
+    if response is None:
+        response = await build()
+    return set_validators(response, etag, last_modified)
+
+
+class ConditionalDetailMixin:
+    """DetailView mixin answering revalidations from ``object.updated_at``"""
+
+    # Fields shown on the page but changed with update(), which leaves updated_at alone
+    validator_fields = ()
+
+    def get_validator_parts(self):
+        return [
+            self.object.pk, self.object.updated_at.isoformat(),
+            *(getattr(self.object, name) for name in self.validator_fields),
+        ]
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return respond(
+            request, None, self.get_validator_parts(),
+            lambda: self.render_to_response(self.get_context_data(object=self.object)),
+        )
+
+
+class ConditionalListMixin:
+    """ListView mixin answering revalidations from the newest ``updated_at``"""
+
+    def get(self, request, *args, **kwargs):
+        return respond(
+            request, None, [request.get_full_path(), latest_update(request, self.get_queryset())],
+            lambda: super(ConditionalListMixin, self).get(request, *args, **kwargs),
+        )
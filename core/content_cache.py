@@ -0,0 +1,86 @@
+"""Generation-versioned cache for published content.
+
+Result sets are stored under ``content:<generation>:<name>``. The handlers
+in ``core.signals`` bump the generation after any post, event, category or
+tag change commits, so every cached entry is orphaned at once and the
+next request rebuilds it. Orphaned entries age out with
+``CONTENT_CACHE_TIMEOUT``. Only ``get``/``set``/``add``/``incr`` are used,
+so any cache backend works; use a shared one (file-based, Redis) when
+running several processes, since LocMem bumps stay inside one process.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+GENERATION_KEY = 'content:generation'
+
+_MISSING = object()
+
+
+def generation():
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        # Seeded from the clock so an evicted counter never reuses an old generation
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        value = cache.get(GENERATION_KEY)
+    return value
+
+
+def is_process_local():
+    """True when each process has its own copy of the cache (LocMem)."""
+    return isinstance(caches['default'], LocMemCache)
+
+
+def bump():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+
+
+def get_or_build(name, builder, timeout=None):
+    """Return the cached value for ``name``, calling ``builder`` on a miss."""
+    key = f'content:{generation()}:{name}'
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = builder()
+        if timeout is None:
+            timeout = getattr(settings, 'CONTENT_CACHE_TIMEOUT', 86400)
+        cache.set(key, value, timeout)
+    return value
+
+
+def cached_list(name, queryset, timeout=None):
+    """Evaluate ``queryset`` once per generation and cache the rows."""
+    return get_or_build(name, lambda: list(queryset), timeout)
+
+
+# Async counterparts, for the views in core.async_views
+
+async def ageneration():
+    value = await cache.aget(GENERATION_KEY)
+    if value is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), None)
+        value = await cache.aget(GENERATION_KEY)
+    return value
+
+
+async def aget_or_build(name, builder, timeout=None):
+    """Like ``get_or_build``, with ``builder`` a coroutine function."""
+    key = f'content:{await ageneration()}:{name}'
+    value = await cache.aget(key, _MISSING)
+    if value is _MISSING:
+        value = await builder()
+        if timeout is None:
+            timeout = getattr(settings, 'CONTENT_CACHE_TIMEOUT', 86400)
+        await cache.aset(key, value, timeout)
+    return value
+
+
+async def acached_list(name, queryset, timeout=None):
+    """Like ``cached_list``, evaluating ``queryset`` through the async ORM."""
+    async def build():
+        return [obj async for obj in queryset]
+    return await aget_or_build(name, build, timeout)
@@ -0,0 +1,56 @@
+"""Admin dashboard statistics.
+
+All counters for a table come from a single conditional-aggregate query.
+The result is cached and dropped by the signal handlers in ``core.signals``
+whenever a post, event, user or contact message is saved or deleted.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from . import page_cache
+from .models import BlogPost, ContactMessage, Event, User
+
+CACHE_KEY = 'dashboard:stats'
+# Safety net for writes that bypass signals (e.g. queryset.update())
+CACHE_TIMEOUT = 300
+
+
+def compute_stats():
+    posts = BlogPost.objects.aggregate(
+        total=Count('pk'),
+        published=Count('pk', filter=Q(status='published')),
+        draft=Count('pk', filter=Q(status='draft')),
+        featured=Count('pk', filter=Q(featured=True)),
+    )
+    events = Event.objects.aggregate(
+        total=Count('pk'),
+        upcoming=Count('pk', filter=Q(status='upcoming')),
+        featured=Count('pk', filter=Q(featured=True)),
+    )
+    users = User.objects.aggregate(
+        total=Count('pk'),
+        admins=Count('pk', filter=Q(role='admin')),
+    )
+    messages = ContactMessage.objects.aggregate(
+        total=Count('pk'),
+        unread=Count('pk', filter=Q(is_read=False)),
+    )
+    return {
+        'posts': posts,
+        'events': events,
+        'users': users,
+        'messages': messages,
+    }
+
+
+def get_stats():
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(CACHE_KEY, stats, CACHE_TIMEOUT)
+    # Live counters, not part of the cached snapshot
+    return {**stats, 'page_cache': page_cache.stats()}
+
+
+def invalidate_stats():
+    cache.delete(CACHE_KEY)
@@ -0,0 +1,122 @@
+"""Primary/replica database routing.
+
+Replicas are listed in ``DATABASE_REPLICAS`` (aliases in ``DATABASES``
+holding a copy of ``default`` kept in sync outside Django, e.g. a
+Litestream-restored SQLite file or a PostgreSQL streaming replica).
+``PrimaryReplicaRouter`` sends reads to a healthy replica only while
+``ReplicaRoutingMiddleware`` has marked the current request as a safe
+(GET/HEAD/OPTIONS) one; everything else, including management commands
+and background workers, reads from the primary.
+
+The first write of a request pins it to the primary, so the rest of the
+request reads its own writes. Reads inside a transaction on the primary
+stay there too. Replica health is probed with a trivial query and the
+answer is kept for ``DATABASE_REPLICA_CHECK_INTERVAL`` seconds; when no
+replica is healthy, reads fall back to the primary.
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 30
+
+# None outside a request; otherwise a dict with the request's routing state
+_request_state = ContextVar('db_routing', default=None)
+
+# alias -> (healthy, checked_at), per process
+_health = {}
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def _probe(alias):
+    connection = connections[alias]
+    name = connection.settings_dict['NAME']
+    # Connecting to a missing SQLite file would silently create an empty one
+    if connection.vendor == 'sqlite' and not Path(name).exists():
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM django_migrations LIMIT 1')
+        return True
+    except DatabaseError:
+        connection.close()
+        return False
+
+
+def is_healthy(alias):
+    """Whether ``alias`` answered the last health check, re-probing when stale."""
+    interval = getattr(settings, 'DATABASE_REPLICA_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+    healthy, checked_at = _health.get(alias, (None, 0))
+    if healthy is None or time.monotonic() - checked_at >= interval:
+        healthy = _probe(alias)
+        if not healthy and _health.get(alias, (True,))[0]:
+            logger.warning('Database replica %r failed its health check; reading from the primary', alias)
+        _health[alias] = (healthy, time.monotonic())
+    return healthy
+
+
+def healthy_replicas():
+    return [alias for alias in replica_aliases() if is_healthy(alias)]
+
+
+@contextmanager
+def request_routing(read_only):
+    """Route the enclosed request; ``read_only`` lets its reads use replicas."""
+    token = _request_state.set({'replicas': read_only, 'pinned': not read_only})
+    try:
+        yield
+    finally:
+        _request_state.reset(token)
+
+
+def pin_to_primary():
+    """Send the remaining reads of the current request to the primary."""
+    state = _request_state.get()
+    if state is not None:
+        state['pinned'] = True
+
+
+class PrimaryReplicaRouter:
+    """Reads from replicas during safe requests, writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state['replicas'] or state['pinned']:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        instance = hints.get('instance')
+        # An object read from a replica is written back to the primary
+        if instance is not None and instance._state.db in replica_aliases():
+            return DEFAULT_DB_ALIAS
+        # Otherwise Django keeps the instance's own database (e.g. one loaded
+        # with using()) or falls back to the primary
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary
+        if db in replica_aliases():
+            return False
+        return None
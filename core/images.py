@@ -0,0 +1,208 @@
+"""Responsive image derivatives.
+
+Uploaded images are resized with Pillow into WebP and JPEG variants at the
+widths in ``IMAGE_DERIVATIVE_WIDTHS``. The variants sit next to the
+original as ``<name>.<content hash>.<width>w.<ext>``, so an unchanged
+upload maps to the same files and a replaced one never reuses a cached
+URL. Images are never upscaled.
+
+Each model with an ``image`` field keeps the result in
+``image_derivatives``::
+
+    {"source": "blog_images/a.png", "width": 1181, "height": 472,
+     "variants": [{"name": "thumbnail", "width": 320, "height": 128,
+                   "webp": "blog_images/a.3f2c9e1b7a4d.320w.webp",
+                   "jpeg": "blog_images/a.3f2c9e1b7a4d.320w.jpg"}, ...]}
+
+When a save changes the image, ``core.signals`` queues a
+``build_derivatives_task`` for ``manage.py run_worker``, so resizing stays
+off the request path. Until the job runs, pages show the original image.
+A file that cannot be read fails the job, which the worker retries with
+backoff; an upload Pillow cannot decode gets empty derivatives.
+``manage.py build_image_derivatives`` backfills existing uploads inline.
+Variants of a replaced or removed image are deleted once the new
+description commits.
+"""
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import content_cache
+from .tasks import enqueue, task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = {
+    'thumbnail': 320,
+    'card': 640,
+    'detail': 1280,
+}
+
+# format key -> (Pillow format, extension, MIME type)
+FORMATS = {
+    'webp': ('WEBP', 'webp', 'image/webp'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+def derivative_widths():
+    return getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS)
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == 'JPEG':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def build_derivatives(field_file):
+    """Write the variants for ``field_file`` and return their description."""
+    storage = field_file.storage
+    field_file.open('rb')
+    try:
+        data = field_file.read()
+    finally:
+        field_file.close()
+
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    directory, filename = posixpath.split(field_file.name)
+    stem = posixpath.splitext(filename)[0]
+
+    with Image.open(BytesIO(data)) as opened:
+        original = ImageOps.exif_transpose(opened)
+        width, height = original.size
+
+        variants = []
+        for name, target in sorted(derivative_widths().items(), key=lambda item: item[1]):
+            variant_width = min(target, width)
+            if any(variant['width'] == variant_width for variant in variants):
+                continue
+            variant_height = max(round(height * variant_width / width), 1)
+            resized = original.resize((variant_width, variant_height), Image.Resampling.LANCZOS)
+
+            variant = {'name': name, 'width': variant_width, 'height': variant_height}
+            for key, (image_format, extension, _) in FORMATS.items():
+                path = posixpath.join(directory, f'{stem}.{digest}.{variant_width}w.{extension}')
+                if not storage.exists(path):
+                    path = storage.save(path, ContentFile(_encode(resized, image_format)))
+                variant[key] = path
+            variants.append(variant)
+
+    return {
+        'source': field_file.name,
+        'width': width,
+        'height': height,
+        'variants': variants,
+    }
+
+
+def _variant_paths(derivatives):
+    """Storage paths of every variant in ``derivatives``."""
+    return {
+        variant[key]
+        for variant in derivatives.get('variants', [])
+        for key in FORMATS
+        if key in variant
+    }
+
+
+def _delete_variants(storage, paths):
+    """Delete variants no longer referenced; a missing file is not an error."""
+    for path in sorted(paths):
+        try:
+            storage.delete(path)
+        except OSError:
+            logger.warning('Could not delete image derivative %s', path, exc_info=True)
+
+
+def refresh_derivatives(obj, force=False):
+    """Rebuild ``obj.image_derivatives`` if the image changed since the last build."""
+    current = obj.image_derivatives or {}
+    if not obj.image:
+        derivatives = {}
+    elif current.get('source') == obj.image.name and not force:
+        return current
+    else:
+        try:
+            derivatives = build_derivatives(obj.image)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            # Retrying cannot fix an upload Pillow will not open. Other OSErrors
+            # (missing file, storage down) propagate so the task queue retries them
+            logger.warning('Could not decode %s, so it gets no derivatives', obj.image.name, exc_info=True)
+            derivatives = {}
+
+    if derivatives != current:
+        # update() skips post_save, so this does not re-enter the signal handler
+        # updated_at moves too: pages and cached fragments showing the image change
+        updated_at = timezone.now()
+        type(obj).objects.filter(pk=obj.pk).update(image_derivatives=derivatives, updated_at=updated_at)
+        obj.image_derivatives = derivatives
+        obj.updated_at = updated_at
+        content_cache.bump()
+
+        stale = _variant_paths(current) - _variant_paths(derivatives)
+        if stale:
+            # After commit: a rolled back update still points at these files
+            storage = obj.image.storage
+            transaction.on_commit(lambda: _delete_variants(storage, stale))
+    return derivatives
+
+
+@task
+def build_derivatives_task(model_label, pk, force=False):
+    obj = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if obj is not None:
+        refresh_derivatives(obj, force=force)
+
+
+def schedule_derivatives(obj):
+    """Queue a rebuild when ``obj.image`` no longer matches its derivatives."""
+    current = obj.image_derivatives or {}
+    if not obj.image:
+        if current:
+            refresh_derivatives(obj)
+    elif current.get('source') != obj.image.name:
+        enqueue(build_derivatives_task, obj._meta.label, obj.pk, unique=True)
+
+
+def variants_for(obj, name):
+    """Variants of ``obj.image`` no wider than the ``name`` width, narrowest first.
+
+    Empty while the derivatives still describe a previous upload.
+    """
+    derivatives = obj.image_derivatives or {}
+    if not obj.image or derivatives.get('source') != obj.image.name:
+        return []
+    variants = derivatives.get('variants', [])
+    limit = derivative_widths().get(name)
+    if limit is None:
+        return variants
+    fitting = [variant for variant in variants if variant['width'] <= limit]
+    return fitting or variants[:1]
+
+
+def srcset(storage, variants, key):
+    return ', '.join(f"{storage.url(variant[key])} {variant['width']}w" for variant in variants)
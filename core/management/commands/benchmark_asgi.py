@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import benchmark
+
+
+def _app_path(dotted):
+    module, _, attribute = dotted.rpartition('.')
+    return f'{module}:{attribute}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the site under gunicorn (threaded WSGI) and uvicorn (ASGI) and compare them '
+        'with many concurrent keep-alive connections'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'endpoints',
+            nargs='*',
+            help='GET endpoints to run (default: home, blog, blog_detail, event_detail)',
+        )
+        parser.add_argument(
+            '--servers',
+            nargs='+',
+            choices=['wsgi', 'asgi'],
+            default=['wsgi', 'asgi'],
+            help='Servers to compare (default: both)',
+        )
+        parser.add_argument(
+            '--connections',
+            type=int,
+            default=1000,
+            help='Concurrent keep-alive connections (default: 1000)',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=5000,
+            help='Measured requests per endpoint (default: 5000)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=200,
+            help='Unmeasured requests sent first to each endpoint (default: 200)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Server worker processes (default: 1)',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=32,
+            help='Threads per gunicorn worker (default: 32)',
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help='Port the servers listen on, one at a time (default: 8765)',
+        )
+        parser.add_argument(
+            '--search',
+            default='educação',
+            help='Search term for the blog search endpoint (default: educação)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['connections'] < 1:
+            raise CommandError('--requests and --connections must be positive')
+        self.raise_file_limit(options['connections'])
+
+        endpoints = [endpoint for endpoint in benchmark.public_endpoints(options['search']) if endpoint.method == 'GET']
+        names = options['endpoints'] or ['home', 'blog', 'blog_detail', 'event_detail']
+        known = {endpoint.name for endpoint in endpoints}
+        unknown = set(names) - known
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))} (available: {', '.join(sorted(known))})")
+        endpoints = [endpoint for endpoint in endpoints if endpoint.name in names]
+
+        results = {
+            'meta': {
+                'connections': options['connections'],
+                'requests': options['requests'],
+                'workers': options['workers'],
+                'threads': options['threads'],
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+            },
+            'servers': {},
+        }
+        for server in options['servers']:
+            self.stdout.write(f'\n{server.upper()} ({self.describe(server, options)})')
+            self.stdout.write(
+                f"{'endpoint':<14} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>7}"
+            )
+            results['servers'][server] = {}
+            with self.server(server, options) as base_url:
+                for endpoint in endpoints:
+                    result = asyncio.run(benchmark.arun_endpoint(
+                        endpoint, base_url, options['requests'], options['connections'], options['warmup'],
+                    ))
+                    summary = result.summary()
+                    results['servers'][server][endpoint.name] = summary
+                    line = (
+                        f"{endpoint.name:<14} {summary.get('p50_ms', '-'):>8} {summary.get('p95_ms', '-'):>8} "
+                        f"{summary.get('p99_ms', '-'):>8} {summary['throughput_rps']:>8} {summary['errors']:>7}"
+                    )
+                    self.stdout.write(self.style.ERROR(line) if summary['errors'] else line)
+
+        if {'wsgi', 'asgi'} <= set(results['servers']):
+            self.stdout.write('\nASGI relative to WSGI')
+            for endpoint in endpoints:
+                wsgi = results['servers']['wsgi'][endpoint.name]
+                asgi = results['servers']['asgi'][endpoint.name]
+                if not wsgi['throughput_rps'] or 'p95_ms' not in wsgi or 'p95_ms' not in asgi:
+                    continue
+                self.stdout.write(
+                    f"{endpoint.name:<14} throughput x{asgi['throughput_rps'] / wsgi['throughput_rps']:.2f}, "
+                    f"p95 x{asgi['p95_ms'] / wsgi['p95_ms']:.2f}"
+                )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+        # Latencies and throughput of a run with failed requests mean little
+        errored = sorted(
+            f'{server}/{name}'
+            for server, summaries in results['servers'].items()
+            for name, summary in summaries.items()
+            if summary['errors']
+        )
+        if errored:
+            raise CommandError(f"Errors in {', '.join(errored)}")
+
+    def raise_file_limit(self, connections):
+        # Client and server sockets share the machine: two descriptors per connection
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        needed = connections * 2 + 256
+        if soft < needed:
+            if hard != resource.RLIM_INFINITY and hard < needed:
+                raise CommandError(f'{connections} connections need {needed} open files; the limit is {hard}')
+            resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+
+    def describe(self, server, options):
+        if server == 'wsgi':
+            return f"gunicorn gthread, {options['workers']} worker(s) x {options['threads']} threads"
+        return f"uvicorn, {options['workers']} worker(s)"
+
+    def command(self, server, options):
+        bind = ['127.0.0.1', str(options['port'])]
+        if server == 'wsgi':
+            return [
+                sys.executable, '-m', 'gunicorn', _app_path(settings.WSGI_APPLICATION),
+                '--bind', ':'.join(bind),
+                '--worker-class', 'gthread',
+                '--workers', str(options['workers']),
+                '--threads', str(options['threads']),
+                # gthread parks idle keep-alive connections in its poller, up to this many
+                '--worker-connections', str(max(options['connections'], 1000)),
+                '--keep-alive', '75',
+                '--backlog', '2048',
+                '--log-level', 'warning',
+            ]
+        return [
+            sys.executable, '-m', 'uvicorn', _app_path(settings.ASGI_APPLICATION),
+            '--host', bind[0],
+            '--port', bind[1],
+            '--workers', str(options['workers']),
+            '--timeout-keep-alive', '75',
+            '--backlog', '2048',
+            '--log-level', 'warning',
+            '--no-access-log',
+        ]
+
+    @contextmanager
+    def server(self, server, options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ['DJANGO_SETTINGS_MODULE']}
+        # asgi.py turns the async views on; the WSGI run keeps the sync ones
+        env.pop('ASYNC_VIEWS', None)
+        process = subprocess.Popen(self.command(server, options), cwd=settings.BASE_DIR, env=env)
+        try:
+            self.wait_until_listening(process, options['port'])
+            yield f"http://127.0.0.1:{options['port']}"
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def wait_until_listening(self, process, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'The server exited with status {process.returncode} before listening')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'The server did not listen on port {port} within {timeout}s')
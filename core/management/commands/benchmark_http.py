@@ -0,0 +1,149 @@
+import json
+import platform
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import benchmark
+from core.models import BlogPost, Event
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles and throughput of the public pages on a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'endpoints',
+            nargs='*',
+            help='Endpoint names to run (default: all)',
+        )
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='Server to benchmark (default: http://127.0.0.1:8000)',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Measured requests per endpoint (default: 500)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Concurrent connections (default: 8)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=20,
+            help='Unmeasured requests sent first to each endpoint (default: 20)',
+        )
+        parser.add_argument(
+            '--keep-alive',
+            action='store_true',
+            help='Reuse connections between requests instead of opening one per request',
+        )
+        parser.add_argument(
+            '--search',
+            default='educação',
+            help='Search term for the blog search endpoint (default: educação)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(settings.BASE_DIR / 'benchmarks' / 'baseline.json'),
+            help='Baseline JSON to compare against (default: benchmarks/baseline.json)',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store these results as the new baseline instead of comparing',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.15,
+            help='Allowed p95/throughput regression as a fraction (default: 0.15)',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive')
+
+        endpoints = benchmark.public_endpoints(options['search'])
+        if options['endpoints']:
+            known = {endpoint.name for endpoint in endpoints}
+            unknown = set(options['endpoints']) - known
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))} (available: {', '.join(sorted(known))})")
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in options['endpoints']]
+
+        results = {
+            'meta': {
+                'base_url': options['base_url'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'keep_alive': options['keep_alive'],
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'posts': BlogPost.objects.count(),
+                'events': Event.objects.count(),
+            },
+            'endpoints': {},
+        }
+
+        self.stdout.write(
+            f"{'endpoint':<14} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>7}"
+        )
+        for endpoint in endpoints:
+            result = benchmark.run_endpoint(
+                endpoint, options['base_url'], options['requests'], options['concurrency'],
+                options['warmup'], options['keep_alive'],
+            )
+            summary = result.summary()
+            results['endpoints'][endpoint.name] = summary
+            line = (
+                f"{endpoint.name:<14} {summary.get('p50_ms', '-'):>8} {summary.get('p95_ms', '-'):>8} "
+                f"{summary.get('p99_ms', '-'):>8} {summary['throughput_rps']:>8} {summary['errors']:>7}"
+            )
+            self.stdout.write(self.style.ERROR(line) if summary['errors'] else line)
+            if summary['errors']:
+                self.stdout.write(f"    statuses: {summary['statuses']}")
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+        errored = sorted(name for name, summary in results['endpoints'].items() if summary['errors'])
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            if errored:
+                raise CommandError(f"Errors in {', '.join(errored)}; baseline not saved")
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {baseline_path}'))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}; run with --save-baseline to create one.'))
+            if errored:
+                raise CommandError(f"Errors in {', '.join(errored)}")
+            return
+
+        regressions = benchmark.compare(results, json.loads(baseline_path.read_text()), options['threshold'])
+        for name, message in regressions:
+            self.stdout.write(self.style.ERROR(f'{name}: {message}'))
+        failures = []
+        if errored:
+            failures.append(f"Errors in {', '.join(errored)}")
+        if regressions:
+            failures.append(f"Regressed against {baseline_path}: {', '.join(sorted({name for name, _ in regressions}))}")
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}.'))
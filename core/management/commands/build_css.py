@@ -0,0 +1,37 @@
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import assets
+
+
+class Command(BaseCommand):
+    help = 'Compile the minified Tailwind stylesheet from the classes used in the templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-minify',
+            action='store_true',
+            help='Keep the output readable (for debugging the generated CSS)',
+        )
+
+    def handle(self, *args, **options):
+        cli = assets.find_cli()
+        if cli is None:
+            raise CommandError(
+                'Tailwind CLI not found. Run "npm install" in the project root, '
+                'or point TAILWIND_CLI at the standalone tailwindcss binary.'
+            )
+
+        output = assets.output_path()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        command = cli + ['--output', str(output), '--content', ','.join(assets.content_globs())]
+        if not options['no_minify']:
+            command.append('--minify')
+
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f'Tailwind build failed:\n{result.stderr.strip()}')
+
+        size = output.stat().st_size / 1024
+        self.stdout.write(self.style.SUCCESS(f'Wrote {output} ({size:.1f} KB). Run collectstatic to publish it.'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core import images
+from core.models import BlogPost, Event
+
+
+class Command(BaseCommand):
+    help = 'Build the responsive image variants for existing blog post and event images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild even when the stored derivatives match the current image',
+        )
+
+    def handle(self, *args, **options):
+        built = 0
+        for model in (BlogPost, Event):
+            for obj in model.objects.exclude(image='').exclude(image__isnull=True).iterator():
+                try:
+                    derivatives = images.refresh_derivatives(obj, force=options['force'])
+                except OSError as exc:
+                    self.stdout.write(self.style.ERROR(f'{obj.image.name}: {exc}'))
+                    continue
+                if derivatives:
+                    built += 1
+                    self.stdout.write(f"{obj.image.name}: {len(derivatives['variants'])} variants")
+                else:
+                    self.stdout.write(self.style.WARNING(f'{obj.image.name}: could not be processed'))
+        self.stdout.write(self.style.SUCCESS(f'Derivatives ready for {built} images.'))
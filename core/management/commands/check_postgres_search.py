@@ -0,0 +1,95 @@
+import re
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core import search
+from core.models import BlogPost, Event
+
+# Unlikely to appear in generated text, so only the renamed author matches
+AUTHOR_TOKEN = 'Zumbiquilombola'
+
+WORD_RE = re.compile(r'\w+')
+
+INDEXES = {
+    BlogPost: 'core_blogpost_search_gin',
+    Event: 'core_event_search_gin',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Check the PostgreSQL full-text search on a throwaway database: the GIN indexes from '
+        'the migrations, title and author matches, and index use. Skipped on other databases.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(f'Skipped: the database is {connection.vendor}, not PostgreSQL.'))
+            return
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            failures = self.check_indexes()
+            call_command(
+                'generate_load_data', posts=20, events=20, messages=1, authors=2, tags=5, categories=2,
+                draft_ratio=0, future_ratio=0, years=1, seed=1, stdout=StringIO(),
+            )
+            failures += self.check_matches()
+            failures += self.check_plans()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if failures:
+            raise CommandError(f"PostgreSQL search check failed: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('PostgreSQL search works and uses its indexes.'))
+
+    def report(self, name, ok, detail):
+        self.stdout.write(f'{name}: {detail}' if ok else self.style.ERROR(f'{name}: {detail}'))
+        return [] if ok else [name]
+
+    def check_indexes(self):
+        failures = []
+        with connection.cursor() as cursor:
+            for model, index in INDEXES.items():
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                found = constraints.get(index, {}).get('type') == 'gin'
+                failures += self.report(f'index {index}', found, 'GIN index present' if found else 'missing')
+        return failures
+
+    def check_matches(self):
+        failures = []
+        post = BlogPost.objects.order_by('pk').first()
+        word = max(WORD_RE.findall(post.title), key=len)
+        found = search.search_queryset(BlogPost.objects.all(), word).filter(pk=post.pk).exists()
+        failures += self.report('post title', found, f"'{word}' finds post #{post.pk}")
+
+        # Renaming goes through the User post_save handler that refreshes author_name
+        author = post.author
+        author.first_name = AUTHOR_TOKEN
+        author.save(update_fields=['first_name'])
+        matches = set(search.search_queryset(BlogPost.objects.all(), AUTHOR_TOKEN).values_list('pk', flat=True))
+        expected = set(BlogPost.objects.filter(author=author).values_list('pk', flat=True))
+        failures += self.report(
+            'post author', matches == expected,
+            f'{len(matches)} of the {len(expected)} posts by the renamed author found',
+        )
+
+        event = Event.objects.order_by('pk').first()
+        word = max(WORD_RE.findall(event.title), key=len)
+        found = search.search_queryset(Event.objects.all(), word).filter(pk=event.pk).exists()
+        failures += self.report('event title', found, f"'{word}' finds event #{event.pk}")
+        return failures
+
+    def check_plans(self):
+        failures = []
+        for model, index in INDEXES.items():
+            # A handful of rows is cheaper to scan; forbid that to see whether the index applies at all
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                plan = search.search_queryset(model.objects.all(), 'educação').explain()
+            failures += self.report(f'plan {model.__name__}', index in plan, f'uses {index}' if index in plan else plan)
+        return failures
@@ -0,0 +1,140 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+
+User = get_user_model()
+
+# Every page is rendered from the database during the scaling check
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = (
+        'Render list pages and fail when one exceeds its QUERY_BUDGETS entry, does not answer 200, '
+        'or runs more queries with twice the rows on a throwaway database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'url_names',
+            nargs='*',
+            help='URL names to check (default: every entry in QUERY_BUDGETS)',
+        )
+        parser.add_argument(
+            '--user',
+            help='Username to log in as, for pages that require authentication',
+        )
+        parser.add_argument(
+            '--verbose-sql',
+            action='store_true',
+            help='Print the captured SQL for pages over budget',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=4,
+            help='Posts, events and messages seeded for the scaling check, then seeded again (default: 4)',
+        )
+        parser.add_argument(
+            '--skip-scaling',
+            action='store_true',
+            help='Only check the budgets against the current database',
+        )
+
+    def handle(self, *args, **options):
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        names = options['url_names'] or list(budgets)
+        unknown = [name for name in names if name not in budgets]
+        if unknown:
+            raise CommandError(f"No query budget defined for '{unknown[0]}'")
+        if options['rows'] < 1:
+            raise CommandError('--rows must be positive')
+
+        paths = {}
+        for name in names:
+            try:
+                paths[name] = reverse(name)
+            except NoReverseMatch:
+                self.stdout.write(self.style.WARNING(f'{name}: needs URL arguments, skipped'))
+
+        client = Client(raise_request_exception=False)
+        if options['user']:
+            try:
+                client.force_login(User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        failures = self.check_budgets(client, paths, budgets, options['verbose_sql'])
+        if not options['skip_scaling']:
+            failures += self.check_scaling(paths, options['rows'])
+
+        if failures:
+            raise CommandError(f"Query budget check failed: {', '.join(dict.fromkeys(failures))}")
+        self.stdout.write(self.style.SUCCESS('All pages within their query budget.'))
+
+    def render(self, client, path):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path)
+        return response, captured
+
+    def check_budgets(self, client, paths, budgets, verbose_sql):
+        failures = []
+        for name, path in paths.items():
+            response, captured = self.render(client, path)
+            count = len(captured)
+            budget = budgets[name]
+
+            line = f'{name} ({path}): {count}/{budget} queries, status {response.status_code}'
+            # A redirect or an error page runs few queries and would pass unnoticed
+            if count > budget or response.status_code != 200:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line))
+                if verbose_sql and count > budget:
+                    for query in captured.captured_queries:
+                        self.stdout.write(f"    {query['sql']}")
+            else:
+                self.stdout.write(line)
+        return failures
+
+    def check_scaling(self, paths, rows):
+        """Render every page with ``rows`` and then twice as many rows; the query count must not grow."""
+        self.stdout.write(f'\nScaling: {rows} and {rows * 2} rows per model on a throwaway database')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=NO_CACHE, DATABASE_REPLICAS=[]):
+                client = Client(raise_request_exception=False)
+                client.force_login(User.objects.create_user(username='query-budget', role='admin'))
+                counts = []
+                for seed in (1, 2):
+                    self.seed(rows, seed)
+                    counts.append({name: self.render(client, path) for name, path in paths.items()})
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        failures = []
+        for name, path in paths.items():
+            (small, small_queries), (large, large_queries) = counts[0][name], counts[1][name]
+            line = (
+                f'{name} ({path}): {len(small_queries)} -> {len(large_queries)} queries, '
+                f'status {small.status_code}/{large.status_code}'
+            )
+            if len(large_queries) > len(small_queries) or {small.status_code, large.status_code} != {200}:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        return failures
+
+    def seed(self, rows, seed):
+        # Published, past-dated rows, so every seeded row shows up on the lists
+        call_command(
+            'generate_load_data', posts=rows, events=rows, messages=rows, authors=2, tags=10, categories=3,
+            featured_ratio=0.5, draft_ratio=0, future_ratio=0, years=1, seed=seed, stdout=StringIO(),
+        )
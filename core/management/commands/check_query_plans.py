@@ -0,0 +1,73 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.models import BlogPost, ContactMessage, Event
+
+# SQLite reports a full table scan as "SCAN <table>" with no "USING ..." suffix
+FULL_SCAN_RE = re.compile(r'\bSCAN (\w+)$')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+# Queries that must use a specific index, not merely some index
+EXPECTED_INDEXES = {
+    'featured_posts': 'blogpost_featured_idx',
+    'featured_events': 'event_featured_idx',
+    'unread_messages': 'contactmessage_unread_idx',
+}
+
+
+def public_queries():
+    """The query shapes behind the public pages and the dashboard counters."""
+    return {
+        'blog_list': BlogPost.objects.filter(status='published')
+            .select_related('author', 'category')
+            .order_by('-published_date', '-id')[:10],
+        'featured_posts': BlogPost.objects.filter(featured=True, status='published')
+            .select_related('author', 'category')[:3],
+        'event_list': Event.objects.exclude(status='cancelled').order_by('date', 'start_time', 'id')[:7],
+        'featured_events': Event.objects.filter(featured=True, status='upcoming')[:2],
+        'unread_messages': ContactMessage.objects.filter(is_read=False),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN QUERY PLAN on the public queries and fail on full table scans, '
+        'temp sorts, or a query that skips its dedicated index'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Queries to check (default: all of them)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plan checks read SQLite EXPLAIN QUERY PLAN output')
+
+        queries = public_queries()
+        names = options['names'] or list(queries)
+        failures = []
+
+        for name in names:
+            if name not in queries:
+                raise CommandError(f"Unknown query '{name}'. Choose from: {', '.join(queries)}")
+            plan = queries[name].explain()
+            expected = EXPECTED_INDEXES.get(name)
+            if expected and f'USING INDEX {expected}' not in plan:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: expected {expected}'))
+            elif any(FULL_SCAN_RE.search(line.strip()) or TEMP_SORT in line for line in plan.splitlines()):
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}:'))
+            else:
+                self.stdout.write(f'{name}:')
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+
+        if failures:
+            raise CommandError(f"Full scans, temp sorts or unused indexes in: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('Every query is served by an index.'))
@@ -0,0 +1,69 @@
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from core import prerender
+
+
+def default_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host not in ('*', '') and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+class Command(BaseCommand):
+    help = 'Prerender the content-free pages (and optionally the whole public site) to static HTML'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Also prerender the home page and the blog and events lists',
+        )
+        parser.add_argument(
+            '--output',
+            help='Build directory (default: PRERENDER_ROOT)',
+        )
+        parser.add_argument(
+            '--host',
+            default=default_host(),
+            help='Host name the pages are rendered for (used in absolute URLs)',
+        )
+        parser.add_argument(
+            '--secure',
+            action='store_true',
+            help='Render as if requested over HTTPS',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete the build directory first',
+        )
+
+    def handle(self, *args, **options):
+        root = Path(options['output']) if options['output'] else prerender.output_root()
+        if options['clear'] and root.exists():
+            if not root.is_dir():
+                raise CommandError(f'{root} is not a directory')
+            shutil.rmtree(root)
+        root.mkdir(parents=True, exist_ok=True)
+
+        paths = prerender.static_paths()
+        if options['all']:
+            paths += prerender.content_paths()
+
+        client = Client(HTTP_HOST=options['host'], raise_request_exception=False)
+        written = 0
+        for path in paths:
+            target, error = prerender.render_page(client, path, root, secure=options['secure'])
+            if error:
+                self.stdout.write(self.style.WARNING(f'{path}: skipped ({error})'))
+            else:
+                written += 1
+                self.stdout.write(f'{path} -> {target}')
+
+        self.stdout.write(self.style.SUCCESS(f'Prerendered {written} of {len(paths)} pages into {root}.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for blog posts and events'
+
+    def handle(self, *args, **options):
+        if search.backend() == 'postgres':
+            self.stdout.write('PostgreSQL keeps the GIN search indexes up to date itself; nothing to do.')
+            return
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING('Full-text index is not used on this database; nothing to do.'))
+            return
+
+        total = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} objects.'))
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import registrations
+from core.models import Event, Registration
+
+User = get_user_model()
+
+# Answers from the view; anything else (a 500, a missing message) is a failure
+OUTCOMES = {'registered', 'full', 'rejected'}
+
+
+def register_over_http(client, url, token):
+    """POST a registration the way the event page form does; return the outcome."""
+    try:
+        response = client.post(url, {'csrfmiddlewaretoken': token})
+    finally:
+        connection.close()
+    if response.status_code != 302:
+        return f'http_{response.status_code}'
+    for message in get_messages(response.wsgi_request):
+        if message.level_tag == 'success':
+            return 'registered'
+        if message.message == registrations.EventFull.message:
+            return 'full'
+        return 'rejected'
+    return 'no_message'
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent registrations at one event through the event_register view, '
+        'with real sessions and CSRF checks, and check it is never oversold'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Number of concurrent registration requests (default: 500)',
+        )
+        parser.add_argument(
+            '--capacity',
+            type=int,
+            default=50,
+            help='Capacity of the throwaway event (default: 50)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the generated event and users instead of deleting them',
+        )
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        capacity = options['capacity']
+        prefix = f'loadtest-{int(time.time())}'
+
+        event = Event.objects.create(
+            title=f'Teste de carga {prefix}',
+            slug=prefix,
+            description='Evento gerado pelo teste de carga de inscrições.',
+            date=timezone.now().date(),
+            start_time='09:00',
+            end_time='10:00',
+            location='Online',
+            category='Teste',
+            capacity=capacity,
+            organizer='NEABI',
+        )
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{i}', email=f'{prefix}-{i}@example.com', password='!')
+            for i in range(total)
+        ])
+        # bulk_create does not return primary keys on every backend
+        users = list(User.objects.filter(username__startswith=f'{prefix}-'))
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            results, elapsed = self.run_requests(event, users)
+
+        event.refresh_from_db()
+        ledger = Registration.objects.filter(event=event).count()
+
+        for outcome, count in sorted(results.items()):
+            self.stdout.write(f'  {outcome}: {count}')
+        self.stdout.write(f'  registered counter: {event.registered}')
+        self.stdout.write(f'  ledger rows: {ledger}')
+        self.stdout.write(f'  elapsed: {elapsed:.2f}s')
+
+        if not options['keep']:
+            event.delete()
+            User.objects.filter(username__startswith=f'{prefix}-').delete()
+
+        if event.registered > capacity or ledger != event.registered:
+            raise CommandError('Event was oversold or the counter diverged from the ledger!')
+        failed = sum(count for outcome, count in results.items() if outcome not in OUTCOMES)
+        if failed:
+            raise CommandError(f'{failed} requests neither registered nor were turned away')
+
+        self.stdout.write(self.style.SUCCESS('No overselling detected.'))
+
+    def run_requests(self, event, users):
+        detail_url = reverse('event_detail', kwargs={'slug': event.slug})
+        register_url = reverse('event_register', kwargs={'slug': event.slug})
+
+        # Log every user in and fetch the event page for its CSRF cookie up
+        # front, so the concurrent part is only the registration POSTs
+        self.stdout.write(f'Logging in {len(users)} users...')
+        clients = []
+        for user in users:
+            client = Client(enforce_csrf_checks=True, raise_request_exception=False)
+            client.force_login(user)
+            client.get(detail_url)
+            if 'csrftoken' not in client.cookies:
+                raise CommandError(f'{detail_url} did not set a CSRF cookie for {user.username}')
+            clients.append((client, client.cookies['csrftoken'].value))
+
+        results = Counter()
+        results_lock = threading.Lock()
+        barrier = threading.Barrier(len(clients))
+
+        def worker(client, token):
+            barrier.wait()
+            outcome = register_over_http(client, register_url, token)
+            with results_lock:
+                results[outcome] += 1
+
+        self.stdout.write(f'Sending {len(clients)} concurrent registrations (capacity {event.capacity})...')
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=client) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, time.perf_counter() - started
@@ -0,0 +1,99 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from core import content_cache, tasks
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks (image processing) in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'TASK_WORKER_CONCURRENCY', 2),
+            help='Maximum number of tasks running at once',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between queue checks when idle',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        if content_cache.is_process_local():
+            raise CommandError(
+                'The worker bumps the content cache generation after each job, but the default cache is '
+                'LocMemCache, which the web processes cannot see. Set CACHE_BACKEND to a shared backend '
+                '(file-based, Redis, Memcached).'
+            )
+        concurrency = max(options['concurrency'], 1)
+        poll_interval = options['poll_interval']
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+
+        self.stdout.write(f'Worker started with {concurrency} processes.')
+        # spawn: children set Django up from scratch instead of inheriting
+        # the parent's open database connections
+        with ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as pool:
+            running = {}
+            try:
+                while not self.stopping:
+                    while len(running) < concurrency:
+                        task = tasks.claim_next()
+                        if task is None:
+                            break
+                        future = pool.submit(tasks.execute, task.name, task.args, task.kwargs)
+                        running[future] = task
+
+                    if not running:
+                        if options['once']:
+                            break
+                        close_old_connections()
+                        time.sleep(poll_interval)
+                        continue
+
+                    done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.finish(running.pop(future), future)
+            except KeyboardInterrupt:
+                self.stopping = True
+
+            # Let the jobs already handed to the pool finish and record them
+            for future in list(running):
+                self.finish(running.pop(future), future)
+
+        self.stdout.write('Worker stopped.')
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def finish(self, task, future):
+        try:
+            future.result()
+        except Exception as exc:
+            retrying = tasks.mark_failed(task, exc)
+            state = 'will retry' if retrying else 'gave up'
+            self.stdout.write(self.style.ERROR(
+                f'#{task.pk} {task.name} failed (attempt {task.attempts}/{task.max_attempts}, {state}): {exc}'
+            ))
+        else:
+            tasks.mark_done(task)
+            self.stdout.write(f'#{task.pk} {task.name} done')
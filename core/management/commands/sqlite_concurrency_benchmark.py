@@ -0,0 +1,169 @@
+import copy
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+
+from core.benchmark import percentile
+from core.models import BlogPost, Category
+
+User = get_user_model()
+
+ALIAS = 'sqlite_benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite connection profiles under concurrent readers and view-count writers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'profiles',
+            nargs='*',
+            help='SQLITE_PROFILES entries to compare (default: all)',
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=8,
+            help='Threads running the blog list and detail queries (default: 8)',
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=4,
+            help='Threads incrementing view counts in transactions (default: 4)',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10,
+            help='Seconds to run each profile (default: 10)',
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=2000,
+            help='Posts in the throwaway database (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(settings.SQLITE_PROFILES)
+        unknown = set(profiles) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown SQLite profiles: {', '.join(sorted(unknown))}")
+        if settings.DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The default database is not SQLite')
+
+        rows = []
+        for profile in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                self.stdout.write(f'Profile {profile}: preparing {options["posts"]} posts...')
+                self.open_database(Path(directory) / 'benchmark.sqlite3', settings.SQLITE_PROFILES[profile])
+                try:
+                    self.seed(options['posts'])
+                    rows.append((profile, self.run(options)))
+                finally:
+                    self.close_database()
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'profile':<12} {'reads/s':>9} {'read p95':>9} {'writes/s':>9} {'write p95':>10} {'locked':>7}"
+        )
+        for profile, result in rows:
+            self.stdout.write(
+                f"{profile:<12} {result['reads'] / result['elapsed']:>9.0f} {result['read_p95']:>7.1f}ms "
+                f"{result['writes'] / result['elapsed']:>9.0f} {result['write_p95']:>8.1f}ms {result['locked']:>7}"
+            )
+
+    def open_database(self, path, options):
+        """Register a throwaway SQLite database under ALIAS with ``options``."""
+        config = copy.deepcopy(connections.settings['default'])
+        config.update(NAME=str(path), OPTIONS=copy.deepcopy(options))
+        connections.settings[ALIAS] = config
+        call_command('migrate', database=ALIAS, verbosity=0)
+
+    def close_database(self):
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+
+    def seed(self, total):
+        author = User.objects.db_manager(ALIAS).create(username='benchmark', role='admin')
+        category = Category.objects.using(ALIAS).create(name='Benchmark', slug='benchmark')
+        BlogPost.objects.using(ALIAS).bulk_create([
+            BlogPost(
+                title=f'Post {n}', slug=f'post-{n}', excerpt='Resumo', content='Conteúdo ' * 200,
+                author=author, category=category,
+            )
+            for n in range(total)
+        ], batch_size=500)
+
+    def run(self, options):
+        pks = list(BlogPost.objects.using(ALIAS).values_list('pk', flat=True))
+        latencies = {'read': [], 'write': []}
+        outcomes = Counter()
+        lock = threading.Lock()
+        stop = threading.Event()
+        barrier = threading.Barrier(options['readers'] + options['writers'])
+
+        def read(rng):
+            # The blog list page plus one detail page
+            posts = BlogPost.objects.using(ALIAS).filter(status='published').select_related('author', 'category')
+            list(posts[:9])
+            posts.get(pk=rng.choice(pks))
+
+        def write(rng):
+            # Read-then-write, the shape that fails under a deferred BEGIN
+            with transaction.atomic(using=ALIAS):
+                post = BlogPost.objects.using(ALIAS).only('pk').get(pk=rng.choice(pks))
+                BlogPost.objects.using(ALIAS).filter(pk=post.pk).update(views=F('views') + 1)
+
+        def worker(kind, operation, seed):
+            rng = random.Random(seed)
+            try:
+                barrier.wait()
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        operation(rng)
+                    except OperationalError:
+                        with lock:
+                            outcomes['locked'] += 1
+                        continue
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies[kind].append(elapsed)
+            finally:
+                connections[ALIAS].close()
+
+        threads = [
+            threading.Thread(target=worker, args=('read', read, n)) for n in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=('write', write, 1000 + n)) for n in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'elapsed': elapsed,
+            'reads': len(latencies['read']),
+            'writes': len(latencies['write']),
+            'read_p95': percentile(latencies['read'], 95) * 1000 if latencies['read'] else 0,
+            'write_p95': percentile(latencies['write'], 95) * 1000 if latencies['write'] else 0,
+            'locked': outcomes['locked'],
+        }
@@ -0,0 +1,247 @@
+import json
+import logging
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from . import db_router, page_cache
+
+logger = logging.getLogger('core.profiling')
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Timings collected for a single request"""
+
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries.append((sql, repr(params)))
+
+    @property
+    def duplicate_queries(self):
+        return sum(count - 1 for count in Counter(self.queries).values() if count > 1)
+
+
+def _instrument_templates():
+    """Wrap Template.render so the outermost render of a request is timed."""
+    if getattr(Template.render, 'profiled', False):
+        return
+    original_render = Template.render
+
+    def render(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return original_render(self, context)
+        profile.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            profile.template_depth -= 1
+            if not profile.template_depth:
+                profile.template_time += time.perf_counter() - start
+
+    render.profiled = True
+    Template.render = render
+
+
+class RequestProfilingMiddleware:
+    """Per-request SQL, template and memory profiling.
+
+    Enabled with ``REQUEST_PROFILING = True``; otherwise the middleware
+    removes itself at startup and costs nothing. Each request gets a
+    ``Server-Timing`` header and a JSON log line on the ``core.profiling``
+    logger, and a warning is logged when the request runs more queries
+    than its ``QUERY_BUDGETS`` entry (keyed by URL name).
+
+    Peak allocation uses tracemalloc, which slows requests down noticeably
+    and is process-wide, so concurrent requests share the measurement.
+    Disable it with ``REQUEST_PROFILING_MEMORY = False``.
+
+    The middleware is sync only: under ASGI, Django runs every profiled
+    request through a thread, so leave it off when measuring async views.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.trace_memory = getattr(settings, 'REQUEST_PROFILING_MEMORY', True)
+        _instrument_templates()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        total_time = time.perf_counter() - start
+
+        peak_memory = None
+        if self.trace_memory:
+            peak_memory = max(tracemalloc.get_traced_memory()[1] - memory_start, 0)
+
+        self.report(request, response, profile, total_time, peak_memory)
+        return response
+
+    def report(self, request, response, profile, total_time, peak_memory):
+        match = request.resolver_match
+        url_name = match.view_name if match else None
+        query_count = len(profile.queries)
+        duplicates = profile.duplicate_queries
+
+        timings = [
+            f'db;dur={profile.sql_time * 1000:.2f};desc="{query_count} queries, {duplicates} duplicates"',
+            f'tpl;dur={profile.template_time * 1000:.2f};desc="templates"',
+            f'total;dur={total_time * 1000:.2f}',
+        ]
+        if peak_memory is not None:
+            timings.append(f'mem;desc="peak {peak_memory / 1024:.1f} KiB"')
+        response['Server-Timing'] = ', '.join(timings)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'url_name': url_name,
+            'status': response.status_code,
+            'queries': query_count,
+            'duplicate_queries': duplicates,
+            'sql_ms': round(profile.sql_time * 1000, 2),
+            'template_ms': round(profile.template_time * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+            'peak_memory_bytes': peak_memory,
+        }))
+
+        budget = self.budgets.get(url_name)
+        if budget is not None and query_count > budget:
+            logger.warning(
+                'QUERY BUDGET EXCEEDED: %s (%s) ran %d queries, budget is %d',
+                url_name, request.path, query_count, budget,
+            )
+
+
+class ReplicaRoutingMiddleware:
+    """Let safe requests read from the replicas in ``DATABASE_REPLICAS``.
+
+    Goes first, so sessions and authentication also read from a replica.
+    Unsafe methods, and the rest of any request after its first write,
+    use the primary (see ``core.db_router``). Removes itself when no
+    replicas are configured.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not db_router.replica_aliases():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with db_router.request_routing(read_only=request.method in self.SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with db_router.request_routing(read_only=request.method in self.SAFE_METHODS):
+            return await self.get_response(request)
+
+
+class PageCacheMiddleware:
+    """Serve public pages to anonymous visitors from ``core.page_cache``.
+
+    Must come after the authentication and message middleware. Disabled
+    with ``PAGE_CACHE = False``. Responses carry ``X-Page-Cache: hit`` or
+    ``miss``; a hit still honours ``If-None-Match``/``If-Modified-Since``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PAGE_CACHE', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.url_names = page_cache.url_names()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.store(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return await sync_to_async(self.store)(request, response)
+
+    def store(self, request, response):
+        key = getattr(request, '_page_cache_key', None)
+        if key is not None and not response.has_header('X-Page-Cache'):
+            page_cache.store(key, response)
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method != 'GET'
+            or request.resolver_match.url_name not in self.url_names
+            or request.user.is_authenticated
+            or len(get_messages(request))
+        ):
+            return None
+
+        key = page_cache.cache_key(request)
+        response = page_cache.get(key)
+        if response is None:
+            request._page_cache_key = key
+            return None
+
+        response['X-Page-Cache'] = 'hit'
+        last_modified = response.get('Last-Modified')
+        not_modified = get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+            response=response,
+        )
+        return not_modified
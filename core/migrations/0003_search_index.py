@@ -0,0 +1,76 @@
+from django.db import OperationalError, migrations
+from django.utils.html import strip_tags
+
+FTS_TABLES = ('core_blogpost_fts', 'core_event_fts')
+
+
+def _join(*values):
+    return ' '.join(strip_tags(value) for value in values if value)
+
+
+def _has_fts5(connection):
+    # SQLite builds without FTS5 search with icontains instead (see core.search)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT fts5(NULL)')
+    except OperationalError:
+        return False
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite' or not _has_fts5(schema_editor.connection):
+        return
+
+    BlogPost = apps.get_model('core', 'BlogPost')
+    Event = apps.get_model('core', 'Event')
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in FTS_TABLES:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                f"title, body, author, tokenize='unicode61 remove_diacritics 2')"
+            )
+
+        for post in BlogPost.objects.select_related('author'):
+            author = post.author
+            cursor.execute(
+                'INSERT INTO core_blogpost_fts (rowid, title, body, author) VALUES (%s, %s, %s, %s)',
+                [
+                    post.pk,
+                    post.title,
+                    _join(post.excerpt, post.content),
+                    _join(f'{author.first_name} {author.last_name}'.strip(), author.username),
+                ],
+            )
+
+        for event in Event.objects.all():
+            cursor.execute(
+                'INSERT INTO core_event_fts (rowid, title, body, author) VALUES (%s, %s, %s, %s)',
+                [
+                    event.pk,
+                    event.title,
+                    _join(event.description, event.location),
+                    _join(event.organizer, event.speakers),
+                ],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in FTS_TABLES:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_registration'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
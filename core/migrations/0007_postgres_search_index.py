@@ -0,0 +1,48 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# The expressions must stay identical to SearchSpec.vector in core/search.py,
+# otherwise the planner cannot use the indexes for searches.
+SEARCH_INDEXES = {
+    'BlogPost': (
+        'core_blogpost_search_gin',
+        SearchVector('title', weight='A', config='portuguese')
+        + SearchVector('excerpt', 'content', weight='B', config='portuguese'),
+    ),
+    'Event': (
+        'core_event_search_gin',
+        SearchVector('title', weight='A', config='portuguese')
+        + SearchVector('description', 'location', weight='B', config='portuguese')
+        + SearchVector('organizer', 'speakers', weight='C', config='portuguese'),
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for model_name, (name, expression) in SEARCH_INDEXES.items():
+        model = apps.get_model('core', model_name)
+        schema_editor.add_index(model, GinIndex(expression, name=name))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for model_name, (name, expression) in SEARCH_INDEXES.items():
+        model = apps.get_model('core', model_name)
+        schema_editor.remove_index(model, GinIndex(expression, name=name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_task'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_postgres_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='blogpost_featured_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_featured_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['status', '-published_date'], name='blogpost_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['status', 'date', 'start_time'], name='event_featured_idx'),
+        ),
+    ]
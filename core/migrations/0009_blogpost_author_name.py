@@ -0,0 +1,56 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+INDEX_NAME = 'core_blogpost_search_gin'
+
+# Migration 0007's expression, and the one replacing it. The new one must
+# stay identical to SearchSpec.vector for BlogPost in core/search.py.
+OLD_EXPRESSION = (
+    SearchVector('title', weight='A', config='portuguese')
+    + SearchVector('excerpt', 'content', weight='B', config='portuguese')
+)
+NEW_EXPRESSION = OLD_EXPRESSION + SearchVector('author_name', weight='C', config='portuguese')
+
+
+def fill_author_names(apps, schema_editor):
+    BlogPost = apps.get_model('core', 'BlogPost')
+    User = apps.get_model('core', 'User')
+    for user in User.objects.filter(pk__in=BlogPost.objects.values('author_id')).iterator():
+        # Same value as User.get_search_name(), which historical models lack
+        full_name = f'{user.first_name} {user.last_name}'.strip()
+        name = ' '.join(value for value in (full_name, user.username) if value)
+        BlogPost.objects.filter(author_id=user.pk).update(author_name=name)
+
+
+def _swap_index(apps, schema_editor, old, new):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    model = apps.get_model('core', 'BlogPost')
+    schema_editor.remove_index(model, GinIndex(old, name=INDEX_NAME))
+    schema_editor.add_index(model, GinIndex(new, name=INDEX_NAME))
+
+
+def add_author_to_search_index(apps, schema_editor):
+    _swap_index(apps, schema_editor, OLD_EXPRESSION, NEW_EXPRESSION)
+
+
+def remove_author_from_search_index(apps, schema_editor):
+    _swap_index(apps, schema_editor, NEW_EXPRESSION, OLD_EXPRESSION)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_featured_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='author_name',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_author_names, migrations.RunPython.noop),
+        migrations.RunPython(add_author_to_search_index, remove_author_from_search_index),
+    ]
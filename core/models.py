@@ -27,6 +27,10 @@ class User(AbstractUser):
     
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
+
+    def get_search_name(self):
+        """Full name and username, as indexed for search in ``BlogPost.author_name``"""
+        return ' '.join(value for value in (self.get_full_name(), self.username) if value)
     
     def is_admin(self):
         return self.role == 'admin'
@@ -104,6 +108,9 @@ class BlogPost(models.Model):
         null=True, 
         verbose_name='Imagem'
     )
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    # Copy of author.get_search_name(): the PostgreSQL search index cannot join core_user
+    author_name = models.TextField(blank=True, editable=False)
     views = models.PositiveIntegerField(default=0, verbose_name='Visualizações')
     likes = models.PositiveIntegerField(default=0, verbose_name='Curtidas')
     featured = models.BooleanField(default=False, verbose_name='Destaque')
@@ -120,6 +127,16 @@ class BlogPost(models.Model):
         verbose_name = 'Post do Blog'
         verbose_name_plural = 'Posts do Blog'
         ordering = ['-published_date']
+        indexes = [
+            # Public list: status='published' ORDER BY -published_date, -id
+            models.Index(fields=['status', '-published_date', '-id'], name='blogpost_status_pub_idx'),
+            # SQLite only picks a partial index whose key leads with the equality term
+            models.Index(
+                fields=['status', '-published_date'],
+                condition=models.Q(featured=True),
+                name='blogpost_featured_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -130,6 +147,8 @@ class BlogPost(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        if self.author_id is not None:
+            self.author_name = self.author.get_search_name()
         super().save(*args, **kwargs)
 
     def get_tags_list(self):
@@ -180,6 +199,7 @@ class Event(models.Model):
         null=True, 
         verbose_name='Imagem'
     )
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     status = models.CharField(
         max_length=20, 
         choices=STATUS_CHOICES, 
@@ -196,6 +216,14 @@ class Event(models.Model):
         verbose_name = 'Evento'
         verbose_name_plural = 'Eventos'
         ordering = ['date', 'start_time']
+        indexes = [
+            models.Index(fields=['date', 'start_time', 'id'], name='event_date_idx'),
+            models.Index(
+                fields=['status', 'date', 'start_time'],
+                condition=models.Q(featured=True),
+                name='event_featured_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -223,6 +251,34 @@ class Event(models.Model):
         return max(0, self.capacity - self.registered)
 
 
+class Registration(models.Model):
+    """Event registration ledger, one row per user and event"""
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='registrations',
+        verbose_name='Evento'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='event_registrations',
+        verbose_name='Usuário'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Inscrito em')
+
+    class Meta:
+        verbose_name = 'Inscrição'
+        verbose_name_plural = 'Inscrições'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'event'], name='unique_registration_per_user_event'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.event}"
+
+
 class ContactMessage(models.Model):
     """Contact form messages"""
     name = models.CharField(max_length=100, verbose_name='Nome')
@@ -236,6 +292,46 @@ class ContactMessage(models.Model):
         verbose_name = 'Mensagem de Contato'
         verbose_name_plural = 'Mensagens de Contato'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_read=False),
+                name='contactmessage_unread_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.subject}"
+
+
+class Task(models.Model):
+    """Background job queued for the run_worker command"""
+    STATUS_CHOICES = [
+        ('pending', 'Pendente'),
+        ('running', 'Em execução'),
+        ('done', 'Concluída'),
+        ('failed', 'Falhou'),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name='Tarefa')
+    args = models.JSONField(default=list, blank=True, verbose_name='Argumentos')
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name='Argumentos nomeados')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='Status')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Tentativas')
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name='Máximo de tentativas')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='Executar após')
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name='Iniciada em')
+    last_error = models.TextField(blank=True, verbose_name='Último erro')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Criada em')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Atualizada em')
+
+    class Meta:
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
@@ -0,0 +1,91 @@
+"""Whole-page cache for anonymous visitors.
+
+``core.middleware.PageCacheMiddleware`` serves the public pages listed in
+``PAGE_CACHE_URL_NAMES`` from the cache when the visitor is anonymous and
+has no pending flash messages. Entries are keyed on host, path and the
+query parameters in ``PAGE_CACHE_QUERY_PARAMS`` (sorted, blanks dropped),
+so tracking parameters and ordering do not fragment the cache. The key
+also carries the content generation, so the signals that bump it in
+``core.signals`` retire every cached page at once.
+
+Hits and misses are counted in the cache and shown by ``stats()``.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import content_cache
+
+DEFAULT_URL_NAMES = ('home', 'blog', 'eventos', 'sobre', 'projetos', 'semana_consciencia_negra')
+DEFAULT_QUERY_PARAMS = ('search', 'category', 'type', 'page', 'cursor', 'count')
+
+HITS_KEY = 'pagecache:hits'
+MISSES_KEY = 'pagecache:misses'
+
+
+def url_names():
+    return set(getattr(settings, 'PAGE_CACHE_URL_NAMES', DEFAULT_URL_NAMES))
+
+
+def cache_key(request):
+    params = getattr(settings, 'PAGE_CACHE_QUERY_PARAMS', DEFAULT_QUERY_PARAMS)
+    query = sorted(
+        (name, value.strip())
+        for name in params
+        for value in request.GET.getlist(name)
+        if value.strip()
+    )
+    url = f'{request.get_host()}{request.path}?{urlencode(query)}'
+    return f'pagecache:{content_cache.generation()}:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def get(key):
+    """Cached response for ``key``, or None."""
+    entry = cache.get(key)
+    _count(HITS_KEY if entry is not None else MISSES_KEY)
+    if entry is None:
+        return None
+    status, headers, content = entry
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response.headers[name] = value
+    return response
+
+
+def store(key, response):
+    """Cache ``response`` if it is a plain, cookie-free 200."""
+    cache_control = response.get('Cache-Control', '')
+    if (
+        response.status_code != 200
+        or response.streaming
+        or response.cookies
+        or 'private' in cache_control
+        or 'no-store' in cache_control
+    ):
+        return False
+    headers = list(response.items())
+    timeout = getattr(settings, 'CONTENT_CACHE_TIMEOUT', 86400)
+    cache.set(key, (response.status_code, headers, response.content), timeout)
+    return True
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 3) if total else None,
+    }
@@ -0,0 +1,232 @@
+"""Keyset (cursor) pagination.
+
+Pages are addressed by an opaque cursor holding the ordering values of the
+first or last row shown, and the next page is fetched with
+``WHERE (a, b) < (x, y)`` style conditions instead of OFFSET. Deep pages
+cost the same as the first one, rows inserted concurrently never shift
+the pages, and no COUNT(*) is issued unless ``?count=1`` is requested.
+
+The ordering must end with a unique field (usually ``id``) so every row
+has a distinct position.
+"""
+import base64
+import binascii
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def _split(field):
+    return (field[1:], True) if field.startswith('-') else (field, False)
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetPage:
+    """One page of results, with cursors for its neighbours"""
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None, total_count=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total_count = total_count
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = int(per_page)
+        self.fields = [_split(field)[0] for field in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        # value_to_string keeps full precision (DjangoJSONEncoder would
+        # truncate datetimes to milliseconds and skip rows on the boundary)
+        meta = self.queryset.model._meta
+        values = [meta.get_field(field).value_to_string(obj) for field in self.fields]
+        payload = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_values = payload['d'], payload['v']
+            if direction not in ('next', 'prev') or len(raw_values) != len(self.fields):
+                raise InvalidCursor(cursor)
+            meta = self.queryset.model._meta
+            values = [meta.get_field(field).to_python(value) for field, value in zip(self.fields, raw_values)]
+        except (ValueError, TypeError, KeyError, binascii.Error, UnicodeDecodeError) as exc:
+            raise InvalidCursor(cursor) from exc
+        return direction, values
+
+    def _after(self, ordering, values):
+        """Q for rows strictly after ``values`` in ``ordering``."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name, descending = _split(field)
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _window(self, cursor):
+        """``(direction, values, queryset)``; the queryset fetches one extra row."""
+        direction, values = self.decode_cursor(cursor) if cursor else ('next', None)
+        ordering = self.ordering if direction == 'next' else [_flip(field) for field in self.ordering]
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+        return direction, values, queryset[:self.per_page + 1]
+
+    def page(self, cursor=None, with_count=False):
+        direction, values, queryset = self._window(cursor)
+        items = list(queryset)
+        total_count = self.queryset.count() if with_count else None
+        return self._make_page(items, direction, values, total_count)
+
+    async def apage(self, cursor=None, with_count=False):
+        direction, values, queryset = self._window(cursor)
+        items = [obj async for obj in queryset]
+        total_count = await self.queryset.acount() if with_count else None
+        return self._make_page(items, direction, values, total_count)
+
+    def _make_page(self, items, direction, values, total_count):
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        if direction == 'next':
+            has_next, has_previous = has_more, values is not None
+        else:
+            items.reverse()
+            has_next, has_previous = True, has_more
+
+        return KeysetPage(
+            items,
+            self,
+            next_cursor=self.encode_cursor(items[-1], 'next') if items and has_next else None,
+            previous_cursor=self.encode_cursor(items[0], 'prev') if items and has_previous else None,
+            total_count=total_count,
+        )
+
+
+class KeysetPaginationMixin:
+    """ListView mixin that paginates with ``KeysetPaginator``.
+
+    Views set ``keyset_ordering``. Search results are ordered by relevance
+    rather than by a key, so requests carrying ``search_param`` (or views
+    whose ``get_keyset_ordering`` returns ``None``) fall back to Django's
+    page-number pagination. The context gains ``next_page_query``,
+    ``previous_page_query`` and ``total_count``.
+    """
+    keyset_ordering = None
+    cursor_param = 'cursor'
+    count_param = 'count'
+    search_param = 'search'
+
+    def get_keyset_ordering(self):
+        if self.request.GET.get(self.search_param):
+            return None
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_keyset_ordering()
+        if not ordering:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, ordering, page_size)
+        try:
+            page = paginator.page(
+                self.request.GET.get(self.cursor_param),
+                with_count=bool(self.request.GET.get(self.count_param)),
+            )
+        except InvalidCursor:
+            raise Http404('Cursor inválido.')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """``paginate_queryset`` for views with an async ``get``."""
+        ordering = self.get_keyset_ordering()
+        if not ordering:
+            # Django's Paginator has no async API: count in a thread, then
+            # fetch the page's rows through the async ORM
+            paginator, page, object_list, is_paginated = await sync_to_async(
+                super().paginate_queryset
+            )(queryset, page_size)
+            page.object_list = [obj async for obj in object_list]
+            return (paginator, page, page.object_list, is_paginated)
+
+        paginator = KeysetPaginator(queryset, ordering, page_size)
+        try:
+            page = await paginator.apage(
+                self.request.GET.get(self.cursor_param),
+                with_count=bool(self.request.GET.get(self.count_param)),
+            )
+        except InvalidCursor:
+            raise Http404('Cursor inválido.')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None:
+            context.update(self.get_page_context(page))
+        return context
+
+    def get_page_context(self, page):
+        if isinstance(page, KeysetPage):
+            return {
+                'next_page_query': self._page_query(self.cursor_param, page.next_cursor),
+                'previous_page_query': self._page_query(self.cursor_param, page.previous_cursor),
+                'total_count': page.total_count,
+            }
+        return {
+            'next_page_query': self._page_query(
+                self.page_kwarg, page.next_page_number() if page.has_next() else None
+            ),
+            'previous_page_query': self._page_query(
+                self.page_kwarg, page.previous_page_number() if page.has_previous() else None
+            ),
+            'total_count': page.paginator.count,
+        }
+
+    def _page_query(self, param, value):
+        if value is None:
+            return None
+        params = self.request.GET.copy()
+        for key in (self.cursor_param, self.page_kwarg):
+            params.pop(key, None)
+        params[param] = value
+        return params.urlencode()
@@ -0,0 +1,107 @@
+"""Prerendered HTML pages.
+
+``manage.py prerender_site`` renders pages through the full middleware
+stack, as an anonymous visitor would see them, into
+``PRERENDER_ROOT/<path>/index.html`` with ``.gz``/``.br`` siblings. By
+default only the content-free pages (``STATIC_PAGES``) are built; with
+``--all`` the home, blog and events lists are included too, as a snapshot
+that must be rebuilt after publishing. Post and event detail pages are
+never prerendered: a served file would skip ``record_view`` and show stale
+view and registration counts, and rendering them would record views
+nobody made.
+
+With ``PRERENDER_SERVE`` on, ``wsgi.py`` puts ``PrerenderedPagesMiddleware``
+in front of Django. It answers query-less GET/HEAD requests from visitors
+without a session or flash-message cookie straight from those files, so
+the site keeps serving cheaply under load and before Django has warmed up.
+Anything else falls through to Django. Cached pages are checked against
+the file's mtime and size on every hit, so a rebuild takes effect without
+a restart and a deleted page falls through.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.http.cookie import parse_cookie
+from django.urls import reverse
+
+from .staticfiles import (
+    ASGIStaticFilesMiddleware, StaticFileFinder, StaticFilesMiddleware, compress_file,
+)
+
+STATIC_PAGES = ('sobre', 'projetos', 'semana_consciencia_negra')
+
+# Visitors carrying these cookies may see a personalised page
+PERSONAL_COOKIES = (settings.SESSION_COOKIE_NAME, 'messages')
+
+
+def output_root():
+    return Path(getattr(settings, 'PRERENDER_ROOT', settings.BASE_DIR / 'prerendered'))
+
+
+def static_paths():
+    return [reverse(name) for name in STATIC_PAGES]
+
+
+def content_paths():
+    """The home page and the blog and events lists."""
+    return [reverse('home'), reverse('blog'), reverse('eventos')]
+
+
+def render_page(client, path, root, secure=False):
+    """Write ``path`` under ``root``; return the file, or an error message."""
+    response = client.get(path, secure=secure)
+    if response.status_code != 200:
+        return None, f'status {response.status_code}'
+    if response.cookies:
+        # e.g. a CSRF cookie: the page holds a form that needs a live token
+        return None, 'sets cookies'
+    target = root / path.strip('/') / 'index.html'
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(response.content)
+    compress_file(str(target))
+    return target, None
+
+
+class PrerenderedPageFinder(StaticFileFinder):
+    """Maps ``/path/`` to ``PRERENDER_ROOT/path/index.html``."""
+
+    cache_control = 'public, max-age=60'
+    revalidate = True
+
+    def __init__(self, root=None, prefix=None):
+        super().__init__(root or output_root(), prefix or '/')
+
+    def find(self, request_path):
+        if not request_path.endswith('/'):
+            return None
+        return super().find(request_path + 'index.html')
+
+
+def _is_personal(cookie_header):
+    cookies = parse_cookie(cookie_header)
+    return any(name in cookies for name in PERSONAL_COOKIES)
+
+
+class PrerenderedPagesMiddleware(StaticFilesMiddleware):
+    """WSGI wrapper serving prerendered pages to anonymous visitors."""
+
+    finder_class = PrerenderedPageFinder
+
+    def find(self, environ):
+        if environ.get('QUERY_STRING') or _is_personal(environ.get('HTTP_COOKIE', '')):
+            return None
+        return super().find(environ)
+
+
+class ASGIPrerenderedPagesMiddleware(ASGIStaticFilesMiddleware):
+    """ASGI counterpart of ``PrerenderedPagesMiddleware``."""
+
+    finder_class = PrerenderedPageFinder
+
+    def find(self, scope):
+        if scope['type'] != 'http' or scope.get('query_string'):
+            return None
+        cookie = dict(scope['headers']).get(b'cookie', b'').decode('latin-1')
+        if _is_personal(cookie):
+            return None
+        return super().find(scope)
@@ -0,0 +1,95 @@
+"""Event registration service.
+
+Capacity is enforced in the database: the ``registered`` counter is only
+incremented by a conditional ``UPDATE ... WHERE registered < capacity``, in
+the same transaction that inserts the ``Registration`` row. A rejected
+update rolls the insert back, so concurrent requests can never oversell an
+event, and the unique (user, event) constraint rejects duplicates.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Event, Registration
+
+
+class RegistrationError(Exception):
+    """Base class for rejected registrations"""
+    message = 'Não foi possível realizar a inscrição.'
+
+    def __init__(self, message=None):
+        super().__init__(message or self.message)
+
+
+class RegistrationNotRequired(RegistrationError):
+    message = 'Este evento não requer inscrição.'
+
+
+class EventFull(RegistrationError):
+    message = 'Evento lotado.'
+
+
+class AlreadyRegistered(RegistrationError):
+    message = 'Você já está inscrito(a) neste evento.'
+
+
+def register(event, user):
+    """Register ``user`` for ``event`` and return the new ``Registration``."""
+    if not event.registration_required:
+        raise RegistrationNotRequired()
+
+    try:
+        with transaction.atomic():
+            registration = Registration.objects.create(event=event, user=user)
+            updated = Event.objects.filter(
+                pk=event.pk,
+                registered__lt=F('capacity'),
+            ).update(registered=F('registered') + 1)
+            if not updated:
+                raise EventFull()
+    except IntegrityError:
+        raise AlreadyRegistered()
+
+    return registration
+
+
+def register_many(event, users):
+    """Register several users for ``event`` in a single transaction.
+
+    Users that are already registered are skipped. The remaining ones are
+    admitted all together or not at all: if they do not fit in the spots
+    left, ``EventFull`` is raised and nothing is written.
+
+    Returns a tuple ``(registrations, skipped_users)``.
+    """
+    if not event.registration_required:
+        raise RegistrationNotRequired()
+
+    users = list({user.pk: user for user in users}.values())
+
+    try:
+        with transaction.atomic():
+            existing = set(
+                Registration.objects.filter(event=event, user__in=users)
+                .values_list('user_id', flat=True)
+            )
+            new_users = [user for user in users if user.pk not in existing]
+            skipped = [user for user in users if user.pk in existing]
+            if not new_users:
+                return [], skipped
+
+            count = len(new_users)
+            updated = Event.objects.filter(
+                pk=event.pk,
+                registered__lte=F('capacity') - count,
+            ).update(registered=F('registered') + count)
+            if not updated:
+                raise EventFull()
+
+            registrations = Registration.objects.bulk_create(
+                [Registration(event=event, user=user) for user in new_users]
+            )
+    except IntegrityError:
+        # Another request registered one of these users concurrently
+        raise AlreadyRegistered('Um ou mais usuários já estão inscritos neste evento.')
+
+    return registrations, skipped
@@ -0,0 +1,272 @@
+"""Full-text search for blog posts and events.
+
+The engine follows the database (see ``backend``):
+
+* SQLite: each searchable model gets an FTS5 table named
+  ``<db_table>_fts`` whose rowid is the object's primary key. The tables
+  use the ``unicode61`` tokenizer with ``remove_diacritics 2``, so
+  "educacao" matches "Educação". Rows are kept in sync by the
+  ``post_save``/``post_delete`` handlers in ``core.signals``;
+  ``manage.py rebuild_search_index`` rebuilds them.
+* PostgreSQL: a weighted ``tsvector`` over the model's own columns with the
+  ``portuguese`` configuration (stemming and stop words), served by the
+  GIN expression indexes from migrations 0007 and 0009. An expression
+  index cannot join, so posts carry their author's name in
+  ``BlogPost.author_name``, refreshed on save and by the ``User`` handler
+  in ``core.signals``. PostgreSQL maintains the index itself, so there is
+  nothing else to sync or rebuild.
+
+``search_queryset`` is the single entry point used by the views: it
+restricts a queryset to the matches, orders them by relevance and
+annotates ``search_rank`` and ``search_snippet``. On other databases it
+falls back to ``icontains`` lookups over the same fields.
+"""
+import re
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import add, or_
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import OperationalError, connection
+from django.db.models import F, Q
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .models import BlogPost, Event
+
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 24
+
+# PostgreSQL text search configuration for documents and queries
+SEARCH_CONFIG = 'portuguese'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# alias -> whether its SQLite library has FTS5, probed once per process
+_fts5 = {}
+
+
+@dataclass
+class SearchSpec:
+    """How a model is indexed: column values plus the fallback lookups"""
+    model: type
+    title: callable
+    body: callable
+    author: callable
+    lookups: list = field(default_factory=list)
+    # bm25 weights for the title, body and author columns
+    weights: tuple = (10.0, 1.0, 3.0)
+    # PostgreSQL: ((fields, weight), ...) making up the tsvector, which must
+    # match the GIN index of the latest migration that (re)creates it
+    # (0009 for posts, 0007 for events), and the field snippets come from
+    vector: tuple = ()
+    headline: str = ''
+
+    @property
+    def table(self):
+        return f'{self.model._meta.db_table}_fts'
+
+    def document(self, obj):
+        return (self.title(obj), self.body(obj), self.author(obj))
+
+    def search_vector(self):
+        return reduce(add, (
+            SearchVector(*fields, weight=weight, config=SEARCH_CONFIG) for fields, weight in self.vector
+        ))
+
+
+def _join(*values):
+    return ' '.join(strip_tags(value) for value in values if value)
+
+
+REGISTRY = {
+    BlogPost: SearchSpec(
+        model=BlogPost,
+        title=lambda post: post.title,
+        body=lambda post: _join(post.excerpt, post.content),
+        author=lambda post: _join(post.author.get_full_name(), post.author.username),
+        lookups=['title', 'excerpt', 'author__first_name', 'author__last_name'],
+        vector=((('title',), 'A'), (('excerpt', 'content'), 'B'), (('author_name',), 'C')),
+        headline='content',
+    ),
+    Event: SearchSpec(
+        model=Event,
+        title=lambda event: event.title,
+        body=lambda event: _join(event.description, event.location),
+        author=lambda event: _join(event.organizer, event.speakers),
+        lookups=['title', 'organizer', 'location'],
+        vector=((('title',), 'A'), (('description', 'location'), 'B'), (('organizer', 'speakers'), 'C')),
+        headline='description',
+    ),
+}
+
+
+def backend():
+    """The search engine for the current database: 'fts5', 'postgres' or None."""
+    if connection.vendor == 'sqlite':
+        return 'fts5' if _has_fts5() else None
+    return {'postgresql': 'postgres'}.get(connection.vendor)
+
+
+def _has_fts5():
+    # fts5() only exists when the module is compiled in or loaded; SQLite
+    # builds without it fall back to icontains
+    if connection.alias not in _fts5:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT fts5(NULL)')
+            _fts5[connection.alias] = True
+        except OperationalError:
+            _fts5[connection.alias] = False
+    return _fts5[connection.alias]
+
+
+def is_available():
+    """Whether the FTS5 tables are in use and need to be kept in sync."""
+    return backend() == 'fts5'
+
+
+def has_terms(text):
+    """Whether ``text`` has any word to search for."""
+    return bool(_TOKEN_RE.search(text or ''))
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    tokens = _TOKEN_RE.findall(text or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def index_object(obj):
+    spec = REGISTRY.get(type(obj))
+    if spec is None or not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {spec.table} WHERE rowid = %s', [obj.pk])
+        cursor.execute(
+            f'INSERT INTO {spec.table} (rowid, title, body, author) VALUES (%s, %s, %s, %s)',
+            [obj.pk, *spec.document(obj)],
+        )
+
+
+def remove_object(obj):
+    spec = REGISTRY.get(type(obj))
+    if spec is None or not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {spec.table} WHERE rowid = %s', [obj.pk])
+
+
+def index_author(user):
+    """Refresh the index rows of ``user``'s posts, e.g. after a name change."""
+    if not is_available():
+        return 0
+    spec = REGISTRY[BlogPost]
+    rows = [
+        [post.pk, *spec.document(post)]
+        for post in BlogPost.objects.filter(author=user).select_related('author')
+    ]
+    if not rows:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {spec.table} WHERE rowid = %s', [[row[0]] for row in rows])
+        return _insert_batch(cursor, spec, rows)
+
+
+def rebuild_index(model=None, batch_size=500):
+    """Recreate the index rows for ``model`` (or every registered model)."""
+    if not is_available():
+        return 0
+    specs = [REGISTRY[model]] if model else REGISTRY.values()
+    total = 0
+    for spec in specs:
+        queryset = spec.model.objects.order_by('pk')
+        if spec.model is BlogPost:
+            queryset = queryset.select_related('author')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {spec.table}')
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                batch.append([obj.pk, *spec.document(obj)])
+                if len(batch) >= batch_size:
+                    total += _insert_batch(cursor, spec, batch)
+                    batch = []
+            total += _insert_batch(cursor, spec, batch)
+    return total
+
+
+def _insert_batch(cursor, spec, rows):
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO {spec.table} (rowid, title, body, author) VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+    return len(rows)
+
+
+def build_tsquery(text):
+    """Turn free text into a PostgreSQL tsquery: every word must match as a prefix."""
+    tokens = _TOKEN_RE.findall(text or '')
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def search_queryset(queryset, text):
+    """Restrict ``queryset`` to the objects matching ``text``, best first.
+
+    Matching objects are annotated with ``search_rank`` (lower is better)
+    and ``search_snippet`` (raw snippet, render it with ``highlight``).
+    """
+    spec = REGISTRY[queryset.model]
+    match = build_match_query(text)
+    if not match:
+        return queryset
+
+    engine = backend()
+    if engine == 'postgres':
+        return _postgres_queryset(queryset, spec, text)
+    if engine is None:
+        condition = reduce(or_, (Q(**{f'{lookup}__icontains': text}) for lookup in spec.lookups))
+        return queryset.filter(condition)
+
+    table = spec.table
+    model_table = queryset.model._meta.db_table
+    weights = ', '.join(str(weight) for weight in spec.weights)
+    return queryset.extra(
+        tables=[table],
+        where=[f'{table}.rowid = {model_table}.id', f'{table} MATCH %s'],
+        params=[match],
+        select={
+            'search_rank': f'bm25({table}, {weights})',
+            'search_snippet': (
+                f"snippet({table}, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', {SNIPPET_TOKENS})"
+            ),
+        },
+    ).order_by('search_rank')
+
+
+def _postgres_queryset(queryset, spec, text):
+    # Filtering on the annotation puts the indexed expression itself in the
+    # WHERE clause, which is what lets the planner use the GIN index
+    query = SearchQuery(build_tsquery(text), config=SEARCH_CONFIG, search_type='raw')
+    return queryset.alias(
+        search_document=spec.search_vector(),
+    ).filter(
+        search_document=query,
+    ).annotate(
+        search_rank=-SearchRank(F('search_document'), query),
+        search_snippet=SearchHeadline(
+            spec.headline, query, config=SEARCH_CONFIG,
+            start_sel=SNIPPET_START, stop_sel=SNIPPET_END,
+            max_words=SNIPPET_TOKENS, min_words=SNIPPET_TOKENS // 2, max_fragments=1,
+        ),
+    ).order_by('search_rank')
+
+
+def highlight(snippet):
+    """Escape a raw snippet and wrap the matched terms in ``<mark>``."""
+    if not snippet:
+        return ''
+    # PostgreSQL headlines come from the stored HTML rather than stripped text
+    html = escape(strip_tags(snippet)).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+    return mark_safe(html)
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import content_cache, dashboard, images, search
+from .models import BlogPost, Category, ContactMessage, Event, Tag, User
+
+# User fields that end up in the search index of their posts
+AUTHOR_FIELDS = {'first_name', 'last_name', 'username'}
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Event)
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    if not raw:
+        images.schedule_derivatives(instance)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Event)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_object(instance)
+
+
+@receiver(post_save, sender=User)
+def reindex_author_posts(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # New users have no posts; saves that leave the name alone (last_login
+    # on every login) don't change the index
+    if raw or created or (update_fields is not None and not AUTHOR_FIELDS & set(update_fields)):
+        return
+    BlogPost.objects.filter(author=instance).update(author_name=instance.get_search_name())
+    search.index_author(instance)
+
+
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Event)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=ContactMessage)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=ContactMessage)
+def invalidate_dashboard_stats(sender, created=False, update_fields=None, **kwargs):
+    # Every login saves User.last_login; only new users and role changes
+    # move the user counters
+    if sender is User and not created and update_fields is not None and 'role' not in update_fields:
+        return
+    dashboard.invalidate_stats()
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+def bump_content_generation(sender, raw=False, **kwargs):
+    # After commit, so a request can't cache the old rows under the new generation
+    if not raw:
+        transaction.on_commit(content_cache.bump)
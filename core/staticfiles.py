@@ -0,0 +1,298 @@
+"""Pre-compressed static files with far-future caching.
+
+``CompressedManifestStaticFilesStorage`` writes ``.gz`` and ``.br``
+siblings next to every hashed text asset during ``collectstatic``, so
+compression happens once per deploy instead of once per request. Brotli
+output needs the optional ``brotli`` package; without it only gzip files
+are written.
+
+``StaticFilesMiddleware`` (WSGI) and ``ASGIStaticFilesMiddleware`` serve
+``STATIC_URL`` straight from ``STATIC_ROOT`` in front of Django: they pick
+the best encoding the client accepts, hand the open file to
+``wsgi.file_wrapper`` (which gunicorn turns into ``sendfile()``) or stream
+it in chunks read off the event loop under ASGI, and mark hashed names as
+immutable. Every response carries an ETag and Last-Modified, and
+conditional requests are answered with 304 (or 412) through Django's
+``get_conditional_response`` before the file is opened. Small deployments
+need no separate web server for assets. Paths that are not collected fall
+through to Django.
+"""
+import gzip
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from http import HTTPStatus
+from wsgiref.util import FileWrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.cache import get_conditional_response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.ico'}
+
+# (suffix, Content-Encoding) in order of preference
+ENCODINGS = [('.br', 'br'), ('.gz', 'gzip')]
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=3600'
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+CHUNK_SIZE = 64 * 1024
+
+# Headers a 304 repeats from the full response
+NOT_MODIFIED_HEADERS = {'ETag', 'Last-Modified', 'Cache-Control', 'Vary'}
+
+
+def compress_file(path):
+    """Write ``path.gz`` (and ``path.br``) when they are smaller than ``path``."""
+    with open(path, 'rb') as source:
+        data = source.read()
+
+    written = []
+    candidates = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.append(('.br', lambda: brotli.compress(data, quality=11)))
+    for suffix, compress in candidates:
+        compressed = compress()
+        # Not worth a second round trip through the decoder
+        if len(compressed) >= len(data) * 0.95:
+            continue
+        with open(path + suffix, 'wb') as target:
+            target.write(compressed)
+        written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes pre-compressed copies of hashed files."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if os.path.splitext(hashed_name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                compress_file(self.path(hashed_name))
+
+
+def file_signature(path):
+    """``(mtime, size)`` of ``path`` and of each encoded sibling, None where missing."""
+    stat = os.stat(path)
+    signature = [(stat.st_mtime_ns, stat.st_size)]
+    for suffix, _ in ENCODINGS:
+        try:
+            stat = os.stat(path + suffix)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def make_etag(mtime_ns, size):
+    return f'"{mtime_ns:x}-{size:x}"'
+
+
+class ConditionalRequest:
+    """The parts of ``HttpRequest`` that ``get_conditional_response`` reads."""
+
+    def __init__(self, method, path, meta):
+        self.method = method
+        self.path = path
+        self.META = meta
+
+
+class StaticFile:
+    """A collected file and the encoded variants available for it."""
+
+    def __init__(self, path, url_path, cache_control=None):
+        self.path = path
+        self.signature = file_signature(path)
+        mtime_ns, size = self.signature[0]
+        self.last_modified = mtime_ns // 10**9
+        content_type, _ = mimetypes.guess_type(path)
+        if content_type and (content_type.startswith('text/') or content_type in ('application/javascript', 'application/json', 'image/svg+xml')):
+            content_type += '; charset=utf-8'
+        self.headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Last-Modified', formatdate(mtime_ns / 1e9, usegmt=True)),
+            ('Cache-Control', cache_control or (
+                IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(url_path) else DEFAULT_CACHE_CONTROL
+            )),
+        ]
+        # Each encoding is its own representation, with its own ETag
+        self.variants = [(None, path, size, make_etag(mtime_ns, size))]
+        for (suffix, encoding), sibling in zip(ENCODINGS, self.signature[1:]):
+            if sibling is not None:
+                self.variants.insert(-1, (encoding, path + suffix, sibling[1], make_etag(*sibling)))
+        if len(self.variants) > 1:
+            self.headers.append(('Vary', 'Accept-Encoding'))
+
+    def is_stale(self):
+        """True when the file or one of its encoded siblings changed since it was read."""
+        try:
+            return file_signature(self.path) != self.signature
+        except FileNotFoundError:
+            return True
+
+    def select(self, accept_encoding):
+        """Return ``(path, headers, etag)`` for the best variant the client accepts."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, path, size, etag in self.variants:
+            if encoding is None or encoding in accepted:
+                headers = self.headers + [('ETag', etag), ('Content-Length', str(size))]
+                if encoding:
+                    headers.append(('Content-Encoding', encoding))
+                return path, headers, etag
+
+    def precondition(self, request, etag, headers):
+        """``(status, headers)`` for a 304 or 412 answer, or None to send the file."""
+        response = get_conditional_response(request, etag=etag, last_modified=self.last_modified)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return 304, [(name, value) for name, value in headers if name in NOT_MODIFIED_HEADERS]
+        return response.status_code, [('Content-Length', '0')]
+
+
+def parse_accept_encoding(header):
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q=') and quality[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFileFinder:
+    """Maps request paths under ``STATIC_URL`` to files in ``STATIC_ROOT``."""
+
+    cache_control = None
+    # Re-stat cached files before serving them, for roots rewritten while
+    # the process runs (prerendered pages)
+    revalidate = False
+
+    def __init__(self, root=None, prefix=None):
+        self.root = os.path.realpath(root or settings.STATIC_ROOT)
+        self.prefix = prefix or settings.STATIC_URL
+        if not self.prefix.startswith('/'):
+            self.prefix = '/' + self.prefix
+        # Collected files only change on deploy, so hits are kept for the
+        # process lifetime. Misses and non-canonical spellings of a path are
+        # not, so the cache never outgrows the files under root.
+        self.files = {}
+
+    def find(self, request_path):
+        if not request_path.startswith(self.prefix):
+            return None
+        found = self.files.get(request_path)
+        if found is not None and not (self.revalidate and found.is_stale()):
+            return found
+        self.files.pop(request_path, None)
+
+        relative = request_path[len(self.prefix):]
+        joined = os.path.join(self.root, relative)
+        path = os.path.realpath(joined)
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path) or path.endswith(('.gz', '.br')):
+            return None
+        found = StaticFile(path, relative, self.cache_control)
+        if os.path.normpath(joined) == joined:
+            self.files[request_path] = found
+        return found
+
+
+class StaticFilesMiddleware:
+    """WSGI wrapper serving collected static files before Django sees the request."""
+
+    finder_class = StaticFileFinder
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.finder = self.finder_class(root, prefix)
+
+    def find(self, environ):
+        if environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+            return None
+        return self.finder.find(environ.get('PATH_INFO', ''))
+
+    def __call__(self, environ, start_response):
+        method = environ.get('REQUEST_METHOD')
+        static_file = self.find(environ)
+        if static_file is None:
+            return self.application(environ, start_response)
+
+        path, headers, etag = static_file.select(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        request = ConditionalRequest(method, environ.get('PATH_INFO', ''), environ)
+        answer = static_file.precondition(request, etag, headers)
+        if answer is not None:
+            status, headers = answer
+            start_response(f'{status} {HTTPStatus(status).phrase}', headers)
+            return []
+        start_response('200 OK', headers)
+        if method == 'HEAD':
+            return []
+        # Servers such as gunicorn turn wsgi.file_wrapper into os.sendfile()
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(path, 'rb'), CHUNK_SIZE)
+
+
+class ASGIStaticFilesMiddleware:
+    """ASGI counterpart of ``StaticFilesMiddleware``."""
+
+    finder_class = StaticFileFinder
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.finder = self.finder_class(root, prefix)
+
+    def find(self, scope):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            return None
+        return self.finder.find(scope['path'])
+
+    async def __call__(self, scope, receive, send):
+        static_file = self.find(scope)
+        if static_file is None:
+            return await self.application(scope, receive, send)
+
+        meta = {
+            'HTTP_' + name.decode('latin-1').upper().replace('-', '_'): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        path, headers, etag = static_file.select(meta.get('HTTP_ACCEPT_ENCODING', ''))
+        status = 200
+        answer = static_file.precondition(ConditionalRequest(scope['method'], scope['path'], meta), etag, headers)
+        if answer is not None:
+            status, headers = answer
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        if answer is not None or scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        with open(path, 'rb') as file:
+            read = sync_to_async(file.read, thread_sensitive=False)
+            while True:
+                chunk = await read(CHUNK_SIZE)
+                more = len(chunk) == CHUNK_SIZE
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more})
+                if not more:
+                    break
@@ -0,0 +1,100 @@
+"""Database-backed background tasks.
+
+``enqueue`` stores a ``Task`` row inside the caller's transaction, so a job
+becomes visible only once the request that created it commits.
+``manage.py run_worker`` claims pending rows with a conditional UPDATE
+(safe with several workers) and runs them in a process pool. Failed jobs
+are retried with exponential backoff up to ``max_attempts``. A job whose
+worker died is reclaimed once ``TASK_LOCK_TIMEOUT`` seconds pass.
+
+Only functions decorated with ``@task`` can be queued. They receive
+JSON-serializable arguments and must be importable by dotted path.
+"""
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+
+def task(func):
+    """Mark ``func`` as runnable by the worker"""
+    func.task_name = f'{func.__module__}.{func.__name__}'
+    return func
+
+
+def enqueue(func, *args, max_attempts=3, unique=False, **kwargs):
+    """Queue ``func(*args, **kwargs)``.
+
+    With ``unique`` an identical job that is still pending is reused. With
+    ``TASKS_EAGER`` the job runs in-process once the transaction commits.
+    """
+    if not hasattr(func, 'task_name'):
+        raise ValueError(f'{func!r} is not decorated with @task')
+    if getattr(settings, 'TASKS_EAGER', False):
+        transaction.on_commit(lambda: func(*args, **kwargs))
+        return None
+    if unique:
+        pending = Task.objects.filter(
+            name=func.task_name, args=list(args), kwargs=kwargs, status='pending'
+        ).first()
+        if pending is not None:
+            return pending
+    return Task.objects.create(
+        name=func.task_name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+    )
+
+
+def _claimable(now):
+    stale = now - timedelta(seconds=getattr(settings, 'TASK_LOCK_TIMEOUT', 600))
+    return Q(status='pending', run_after__lte=now) | Q(status='running', locked_at__lt=stale)
+
+
+def claim_next():
+    """Atomically take the next runnable task, or return None."""
+    now = timezone.now()
+    candidates = Task.objects.filter(_claimable(now)).order_by('run_after', 'id').values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        claimed = Task.objects.filter(_claimable(now), pk=pk).update(
+            status='running',
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def execute(name, args, kwargs):
+    """Entry point inside the worker processes."""
+    func = import_string(name)
+    if not hasattr(func, 'task_name'):
+        raise ValueError(f'{name} is not a task')
+    func(*args, **kwargs)
+
+
+def mark_done(task_obj):
+    Task.objects.filter(pk=task_obj.pk).update(status='done', locked_at=None, last_error='')
+
+
+def mark_failed(task_obj, error):
+    message = ''.join(traceback.format_exception(error))
+    if task_obj.attempts >= task_obj.max_attempts:
+        Task.objects.filter(pk=task_obj.pk).update(status='failed', locked_at=None, last_error=message)
+        return False
+    delay = getattr(settings, 'TASK_RETRY_DELAY', 30) * 2 ** (task_obj.attempts - 1)
+    Task.objects.filter(pk=task_obj.pk).update(
+        status='pending',
+        locked_at=None,
+        last_error=message,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    return True
@@ -0,0 +1,20 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from core import assets
+
+register = template.Library()
+
+
+@register.simple_tag
+def tailwind_stylesheet():
+    """Link the precompiled Tailwind bundle.
+
+    In DEBUG, before ``manage.py build_css`` has been run, falls back to the
+    browser compiler so a fresh checkout still renders styled pages.
+    """
+    if settings.DEBUG and not assets.bundle_available():
+        return format_html('<script src="https://cdn.tailwindcss.com"></script>')
+    return format_html('<link rel="stylesheet" href="{}" />', static(assets.BUNDLE))
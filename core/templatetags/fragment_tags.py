@@ -0,0 +1,62 @@
+"""Fragment caching keyed on the objects a fragment shows.
+
+    {% load fragment_tags %}
+    {% fragment "post_card" post post.views %}...{% endfragment %}
+
+Each extra argument varies the key. Model instances contribute their pk
+and ``updated_at``, so a fragment is rebuilt exactly when the object it
+renders is saved; anything else contributes its string value. Entries
+live for ``FRAGMENT_CACHE_TIMEOUT`` seconds; 0 disables the cache, which
+is the default with DEBUG so template edits show up immediately.
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+register = template.Library()
+
+
+def _key_part(value):
+    if isinstance(value, Model):
+        updated_at = getattr(value, 'updated_at', None)
+        stamp = updated_at.timestamp() if updated_at else ''
+        return f'{value._meta.label}.{value.pk}@{stamp}'
+    return str(value)
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 0 if settings.DEBUG else 3600)
+        if not timeout:
+            return self.nodelist.render(context)
+
+        parts = [_key_part(var.resolve(context)) for var in self.vary_on]
+        digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+        key = f'fragment:{self.name.resolve(context)}:{digest}'
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, timeout)
+        return content
+
+
+@register.tag
+def fragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name")
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
@@ -0,0 +1,40 @@
+from django import template
+from django.utils.html import format_html
+
+from core.images import srcset, variants_for
+
+register = template.Library()
+
+SIZES = {
+    'thumbnail': '320px',
+    'card': '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw',
+    'detail': '(min-width: 1024px) 896px, 100vw',
+}
+
+
+@register.simple_tag
+def responsive_image(obj, variant='card', alt='', css_class='', sizes=None, loading='lazy'):
+    """Render ``obj.image`` as a <picture> with WebP and JPEG srcsets.
+
+    Falls back to a plain <img> of the original while no derivatives exist.
+    """
+    image = obj.image
+    variants = variants_for(obj, variant)
+    if not variants:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async" />',
+            image.url, alt, css_class, loading,
+        )
+
+    storage = image.storage
+    largest = variants[-1]
+    sizes = sizes or SIZES.get(variant, '100vw')
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}" />'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" loading="{}" decoding="async" />'
+        '</picture>',
+        srcset(storage, variants, 'webp'), sizes,
+        storage.url(largest['jpeg']), srcset(storage, variants, 'jpeg'), sizes,
+        largest['width'], largest['height'], alt, css_class, loading,
+    )
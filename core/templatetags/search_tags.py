@@ -0,0 +1,11 @@
+from django import template
+
+from core.search import highlight as highlight_snippet
+
+register = template.Library()
+
+
+@register.filter
+def highlight(snippet):
+    """Render a raw search snippet with the matched terms in <mark>"""
+    return highlight_snippet(snippet)
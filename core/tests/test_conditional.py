@@ -0,0 +1,49 @@
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from core import view_counter
+from core.models import BlogPost, Event
+
+from .utils import seed
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+@override_settings(CACHES=NO_CACHE, DATABASE_REPLICAS=[])
+class ConditionalDetailTests(TestCase):
+    """Counter bumps through update() reach clients revalidating a detail page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1, messages=0)
+
+    def setUp(self):
+        # Detail views buffer the views they record
+        self.addCleanup(view_counter._pending.clear)
+
+    def assert_counter_bump_is_seen(self, url, bump):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('Last-Modified', first)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        bump()
+        # An If-Modified-Since-only client, as most caches and crawlers are
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date()).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_blog_post_views(self):
+        post = BlogPost.objects.get()
+        self.assert_counter_bump_is_seen(
+            reverse('blog_detail', args=[post.slug]),
+            lambda: BlogPost.objects.filter(pk=post.pk).update(views=F('views') + 5),
+        )
+
+    def test_event_registrations(self):
+        event = Event.objects.get()
+        self.assert_counter_bump_is_seen(
+            reverse('event_detail', args=[event.slug]),
+            lambda: Event.objects.filter(pk=event.pk).update(registered=F('registered') + 1),
+        )
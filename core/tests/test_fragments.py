@@ -0,0 +1,21 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import User
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'fragments'}}
+
+
+@override_settings(CACHES=LOCMEM, FRAGMENT_CACHE_TIMEOUT=3600)
+class NavigationFragmentTests(TestCase):
+
+    def test_email_change_reaches_the_cached_navigation(self):
+        user = User.objects.create_user(username='nav', email='old@example.com', first_name='Ana')
+        self.client.force_login(user)
+        self.assertContains(self.client.get(reverse('sobre')), 'old@example.com')
+
+        # Nothing else in the key moves: same user, name and role
+        User.objects.filter(pk=user.pk).update(email='new@example.com')
+        response = self.client.get(reverse('sobre'))
+        self.assertContains(response, 'new@example.com')
+        self.assertNotContains(response, 'old@example.com')
@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import images, tasks
+from core.models import BlogPost, Task
+
+from .utils import seed
+
+
+class DerivativeTaskTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(1, events=0, messages=0)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.post = BlogPost.objects.get()
+
+    def set_image(self, name):
+        BlogPost.objects.filter(pk=self.post.pk).update(image=name)
+
+    def run_next_task(self):
+        """Claim the derivatives job and run it as ``run_worker`` does."""
+        tasks.enqueue(images.build_derivatives_task, BlogPost._meta.label, self.post.pk, unique=True)
+        job = tasks.claim_next()
+        try:
+            tasks.execute(job.name, job.args, job.kwargs)
+        except Exception as exc:
+            tasks.mark_failed(job, exc)
+        else:
+            tasks.mark_done(job)
+        job.refresh_from_db()
+        return job
+
+    def test_unreadable_file_fails_the_job_for_a_retry(self):
+        self.set_image('blog_images/missing.png')
+
+        job = self.run_next_task()
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('FileNotFoundError', job.last_error)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.image_derivatives, {})
+
+    def test_undecodable_upload_gets_no_derivatives(self):
+        name = default_storage.save('blog_images/broken.png', ContentFile(b'not an image'))
+        self.set_image(name)
+
+        with self.assertLogs(images.logger, 'WARNING'):
+            job = self.run_next_task()
+        self.assertEqual(job.status, 'done')
+        self.assertFalse(Task.objects.filter(status='pending').exists())
@@ -0,0 +1,71 @@
+from unittest import skipUnless
+
+from django.db import connection, transaction
+from django.test import TestCase
+
+from core import search
+from core.management.commands.check_postgres_search import INDEXES
+from core.models import BlogPost, Category, Event, User
+
+from .utils import seed
+
+# Unlikely in generated text, so only the posts below match it
+TOKEN = 'Aqualtune'
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL full-text search')
+class PostgresSearchTests(TestCase):
+    """The weighted tsvector ranks title, body and author matches, and its GIN indexes apply"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(5, messages=0)
+        category = Category.objects.first()
+        cls.writer = User.objects.create_user(username='writer', first_name='Maria', last_name='Firmina')
+        cls.by_author = User.objects.create_user(username='by-author', first_name='Luiza', last_name=TOKEN)
+
+        def post(slug, author, title='Sem relação', content='Texto qualquer.'):
+            return BlogPost.objects.create(
+                title=title, slug=slug, excerpt='Resumo.', content=content,
+                author=author, category=category, status='published',
+            )
+
+        cls.title_match = post('titulo', cls.writer, title=f'{TOKEN} e a resistência')
+        cls.body_match = post('corpo', cls.writer, content=f'A história de {TOKEN} no Brasil.')
+        cls.author_match = post('autoria', cls.by_author)
+
+    def search(self, text):
+        return list(search.search_queryset(BlogPost.objects.all(), text))
+
+    def test_title_ranks_above_body_and_author(self):
+        self.assertEqual(self.search(TOKEN), [self.title_match, self.body_match, self.author_match])
+
+    def test_ranks_follow_the_vector_weights(self):
+        ranks = [post.search_rank for post in self.search(TOKEN)]
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), 3)
+
+    def test_author_name_follows_a_rename(self):
+        self.assertEqual(self.search('Benguela'), [])
+        self.writer.last_name = 'Benguela'
+        self.writer.save(update_fields=['last_name'])
+        self.assertEqual({post.slug for post in self.search('Benguela')}, {'titulo', 'corpo'})
+
+    def test_queries_use_the_gin_indexes(self):
+        with connection.cursor() as cursor:
+            for model, index in INDEXES.items():
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                self.assertEqual(constraints.get(index, {}).get('type'), 'gin', index)
+
+        for model, index in INDEXES.items():
+            # A handful of rows is cheaper to scan; forbid that to see whether the index applies
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                plan = search.search_queryset(model.objects.all(), 'educação').explain()
+            self.assertIn(index, plan, model.__name__)
+
+    def test_events_match_on_title(self):
+        event = Event.objects.order_by('pk').first()
+        word = max(search._TOKEN_RE.findall(event.title), key=len)
+        self.assertIn(event, search.search_queryset(Event.objects.all(), word))
@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import view_counter
+from core.models import BlogPost, Event
+
+from .utils import seed
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+@override_settings(CACHES=NO_CACHE)
+class PrerenderSiteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(2, messages=0)
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        view_counter._pending.clear()
+
+    def test_all_leaves_detail_pages_to_django(self):
+        views = dict(BlogPost.objects.values_list('pk', 'views'))
+        call_command('prerender_site', all=True, output=str(self.root), stdout=StringIO())
+
+        self.assertTrue((self.root / 'blog' / 'index.html').exists())
+        details = [reverse('blog_detail', args=[post.slug]) for post in BlogPost.objects.all()]
+        details += [reverse('event_detail', args=[event.slug]) for event in Event.objects.all()]
+        for path in details:
+            self.assertFalse((self.root / path.strip('/') / 'index.html').exists(), path)
+        # Rendering the site records no views
+        for post in BlogPost.objects.all():
+            self.assertEqual(view_counter.pending_views(post), 0)
+        self.assertEqual(dict(BlogPost.objects.values_list('pk', 'views')), views)
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import connection
+from django.template import TemplateDoesNotExist
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import User
+
+from .utils import seed
+
+# Every page is rendered from the database, as on a cold cache
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+@override_settings(CACHES=NO_CACHE, DATABASE_REPLICAS=[])
+class QueryBudgetTests(TestCase):
+    """Every page in QUERY_BUDGETS stays within its budget, and twice the rows add no queries"""
+
+    rows = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='query-budget', role='admin')
+
+    def client_for(self, path):
+        # Anonymous, unless the page sends visitors to the login form
+        client = Client()
+        try:
+            if client.get(path).status_code == 302:
+                client.force_login(self.admin)
+                client.get(path)
+        except TemplateDoesNotExist as exc:
+            self.skipTest(f'template {exc} is not in this tree')
+        return client
+
+    def test_pages_stay_within_budget_as_rows_double(self):
+        seed(self.rows, seed=1)
+        pages = {}
+        for name, budget in settings.QUERY_BUDGETS.items():
+            with self.subTest(name, rows=self.rows):
+                path = reverse(name)
+                client = self.client_for(path)
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    len(queries), budget,
+                    '\n'.join(query['sql'] for query in queries.captured_queries),
+                )
+                pages[name] = (client, path, len(queries))
+
+        seed(self.rows, seed=2)
+        for name, (client, path, count) in pages.items():
+            with self.subTest(name, rows=self.rows * 2):
+                with self.assertNumQueries(count):
+                    response = client.get(path)
+                self.assertEqual(response.status_code, 200)
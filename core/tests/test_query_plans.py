@@ -0,0 +1,30 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from core.management.commands.check_query_plans import (
+    EXPECTED_INDEXES, FULL_SCAN_RE, TEMP_SORT, public_queries,
+)
+
+from .utils import seed
+
+
+@skipUnless(connection.vendor == 'sqlite', 'reads SQLite EXPLAIN QUERY PLAN output')
+class QueryPlanTests(TestCase):
+    """The public queries are served by indexes, not table scans or temp sorts"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(20, featured_ratio=0.5)
+
+    def test_public_queries_use_indexes(self):
+        for name, queryset in public_queries().items():
+            with self.subTest(name):
+                plan = queryset.explain()
+                lines = [line.strip() for line in plan.splitlines()]
+                scans = [line for line in lines if FULL_SCAN_RE.search(line)]
+                self.assertEqual(scans, [], f'full table scan in:\n{plan}')
+                self.assertNotIn(TEMP_SORT, plan)
+                if name in EXPECTED_INDEXES:
+                    self.assertIn(f'USING INDEX {EXPECTED_INDEXES[name]}', plan)
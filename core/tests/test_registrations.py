@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.management.commands.registration_load_test import register_over_http
+from core.models import Event, Registration, User
+
+
+def make_event(capacity):
+    return Event.objects.create(
+        title='Oficina de teste', slug='oficina-de-teste', description='Evento de teste.',
+        date=timezone.now().date(), start_time='09:00', end_time='10:00', location='Online',
+        category='Teste', capacity=capacity, organizer='NEABI',
+    )
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """Registrations sent at once through the event_register view never oversell the event"""
+
+    capacity = 5
+    requests = 30
+
+    def test_concurrent_requests_do_not_oversell(self):
+        event = make_event(self.capacity)
+        detail_url = reverse('event_detail', kwargs={'slug': event.slug})
+        register_url = reverse('event_register', kwargs={'slug': event.slug})
+
+        clients = []
+        for i in range(self.requests):
+            client = Client(enforce_csrf_checks=True, raise_request_exception=False)
+            client.force_login(User.objects.create_user(username=f'leitor{i}'))
+            client.get(detail_url)
+            clients.append((client, client.cookies['csrftoken'].value))
+
+        outcomes = []
+        barrier = threading.Barrier(len(clients))
+
+        def worker(client, token):
+            barrier.wait()
+            # The in-memory test database shares one cache between threads and
+            # answers "table is locked" instead of waiting for the lock; the
+            # view rolls back, so the request is simply sent again
+            for _ in range(100):
+                outcome = register_over_http(client, register_url, token)
+                if outcome != 'http_500':
+                    break
+                time.sleep(0.01)
+            outcomes.append(outcome)
+
+        threads = [threading.Thread(target=worker, args=client) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        event.refresh_from_db()
+        self.assertLessEqual(event.registered, event.capacity)
+        self.assertEqual(Registration.objects.filter(event=event).count(), event.registered)
+        self.assertEqual(outcomes.count('registered'), event.capacity)
+        self.assertEqual(outcomes.count('full'), self.requests - event.capacity)
+        self.assertEqual(event.registered, event.capacity)
+
+    def test_request_without_csrf_token_is_refused(self):
+        event = make_event(self.capacity)
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(User.objects.create_user(username='leitor'))
+
+        response = client.post(reverse('event_register', kwargs={'slug': event.slug}))
+        self.assertEqual(response.status_code, 403)
+        event.refresh_from_db()
+        self.assertEqual(event.registered, 0)
+
+
+class BulkRegistrationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = make_event(3)
+        cls.admin = User.objects.create_user(username='admin', role='admin')
+        cls.readers = [User.objects.create_user(username=f'leitor{i}') for i in range(4)]
+
+    def post(self, user_ids):
+        self.client.force_login(self.admin)
+        return self.client.post(
+            reverse('event_register_bulk', kwargs={'slug': self.event.slug}),
+            json.dumps({'user_ids': user_ids}), content_type='application/json',
+        )
+
+    def test_unknown_user_ids_are_rejected(self):
+        first, second = self.readers[:2]
+        missing = max(user.pk for user in self.readers) + 100
+
+        response = self.post([first.pk, missing, second.pk, missing])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(sorted(data['registered']), [first.pk, second.pk])
+        self.assertEqual(data['rejected'], [missing])
+        self.assertEqual(data['spots_remaining'], 1)
+
+    def test_rejected_ids_are_reported_when_the_event_is_full(self):
+        missing = max(user.pk for user in self.readers) + 100
+
+        response = self.post([user.pk for user in self.readers] + [missing])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['rejected'], [missing])
+        self.assertFalse(Registration.objects.filter(event=self.event).exists())
@@ -0,0 +1,94 @@
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from core.staticfiles import ASGIStaticFilesMiddleware, StaticFilesMiddleware
+
+CSS = b'body { color: black; }\n' * 200
+
+
+def fallback(environ, start_response):
+    start_response('404 Not Found', [])
+    return [b'django']
+
+
+class StaticFilesMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        path = os.path.join(self.root, 'site.css')
+        with open(path, 'wb') as f:
+            f.write(CSS)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(CSS))
+        self.middleware = StaticFilesMiddleware(fallback, root=self.root, prefix='/static/')
+
+    def get(self, **headers):
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/static/site.css', **headers}
+        started = {}
+
+        def start_response(status, response_headers):
+            started['status'] = status
+            started['headers'] = dict(response_headers)
+
+        body = b''.join(self.middleware(environ, start_response))
+        return started['status'], started['headers'], body
+
+    def test_full_response_carries_validators(self):
+        status, headers, body = self.get()
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(body, CSS)
+        self.assertIn('ETag', headers)
+        self.assertIn('Last-Modified', headers)
+
+    def test_if_none_match_gets_304_without_a_body(self):
+        _, headers, _ = self.get()
+        status, not_modified, body = self.get(HTTP_IF_NONE_MATCH=headers['ETag'])
+        self.assertEqual(status, '304 Not Modified')
+        self.assertEqual(body, b'')
+        self.assertEqual(not_modified['ETag'], headers['ETag'])
+        self.assertNotIn('Content-Length', not_modified)
+
+    def test_if_modified_since_gets_304(self):
+        _, headers, _ = self.get()
+        status, _, body = self.get(HTTP_IF_MODIFIED_SINCE=headers['Last-Modified'])
+        self.assertEqual(status, '304 Not Modified')
+        self.assertEqual(body, b'')
+
+    def test_encodings_have_their_own_etags(self):
+        _, plain, _ = self.get()
+        _, gzipped, _ = self.get(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertNotEqual(plain['ETag'], gzipped['ETag'])
+        status, _, body = self.get(HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=plain['ETag'])
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_failed_if_match_gets_412(self):
+        status, _, body = self.get(HTTP_IF_MATCH='"stale"')
+        self.assertEqual(status, '412 Precondition Failed')
+        self.assertEqual(body, b'')
+
+    def test_asgi_if_none_match_gets_304(self):
+        _, headers, _ = self.get()
+        middleware = ASGIStaticFilesMiddleware(None, root=self.root, prefix='/static/')
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/static/site.css',
+            'headers': [(b'if-none-match', headers['ETag'].encode('latin-1'))],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request'}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(middleware(scope, receive, send))
+        self.assertEqual(messages[0]['status'], 304)
+        self.assertEqual(b''.join(message.get('body', b'') for message in messages[1:]), b'')
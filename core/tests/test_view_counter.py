@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core import view_counter
+from core.models import BlogPost
+
+from .utils import seed
+
+MISSING = ('core.MissingModel', 1)
+
+
+@override_settings(VIEW_COUNTER_FLUSH_INTERVAL=60)
+@mock.patch.object(view_counter, '_ensure_flusher')
+class ViewCounterFlushTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(3)
+        cls.posts = list(BlogPost.objects.order_by('pk'))
+
+    def setUp(self):
+        view_counter._pending.clear()
+        view_counter._failures.clear()
+        self.addCleanup(view_counter._pending.clear)
+        self.addCleanup(view_counter._failures.clear)
+
+    def views(self):
+        return dict(BlogPost.objects.values_list('pk', 'views'))
+
+    def test_flush_writes_buffered_views_in_one_update_per_count(self, ensure_flusher):
+        before = self.views()
+        first, second, third = self.posts
+        for post, count in ((first, 2), (second, 2), (third, 5)):
+            view_counter.record_view(post, count)
+        self.assertEqual(view_counter.pending_views(first), 2)
+
+        with mock.patch.object(view_counter, '_write', wraps=view_counter._write) as write:
+            self.assertEqual(view_counter.flush(), 9)
+        write.assert_called_once()
+
+        after = self.views()
+        self.assertEqual(after[first.pk] - before[first.pk], 2)
+        self.assertEqual(after[second.pk] - before[second.pk], 2)
+        self.assertEqual(after[third.pk] - before[third.pk], 5)
+        self.assertEqual(view_counter.pending_views(first), 0)
+        self.assertEqual(view_counter.flush(), 0)
+
+    def test_failed_flush_restores_the_batch(self, ensure_flusher):
+        before = self.views()
+        post = self.posts[0]
+        view_counter.record_view(post, 3)
+
+        with mock.patch.object(view_counter, '_write', side_effect=RuntimeError('database is locked')), \
+                self.assertLogs(view_counter.logger, 'WARNING'):
+            self.assertEqual(view_counter.flush(), 0)
+        self.assertEqual(view_counter.pending_views(post), 3)
+        self.assertEqual(self.views(), before)
+
+        self.assertEqual(view_counter.flush(), 3)
+        self.assertEqual(self.views()[post.pk], before[post.pk] + 3)
+
+    def test_bad_row_does_not_hold_back_the_batch(self, ensure_flusher):
+        before = self.views()
+        post = self.posts[0]
+        view_counter.record_view(post, 1)
+        view_counter._pending[MISSING] += 4
+
+        with self.assertLogs(view_counter.logger, 'WARNING') as logs:
+            self.assertEqual(view_counter.flush(), 1)
+        self.assertEqual(self.views()[post.pk], before[post.pk] + 1)
+        self.assertTrue(any('core.MissingModel #1' in line for line in logs.output))
+        self.assertEqual(view_counter._pending, {MISSING: 4})
+
+    def test_row_is_dropped_after_repeated_failures(self, ensure_flusher):
+        view_counter._pending[MISSING] += 4
+        for _ in range(view_counter.MAX_FLUSH_ATTEMPTS - 1):
+            with self.assertLogs(view_counter.logger, 'WARNING'):
+                view_counter.flush()
+            self.assertEqual(view_counter._pending, {MISSING: 4})
+
+        with self.assertLogs(view_counter.logger, 'ERROR') as logs:
+            view_counter.flush()
+        self.assertIn('Dropped 4 buffered views for core.MissingModel #1', logs.output[-1])
+        self.assertFalse(view_counter._pending)
+        self.assertFalse(view_counter._failures)
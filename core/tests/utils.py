@@ -0,0 +1,12 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+
+def seed(rows, seed=1, **options):
+    """Fill the test database with ``rows`` published, past-dated posts, events and messages."""
+    defaults = dict(
+        posts=rows, events=rows, messages=rows, authors=2, tags=10, categories=3,
+        draft_ratio=0, future_ratio=0, years=1, seed=seed, stdout=StringIO(),
+    )
+    call_command('generate_load_data', **{**defaults, **options})
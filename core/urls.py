@@ -1,22 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI the read-heavy pages are served by their async versions
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     # Public pages
-    path('', views.home_view, name='home'),
+    path('', read_views.home_view, name='home'),
     path('sobre/', views.sobre_view, name='sobre'),
     path('projetos/', views.projetos_view, name='projetos'),
     path('projetos/semana-consciencia-negra/', views.semana_consciencia_negra_view, name='semana_consciencia_negra'),
     path('contato/', views.contact_view, name='contato'),
     
     # Blog
-    path('blog/', views.BlogListView.as_view(), name='blog'),
-    path('blog/<slug:slug>/', views.BlogDetailView.as_view(), name='blog_detail'),
+    path('blog/', read_views.BlogListView.as_view(), name='blog'),
+    path('blog/<slug:slug>/', read_views.BlogDetailView.as_view(), name='blog_detail'),
     
     # Events
-    path('projetos/eventos/', views.EventListView.as_view(), name='eventos'),
-    path('evento/<slug:slug>/', views.EventDetailView.as_view(), name='event_detail'),
+    path('projetos/eventos/', read_views.EventListView.as_view(), name='eventos'),
+    path('evento/<slug:slug>/', read_views.EventDetailView.as_view(), name='event_detail'),
     path('evento/<slug:slug>/inscrever/', views.event_register, name='event_register'),
+    path('evento/<slug:slug>/inscrever/lote/', views.event_register_bulk, name='event_register_bulk'),
     
     # Authentication
     path('admin/login/', views.admin_login_view, name='admin_login'),
@@ -24,6 +29,7 @@ urlpatterns = [
     
     # Admin dashboard
     path('admin/dashboard/', views.admin_dashboard_view, name='admin_dashboard'),
+    path('admin/dashboard/stats/', views.admin_dashboard_stats_view, name='admin_dashboard_stats'),
     
     # Admin posts
     path('admin/posts/', views.AdminPostListView.as_view(), name='admin_posts'),
@@ -0,0 +1,161 @@
+"""Buffered view counter for blog posts.
+
+Detail views call ``record_view`` instead of saving the object. Increments
+are kept in an in-process buffer and written back in batched ``F()`` updates
+by a background flusher thread, so a page view never waits on the SQLite
+write lock. Pending counts are flushed at interpreter exit.
+
+When a batch fails, its rows are written one at a time so that a single bad
+row cannot hold back the others. A row that keeps failing is logged and
+dropped after ``MAX_FLUSH_ATTEMPTS`` flushes.
+
+Settings:
+    VIEW_COUNTER_FLUSH_INTERVAL: seconds between flushes (default 10).
+        Use 0 to write every increment immediately.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 10
+
+# Failed flushes after which a row's buffered views are dropped
+MAX_FLUSH_ATTEMPTS = 3
+
+_lock = threading.Lock()
+_pending = Counter()
+# (model_label, pk) -> consecutive failed flushes
+_failures = Counter()
+_flusher = None
+_stop = threading.Event()
+
+
+def get_flush_interval():
+    return getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+
+def record_view(obj, count=1):
+    """Buffer ``count`` views for ``obj`` (any model with a ``views`` field)."""
+    key = (obj._meta.label, obj.pk)
+    if get_flush_interval() <= 0:
+        _write({key: count})
+        return
+    with _lock:
+        _pending[key] += count
+    _ensure_flusher()
+
+
+async def arecord_view(obj, count=1):
+    """``record_view`` for async views; only an unbuffered write leaves the event loop."""
+    if get_flush_interval() <= 0:
+        await sync_to_async(_write)({(obj._meta.label, obj.pk): count})
+        return
+    record_view(obj, count)
+
+
+def pending_views(obj):
+    """Return the number of buffered, not yet flushed, views for ``obj``."""
+    with _lock:
+        return _pending.get((obj._meta.label, obj.pk), 0)
+
+
+def flush():
+    """Write all buffered increments to the database.
+
+    Returns the number of views written. If the batched write fails, each
+    row is retried on its own; rows that still fail go back into the buffer
+    for the next flush, until they have failed ``MAX_FLUSH_ATTEMPTS`` times.
+    """
+    global _pending
+    with _lock:
+        if not _pending:
+            return 0
+        batch, _pending = _pending, Counter()
+    try:
+        _write(batch)
+    except Exception:
+        logger.warning('Could not flush %d buffered view counts in one batch', len(batch), exc_info=True)
+        return _write_rows(batch)
+    with _lock:
+        for key in batch:
+            _failures.pop(key, None)
+    return sum(batch.values())
+
+
+def _write_rows(batch):
+    written = 0
+    failed = Counter()
+    for (label, pk), count in batch.items():
+        try:
+            _write({(label, pk): count})
+        except Exception:
+            logger.exception('Could not flush %d buffered views for %s #%s', count, label, pk)
+            failed[(label, pk)] = count
+        else:
+            written += count
+
+    with _lock:
+        for key in batch.keys() - failed.keys():
+            _failures.pop(key, None)
+        for key, count in failed.items():
+            _failures[key] += 1
+            if _failures[key] >= MAX_FLUSH_ATTEMPTS:
+                del _failures[key]
+                logger.error(
+                    'Dropped %d buffered views for %s #%s after %d failed flushes',
+                    count, key[0], key[1], MAX_FLUSH_ATTEMPTS,
+                )
+            else:
+                _pending[key] += count
+    return written
+
+
+def _write(batch):
+    """Apply ``{(model_label, pk): count}`` with one UPDATE per model and count."""
+    from django.apps import apps
+
+    grouped = defaultdict(list)
+    for (label, pk), count in batch.items():
+        grouped[(label, count)].append(pk)
+
+    with transaction.atomic():
+        for (label, count), pks in grouped.items():
+            model = apps.get_model(label)
+            model._default_manager.filter(pk__in=pks).update(views=F('views') + count)
+
+
+def _run_flusher():
+    while not _stop.wait(get_flush_interval()):
+        flush()
+        try:
+            close_old_connections()
+        except Exception:
+            logger.exception('Could not close stale database connections')
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        _flusher = threading.Thread(target=_run_flusher, name='view-counter-flusher', daemon=True)
+        _flusher.start()
+
+
+def shutdown():
+    """Stop the flusher thread and write any remaining counts."""
+    _stop.set()
+    flush()
+
+
+atexit.register(shutdown)
@@ -1,17 +1,24 @@
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from . import content_cache, dashboard, registrations
+from .conditional import ConditionalDetailMixin, ConditionalListMixin
 from .models import BlogPost, Event, Category, Tag, ContactMessage, User
 from .forms import ContactForm, BlogPostForm, EventForm, UserRegistrationForm, SearchForm
+from .pagination import KeysetPaginationMixin
+from .search import search_queryset
+from .view_counter import record_view
 
 
 def is_admin(user):
@@ -19,15 +26,40 @@ def is_admin(user):
     return user.is_authenticated and user.role == 'admin'
 
 
+# Cached lists shared with the async views in core.async_views, which pass
+# content_cache.acached_list and await the result
+def featured_events(cached_list=content_cache.cached_list):
+    return cached_list('featured_events', Event.objects.filter(featured=True, status='upcoming')[:2])
+
+
+def recent_posts(cached_list=content_cache.cached_list):
+    return cached_list(
+        'home:recent_posts',
+        BlogPost.objects.filter(status='published').select_related('author', 'category')[:3],
+    )
+
+
+def featured_posts(cached_list=content_cache.cached_list):
+    return cached_list(
+        'blog:featured_posts',
+        BlogPost.objects.filter(featured=True, status='published').select_related('author', 'category')[:3],
+    )
+
+
+def blog_categories(cached_list=content_cache.cached_list):
+    return cached_list('categories', Category.objects.all())
+
+
+def event_categories(cached_list=content_cache.cached_list):
+    return cached_list('events:categories', Event.objects.values_list('category', flat=True).distinct())
+
+
 # Public Views
 def home_view(request):
     """Home page view"""
-    featured_events = Event.objects.filter(featured=True, status='upcoming')[:2]
-    recent_posts = BlogPost.objects.filter(status='published')[:3]
-    
     context = {
-        'featured_events': featured_events,
-        'recent_posts': recent_posts,
+        'featured_events': featured_events(),
+        'recent_posts': recent_posts(),
     }
     return render(request, 'pages/home.html', context)
 
@@ -47,64 +79,64 @@ def semana_consciencia_negra_view(request):
     return render(request, 'pages/semana_consciencia_negra.html')
 
 
-class BlogListView(ListView):
+class BlogListView(ConditionalListMixin, KeysetPaginationMixin, ListView):
     """Blog posts list view"""
     model = BlogPost
     template_name = 'pages/blog.html'
     context_object_name = 'posts'
     paginate_by = 9
+    keyset_ordering = ('-published_date', '-id')
     
     def get_queryset(self):
-        queryset = BlogPost.objects.filter(status='published')
+        queryset = BlogPost.objects.filter(status='published').select_related('author', 'category')
         search = self.request.GET.get('search')
         category = self.request.GET.get('category')
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(excerpt__icontains=search) |
-                Q(author__first_name__icontains=search) |
-                Q(author__last_name__icontains=search)
-            )
-        
         if category and category != 'Todos':
             queryset = queryset.filter(category__name=category)
         
+        if search:
+            queryset = search_queryset(queryset, search)
+        
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
-        context['featured_posts'] = BlogPost.objects.filter(featured=True, status='published')[:3]
+        context['categories'] = blog_categories()
+        context['featured_posts'] = featured_posts()
         context['search_form'] = SearchForm(self.request.GET)
         return context
 
 
-class BlogDetailView(DetailView):
+class BlogDetailView(ConditionalDetailMixin, DetailView):
     """Blog post detail view"""
     model = BlogPost
     template_name = 'pages/post_detail.html'
     context_object_name = 'post'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
+    validator_fields = ('views',)
     
     def get_queryset(self):
-        return BlogPost.objects.filter(status='published')
+        return BlogPost.objects.filter(status='published').select_related(
+            'author', 'category'
+        ).prefetch_related('tags')
     
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        # Increment view count
+        # Buffered increment; the flusher writes it back with an F() update
+        record_view(obj)
         obj.views += 1
-        obj.save(update_fields=['views'])
         return obj
 
 
-class EventListView(ListView):
+class EventListView(ConditionalListMixin, KeysetPaginationMixin, ListView):
     """Events list view"""
     model = Event
     template_name = 'pages/eventos.html'
     context_object_name = 'events'
     paginate_by = 6
+    keyset_ordering = ('date', 'start_time', 'id')
     
     def get_queryset(self):
         queryset = Event.objects.exclude(status='cancelled')
@@ -121,19 +153,21 @@ class EventListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['featured_events'] = Event.objects.filter(featured=True, status='upcoming')[:2]
-        context['categories'] = Event.objects.values_list('category', flat=True).distinct()
+        context['featured_events'] = featured_events()
+        context['categories'] = event_categories()
         context['event_types'] = Event.TYPE_CHOICES
         return context
 
 
-class EventDetailView(DetailView):
+class EventDetailView(ConditionalDetailMixin, DetailView):
     """Event detail view"""
     model = Event
     template_name = 'pages/event_detail.html'
     context_object_name = 'event'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
+    validator_fields = ('registered',)
+    queryset = Event.objects.prefetch_related('tags')
 
 
 def contact_view(request):
@@ -194,14 +228,15 @@ def admin_logout_view(request):
 @user_passes_test(is_admin)
 def admin_dashboard_view(request):
     """Admin dashboard view"""
+    counters = dashboard.get_stats()
     stats = {
-        'posts': BlogPost.objects.count(),
-        'events': Event.objects.count(),
-        'users': User.objects.count(),
-        'messages': ContactMessage.objects.filter(is_read=False).count(),
+        'posts': counters['posts']['total'],
+        'events': counters['events']['total'],
+        'users': counters['users']['total'],
+        'messages': counters['messages']['unread'],
     }
     
-    recent_posts = BlogPost.objects.order_by('-created_at')[:5]
+    recent_posts = BlogPost.objects.select_related('author', 'category').order_by('-created_at')[:5]
     upcoming_events = Event.objects.filter(status='upcoming').order_by('date')[:5]
     recent_messages = ContactMessage.objects.filter(is_read=False).order_by('-created_at')[:5]
     
@@ -214,30 +249,34 @@ def admin_dashboard_view(request):
     return render(request, 'admin/dashboard.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+def admin_dashboard_stats_view(request):
+    """Dashboard counters as JSON, for polling from the client"""
+    return JsonResponse(dashboard.get_stats())
+
+
 @method_decorator([login_required, user_passes_test(is_admin)], name='dispatch')
-class AdminPostListView(ListView):
+class AdminPostListView(KeysetPaginationMixin, ListView):
     """Admin posts list view"""
     model = BlogPost
     template_name = 'admin/posts_list.html'
     context_object_name = 'posts'
     paginate_by = 20
     ordering = ['-created_at']
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('author', 'category')
         search = self.request.GET.get('search')
         status = self.request.GET.get('status')
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(author__first_name__icontains=search) |
-                Q(author__last_name__icontains=search)
-            )
-        
         if status:
             queryset = queryset.filter(status=status)
         
+        if search:
+            queryset = search_queryset(queryset, search)
+        
         return queryset
 
 
@@ -281,29 +320,26 @@ class AdminPostDeleteView(DeleteView):
 
 
 @method_decorator([login_required, user_passes_test(is_admin)], name='dispatch')
-class AdminEventListView(ListView):
+class AdminEventListView(KeysetPaginationMixin, ListView):
     """Admin events list view"""
     model = Event
     template_name = 'admin/events_list.html'
     context_object_name = 'events'
     paginate_by = 20
     ordering = ['-created_at']
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         queryset = super().get_queryset()
         search = self.request.GET.get('search')
         status = self.request.GET.get('status')
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(organizer__icontains=search) |
-                Q(location__icontains=search)
-            )
-        
         if status:
             queryset = queryset.filter(status=status)
         
+        if search:
+            queryset = search_queryset(queryset, search)
+        
         return queryset
 
 
@@ -356,7 +392,7 @@ def admin_messages_view(request):
     
     context = {
         'messages': messages_page,
-        'unread_count': ContactMessage.objects.filter(is_read=False).count(),
+        'unread_count': dashboard.get_stats()['messages']['unread'],
     }
     return render(request, 'admin/messages_list.html', context)
 
@@ -373,22 +409,57 @@ def mark_message_read(request, message_id):
 
 # Event registration (for authenticated users)
 @login_required
+@require_POST
 def event_register(request, slug):
     """Register for an event"""
     event = get_object_or_404(Event, slug=slug)
     
-    if not event.registration_required:
-        messages.error(request, 'Este evento não requer inscrição.')
-        return redirect('event_detail', slug=slug)
-    
-    if event.is_full():
-        messages.error(request, 'Evento lotado.')
+    try:
+        registrations.register(event, request.user)
+    except registrations.RegistrationError as exc:
+        messages.error(request, str(exc))
         return redirect('event_detail', slug=slug)
     
-    # Simple registration - just increment counter
-    # In a real app, you'd create a Registration model
-    event.registered += 1
-    event.save()
-    
     messages.success(request, f'Inscrição realizada com sucesso para o evento "{event.title}"!')
     return redirect('event_detail', slug=slug)
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def event_register_bulk(request, slug):
+    """Register several users for an event (JSON body: {"user_ids": [...]})
+
+    Ids without a matching user are returned under ``rejected``.
+    """
+    event = get_object_or_404(Event, slug=slug)
+    
+    try:
+        user_ids = list(dict.fromkeys(int(pk) for pk in json.loads(request.body or '{}').get('user_ids', [])))
+        users = list(User.objects.filter(pk__in=user_ids))
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'status': 'error', 'message': 'Lista de usuários inválida.'}, status=400)
+    found = {user.pk for user in users}
+    rejected = [pk for pk in user_ids if pk not in found]
+    
+    try:
+        created, skipped = registrations.register_many(event, users)
+    except registrations.EventFull as exc:
+        event.refresh_from_db(fields=['registered'])
+        return JsonResponse({
+            'status': 'error',
+            'message': str(exc),
+            'rejected': rejected,
+            'spots_remaining': event.spots_remaining(),
+        }, status=409)
+    except registrations.RegistrationError as exc:
+        return JsonResponse({'status': 'error', 'message': str(exc)}, status=400)
+    
+    event.refresh_from_db(fields=['registered'])
+    return JsonResponse({
+        'status': 'success',
+        'registered': [registration.user_id for registration in created],
+        'skipped': [user.pk for user in skipped],
+        'rejected': rejected,
+        'spots_remaining': event.spots_remaining(),
+    })
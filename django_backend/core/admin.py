@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import UserProfile, Category, Tag, Post, Event, ContactMessage
+from .models import UserProfile, Category, Tag, Post, Event, ContactMessage, Task
 
 
 class UserProfileInline(admin.StackedInline):
@@ -84,6 +84,16 @@ class ContactMessageAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['name', 'args', 'kwargs', 'attempts', 'locked_at', 'last_error', 'created_at', 'updated_at']
+    
+    def has_add_permission(self, request):
+        return False  # Tarefas são enfileiradas pela aplicação
+
+
 # Re-register UserAdmin
 admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
@@ -1,52 +1,52 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.utils.text import slugify
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from .models import Post, Event, Category, Tag, ContactMessage
 from .forms import PostForm, EventForm
+from . import dashboard
 from .decorators import admin_required, AdminRequiredMixin
+from .pagination import KeysetPaginationMixin
+from .search import has_terms, search_queryset
 
 
 @admin_required
 def admin_dashboard(request):
     """Dashboard administrativo"""
+    stats = dashboard.get_stats()
     context = {
-        'total_posts': Post.objects.count(),
-        'published_posts': Post.objects.filter(status='published').count(),
-        'draft_posts': Post.objects.filter(status='draft').count(),
-        'total_events': Event.objects.count(),
-        'upcoming_events': Event.objects.filter(status='upcoming').count(),
-        'recent_posts': Post.objects.all()[:5],
+        'total_posts': stats['posts']['total'],
+        'published_posts': stats['posts']['published'],
+        'draft_posts': stats['posts']['draft'],
+        'total_events': stats['events']['total'],
+        'upcoming_events': stats['events']['upcoming'],
+        'recent_posts': Post.objects.select_related('author', 'category')[:5],
         'recent_events': Event.objects.all()[:5],
-        'unread_messages': ContactMessage.objects.filter(read=False).count(),
+        'unread_messages': stats['messages']['unread'],
     }
     return render(request, 'admin_area/dashboard.html', context)
 
 
-class AdminPostListView(AdminRequiredMixin, ListView):
+class AdminPostListView(AdminRequiredMixin, KeysetPaginationMixin, ListView):
     model = Post
     template_name = 'admin_area/post_list.html'
     context_object_name = 'posts'
     paginate_by = 10
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
-        queryset = Post.objects.all()
+        queryset = Post.objects.select_related('author', 'category')
         search = self.request.GET.get('search')
         status = self.request.GET.get('status')
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(content__icontains=search) |
-                Q(author__username__icontains=search)
-            )
-        
         if status:
             queryset = queryset.filter(status=status)
         
+        if has_terms(search):
+            return search_queryset(queryset, search)
+        
         return queryset.order_by('-created_at')
 
 
@@ -85,11 +85,12 @@ class AdminPostDeleteView(AdminRequiredMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
-class AdminEventListView(AdminRequiredMixin, ListView):
+class AdminEventListView(AdminRequiredMixin, KeysetPaginationMixin, ListView):
     model = Event
     template_name = 'admin_area/event_list.html'
     context_object_name = 'events'
     paginate_by = 10
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         queryset = Event.objects.all()
@@ -97,19 +98,15 @@ class AdminEventListView(AdminRequiredMixin, ListView):
         visibility = self.request.GET.get('visibility')
         status = self.request.GET.get('status')
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(organizer__icontains=search)
-            )
-        
         if visibility:
             queryset = queryset.filter(visibility=visibility)
             
         if status:
             queryset = queryset.filter(status=status)
         
+        if has_terms(search):
+            return search_queryset(queryset, search)
+        
         return queryset.order_by('-created_at')
 
 
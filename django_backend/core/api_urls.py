@@ -11,5 +11,6 @@ router.register(r'contact-messages', api_views.ContactMessageViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('dashboard/stats/', api_views.DashboardStatsView.as_view(), name='dashboard-stats'),
     path('auth/', include('rest_framework.urls')),
 ]
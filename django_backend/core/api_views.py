@@ -1,13 +1,18 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Q
 from .models import Post, Event, Category, Tag, ContactMessage
 from .serializers import (
     PostSerializer, PostListSerializer, EventSerializer, EventListSerializer,
     CategorySerializer, TagSerializer, ContactMessageSerializer
 )
+from . import dashboard, roles
+from .conditional import ConditionalViewSetMixin
+from .pagination import EventPagination, PostPagination
+from .search import has_terms, search_queryset
+from .view_counter import pending_views, record_view
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -20,21 +25,27 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        return (request.user.is_authenticated and 
-                hasattr(request.user, 'userprofile') and 
-                request.user.userprofile.role == 'admin')
+        return roles.is_admin(request.user)
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class IsAdminRole(permissions.BasePermission):
+    """Permite acesso apenas a usuários com perfil de administrador."""
+    
+    def has_permission(self, request, view):
+        return roles.is_admin(request.user)
+
+
+class PostViewSet(ConditionalViewSetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = PostPagination
+    validator_fields = ('views',)
     
     def get_queryset(self):
-        queryset = Post.objects.all()
+        # Autor, categoria e tags em número fixo de consultas (sem N+1)
+        queryset = Post.objects.select_related('author', 'category').prefetch_related('tags')
         
         # Para usuários não-admin, mostrar apenas posts publicados
-        if not (self.request.user.is_authenticated and 
-                hasattr(self.request.user, 'userprofile') and 
-                self.request.user.userprofile.role == 'admin'):
+        if not roles.is_admin(self.request.user):
             queryset = queryset.filter(
                 status='published',
                 publication_date__lte=timezone.now()
@@ -46,13 +57,6 @@ class PostViewSet(viewsets.ModelViewSet):
         status_filter = self.request.query_params.get('status', None)
         featured = self.request.query_params.get('featured', None)
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(content__icontains=search) |
-                Q(excerpt__icontains=search)
-            )
-        
         if category:
             queryset = queryset.filter(category__name=category)
         
@@ -62,6 +66,10 @@ class PostViewSet(viewsets.ModelViewSet):
         if featured:
             queryset = queryset.filter(featured=True)
         
+        if has_terms(search):
+            # Resultados da busca vêm ordenados por relevância
+            return search_queryset(queryset, search)
+        
         return queryset.order_by('-publication_date')
     
     def get_serializer_class(self):
@@ -75,29 +83,29 @@ class PostViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Endpoint para posts em destaque"""
-        featured_posts = self.get_queryset().filter(featured=True)[:3]
-        serializer = PostListSerializer(featured_posts, many=True)
-        return Response(serializer.data)
+        featured_posts = self.get_queryset().filter(featured=True)
+        return self.conditional_list(
+            featured_posts,
+            lambda: Response(PostListSerializer(featured_posts[:3], many=True).data),
+        )
     
     @action(detail=True, methods=['post'])
     def increment_views(self, request, pk=None):
         """Incrementar visualizações de um post"""
         post = self.get_object()
-        post.views += 1
-        post.save(update_fields=['views'])
-        return Response({'views': post.views})
+        record_view(post)
+        return Response({'views': post.views + pending_views(post)})
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalViewSetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = EventPagination
     
     def get_queryset(self):
-        queryset = Event.objects.all()
+        queryset = Event.objects.prefetch_related('tags')
         
         # Para usuários não-admin, mostrar apenas eventos públicos e futuros
-        if not (self.request.user.is_authenticated and 
-                hasattr(self.request.user, 'userprofile') and 
-                self.request.user.userprofile.role == 'admin'):
+        if not roles.is_admin(self.request.user):
             queryset = queryset.filter(
                 visibility='public',
                 start_date__gt=timezone.now()
@@ -109,13 +117,6 @@ class EventViewSet(viewsets.ModelViewSet):
         status_filter = self.request.query_params.get('status', None)
         featured = self.request.query_params.get('featured', None)
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(organizer__icontains=search)
-            )
-        
         if visibility:
             queryset = queryset.filter(visibility=visibility)
         
@@ -125,6 +126,10 @@ class EventViewSet(viewsets.ModelViewSet):
         if featured:
             queryset = queryset.filter(featured=True)
         
+        if has_terms(search):
+            # Resultados da busca vêm ordenados por relevância
+            return search_queryset(queryset, search)
+        
         return queryset.order_by('start_date')
     
     def get_serializer_class(self):
@@ -135,18 +140,22 @@ class EventViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Endpoint para eventos em destaque"""
-        featured_events = self.get_queryset().filter(featured=True)[:2]
-        serializer = EventListSerializer(featured_events, many=True)
-        return Response(serializer.data)
+        featured_events = self.get_queryset().filter(featured=True)
+        return self.conditional_list(
+            featured_events,
+            lambda: Response(EventListSerializer(featured_events[:2], many=True).data),
+        )
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Endpoint para eventos próximos"""
         upcoming_events = self.get_queryset().filter(
             start_date__gt=timezone.now()
-        )[:5]
-        serializer = EventListSerializer(upcoming_events, many=True)
-        return Response(serializer.data)
+        )
+        return self.conditional_list(
+            upcoming_events,
+            lambda: Response(EventListSerializer(upcoming_events[:5], many=True).data),
+        )
 
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -181,3 +190,11 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
             {'message': 'Mensagem enviada com sucesso!'}, 
             status=status.HTTP_201_CREATED
         )
+
+
+class DashboardStatsView(APIView):
+    """Contadores do painel administrativo, para o cliente React consultar"""
+    permission_classes = [IsAdminRole]
+    
+    def get(self, request):
+        return Response(dashboard.get_stats())
@@ -0,0 +1,53 @@
+"""
+Folha de estilos Tailwind pré-compilada.
+
+``manage.py build_css`` roda a CLI do Tailwind sobre os templates do projeto
+e grava um ``static/css/tailwind.css`` minificado, só com as classes em uso.
+O ``collectstatic`` copia o arquivo com nome versionado pelo conteúdo via
+``ManifestStaticFilesStorage``, então o navegador pode guardá-lo em cache
+indefinidamente e não compila mais CSS em tempo de execução.
+
+A CLI é procurada em ``TAILWIND_CLI``, em ``node_modules/.bin`` na raiz do
+repositório (``npm install`` uma vez, a partir do ``package.json``) e por fim
+no ``PATH``; o binário standalone também serve. Nada é baixado no build.
+"""
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+
+BUNDLE = 'css/tailwind.css'
+
+
+def content_globs():
+    """Arquivos varridos em busca de classes, as duas árvores de templates por padrão."""
+    default = [
+        settings.BASE_DIR / 'templates' / '**' / '*.html',
+        settings.BASE_DIR.parent / 'templates' / '**' / '*.html',
+        settings.BASE_DIR / 'core' / '**' / '*.py',
+    ]
+    return [str(path) for path in getattr(settings, 'TAILWIND_CONTENT', default)]
+
+
+def output_path():
+    return Path(settings.STATICFILES_DIRS[0]) / BUNDLE
+
+
+def find_cli():
+    """Retorna o comando da CLI do Tailwind como lista de argumentos, ou None."""
+    configured = getattr(settings, 'TAILWIND_CLI', None) or os.environ.get('TAILWIND_CLI')
+    if configured:
+        return [configured]
+    local = Path(settings.BASE_DIR).parent / 'node_modules' / '.bin' / 'tailwindcss'
+    if local.exists():
+        return [str(local)]
+    found = shutil.which('tailwindcss')
+    if found:
+        return [found]
+    return None
+
+
+def bundle_available():
+    from django.contrib.staticfiles import finders
+    return finders.find(BUNDLE) is not None
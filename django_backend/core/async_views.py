@@ -0,0 +1,108 @@
+"""Versões assíncronas das views públicas mais lidas.
+
+``neabi/asgi.py`` liga ``ASYNC_VIEWS`` e ``core.urls`` passa a usar as
+views abaixo, e não as de ``core.views``, para a página inicial, as listas
+de posts e eventos e as páginas de detalhe. Elas herdam das views
+síncronas e mantêm querysets, templates, entradas do cache de conteúdo,
+GET condicional e paginação por chave; só os passos que acessam o banco
+ou o cache usam o ORM e o cache assíncronos. Enquanto uma requisição
+espera por eles, ou por um cliente lento, o event loop do worker segue
+atendendo as demais.
+
+As respostas são ``TemplateResponse``, renderizadas pelo Django na sua
+thread síncrona, porque os templates leem ``user`` e as mensagens de forma
+preguiçosa.
+"""
+from django.shortcuts import aget_object_or_404
+from django.template.response import TemplateResponse
+
+from . import content_cache, views
+from .conditional import alatest_update, arespond
+from .view_counter import arecord_view
+
+
+class AsyncListMixin:
+    """``get`` assíncrono das listas condicionais com paginação por chave"""
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        return await arespond(
+            request, None, [request.get_full_path(), await alatest_update(request, self.object_list)],
+            self.arender,
+        )
+
+    async def arender(self):
+        queryset = self.object_list
+        paginator, page, object_list, is_paginated = await self.apaginate_queryset(
+            queryset, self.get_paginate_by(queryset)
+        )
+        context = {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': object_list,
+            self.get_context_object_name(object_list): object_list,
+            'view': self,
+            **self.get_page_context(page),
+            **await self.aget_extra_context(),
+        }
+        return TemplateResponse(self.request, self.get_template_names(), context)
+
+    async def aget_extra_context(self):
+        return {}
+
+
+class AsyncDetailMixin:
+    """``get`` assíncrono das páginas de detalhe condicionais"""
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await arespond(request, None, self.get_validator_parts(), self.arender)
+
+    async def aget_object(self):
+        slug = self.kwargs[self.slug_url_kwarg]
+        return await aget_object_or_404(self.get_queryset(), **{self.slug_field: slug})
+
+    async def arender(self):
+        context = self.get_context_data(object=self.object)
+        return TemplateResponse(self.request, self.get_template_names(), context)
+
+
+async def home(request):
+    """Página inicial"""
+    context = {
+        'featured_posts': await views.featured_posts(content_cache.acached_list),
+        'upcoming_events': await views.upcoming_events(content_cache.acached_list),
+    }
+    return TemplateResponse(request, 'pages/home.html', context)
+
+
+class PostListView(AsyncListMixin, views.PostListView):
+
+    async def aget_extra_context(self):
+        return {
+            'categories': ['Todos'] + await views.category_names(content_cache.acached_list),
+            'featured_posts': await views.featured_posts(content_cache.acached_list),
+        }
+
+
+class PostDetailView(AsyncDetailMixin, views.PostDetailView):
+
+    async def aget_object(self):
+        obj = await super().aget_object()
+        # Incremento com buffer; gravado depois em lote via F()
+        await arecord_view(obj)
+        obj.views += 1
+        return obj
+
+
+class EventListView(AsyncListMixin, views.EventListView):
+
+    async def aget_extra_context(self):
+        return {
+            'featured_events': await views.featured_events(content_cache.acached_list),
+        }
+
+
+class EventDetailView(AsyncDetailMixin, views.EventDetailView):
+    pass
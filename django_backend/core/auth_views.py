@@ -4,6 +4,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
+from . import roles
 from .forms import CustomLoginForm, CustomUserCreationForm
 
 
@@ -23,7 +24,7 @@ def custom_login(request):
                 login(request, user)
                 
                 # Redirecionar baseado no role do usuário
-                if hasattr(user, 'userprofile') and user.userprofile.role == 'admin':
+                if roles.is_admin(user):
                     messages.success(request, f'Bem-vindo, {user.username}! Você está na área administrativa.')
                     return redirect('admin_dashboard')
                 else:
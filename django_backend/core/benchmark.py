@@ -0,0 +1,364 @@
+"""
+Benchmark HTTP das páginas públicas e da API.
+
+``manage.py benchmark_http`` dispara requisições contra um servidor em
+execução (por padrão ``http://127.0.0.1:8000``) a partir de um conjunto de
+threads, mede a latência de cada requisição e informa p50, p95 e p99 e a
+vazão por endpoint. Rode contra um servidor local com uma base gerada por
+``generate_load_data``, para que detalhes e buscas encontrem tabelas de
+tamanho realista.
+
+Os resultados são JSON simples. ``compare`` confere os resultados com uma
+linha de base salva: um endpoint regride quando o p95 cresce, ou a vazão
+cai, mais do que a fração permitida.
+
+``arun_endpoint`` dispara requisições GET a partir de um único event loop
+asyncio, em vez de threads, para que ``manage.py benchmark_asgi`` mantenha
+mil conexões keep-alive abertas contra um servidor WSGI e um ASGI.
+"""
+import asyncio
+import http.client
+import itertools
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Event, Post
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Endpoint:
+    """Uma requisição a repetir; ``expect`` é o status que conta como sucesso"""
+    name: str
+    path: str
+    method: str = 'GET'
+    expect: int = 200
+    # form(connection, path) -> (body, headers), chamada antes de cada requisição
+    form: callable = None
+
+
+@dataclass
+class Result:
+    """Latências (em segundos) e contagem de status coletadas para um endpoint"""
+    endpoint: Endpoint
+    latencies: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    cache_hits: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def add(self, status, latency, cache_hit=False):
+        """Conta uma resposta; ``status`` None é uma requisição que falhou."""
+        if status is None:
+            self.errors += 1
+            return
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status != self.endpoint.expect:
+            self.errors += 1
+        else:
+            self.latencies.append(latency)
+        if cache_hit:
+            self.cache_hits += 1
+
+    def summary(self):
+        completed = len(self.latencies)
+        data = {
+            'method': self.endpoint.method,
+            'path': self.endpoint.path,
+            'requests': completed + self.errors,
+            'errors': self.errors,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'throughput_rps': round(completed / self.elapsed, 1) if self.elapsed else 0.0,
+            'page_cache_hits': self.cache_hits,
+        }
+        if completed:
+            data['mean_ms'] = round(statistics.fmean(self.latencies) * 1000, 2)
+            data['max_ms'] = round(max(self.latencies) * 1000, 2)
+            for p in PERCENTILES:
+                data[f'p{p}_ms'] = round(percentile(self.latencies, p) * 1000, 2)
+        return data
+
+
+def public_endpoints(search):
+    """As páginas públicas, o post e o evento mais recentes, a API e o POST do formulário de contato."""
+    endpoints = [
+        Endpoint('home', reverse('home')),
+        Endpoint('blog', reverse('blog')),
+        Endpoint('blog_search', f"{reverse('blog')}?{urlencode({'search': search})}"),
+        Endpoint('eventos', reverse('eventos')),
+    ]
+    # Os registros mais recentes: as páginas que os visitantes de fato abrem
+    now = timezone.now()
+    post = (
+        Post.objects.filter(status='published', publication_date__lte=now)
+        .order_by('-publication_date').only('slug').first()
+    )
+    if post:
+        endpoints.append(Endpoint('blog_detail', reverse('post_detail', args=[post.slug])))
+    event = Event.objects.filter(visibility='public').order_by('-start_date').only('slug').first()
+    if event:
+        endpoints.append(Endpoint('event_detail', reverse('event_detail', args=[event.slug])))
+    endpoints += [
+        Endpoint('api_posts', reverse('post-list')),
+        Endpoint('api_events_upcoming', reverse('event-upcoming')),
+    ]
+    endpoints.append(Endpoint(
+        'contact_post', reverse('contato'), method='POST', expect=302,
+        form=partial(contact_form, counter=itertools.count()),
+    ))
+    return endpoints
+
+
+def percentile(values, p):
+    """Percentil ``p`` de ``values``, com interpolação linear."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Connection:
+    """
+    Cliente HTTP de uma thread, com seus próprios cookies.
+
+    Sem ``keep_alive`` cada requisição abre uma conexão nova, que é o que um
+    servidor WSGI atrás de um proxy recebe; isso também evita a espera de
+    Nagle / ACK atrasado em servidores que escrevem cabeçalhos e corpo
+    separadamente (runserver), que somaria ~40 ms a cada requisição em um
+    socket reaproveitado.
+    """
+
+    def __init__(self, base_url, timeout, keep_alive=False):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.conn = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.keep_alive = keep_alive
+        self.cookies = SimpleCookie()
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={morsel.value}' for name, morsel in self.cookies.items())
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            if not self.keep_alive:
+                self.conn.close()
+        except (OSError, http.client.HTTPException):
+            # A próxima requisição reconecta
+            self.conn.close()
+            raise
+        for value in response.headers.get_all('Set-Cookie') or ():
+            self.cookies.load(value)
+        return response
+
+    def close(self):
+        self.conn.close()
+
+
+def contact_form(connection, path, counter):
+    """Corpo e cabeçalhos de um POST do formulário de contato, com token CSRF válido."""
+    if settings.CSRF_COOKIE_NAME not in connection.cookies:
+        connection.request('GET', path)
+    # Sem cookie (a página do formulário falhou) o servidor responde 403, contado como erro
+    morsel = connection.cookies.get(settings.CSRF_COOKIE_NAME)
+    token = morsel.value if morsel else ''
+    n = next(counter)
+    body = urlencode({
+        'csrfmiddlewaretoken': token,
+        'name': 'Teste de Carga',
+        'email': f'carga{n}@exemplo.com.br',
+        'subject': 'Benchmark do formulário de contato',
+        'message': 'Mensagem enviada pelo benchmark HTTP para medir o tempo de resposta do formulário.',
+    })
+    return body, {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+def _send(connection, endpoint):
+    """Uma requisição; retorna ``(response, segundos)``."""
+    body, headers = None, {}
+    if endpoint.form:
+        body, headers = endpoint.form(connection, endpoint.path)
+    started = time.perf_counter()
+    response = connection.request(endpoint.method, endpoint.path, body, headers)
+    return response, time.perf_counter() - started
+
+
+def _run_phase(endpoint, connections, count, record=None):
+    lock = threading.Lock()
+    remaining = iter(range(count))
+
+    def worker(connection):
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            try:
+                response, latency = _send(connection, endpoint)
+            except (OSError, http.client.HTTPException):
+                response, latency = None, None
+            if record:
+                with lock:
+                    record(response, latency)
+
+    threads = [threading.Thread(target=worker, args=[connection], daemon=True) for connection in connections]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def run_endpoint(endpoint, base_url, requests, concurrency, warmup=0, keep_alive=False, timeout=30):
+    """Envia ``requests`` requisições medidas a ``endpoint`` a partir de ``concurrency`` clientes."""
+    result = Result(endpoint)
+
+    def record(response, latency):
+        if response is None:
+            result.add(None, latency)
+        else:
+            result.add(response.status, latency, response.headers.get('X-Page-Cache') == 'hit')
+
+    connections = [Connection(base_url, timeout, keep_alive) for _ in range(concurrency)]
+    try:
+        # O aquecimento usa os mesmos clientes, então cookies e sockets abertos são aproveitados
+        _run_phase(endpoint, connections, warmup)
+        result.elapsed = _run_phase(endpoint, connections, requests, record)
+    finally:
+        for connection in connections:
+            connection.close()
+    return result
+
+
+class AsyncConnection:
+    """Conexão HTTP/1.1 keep-alive sobre asyncio; apenas GET e HEAD."""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path):
+        """Envia uma requisição e lê a resposta inteira; retorna ``(status, headers)``."""
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(
+            f'{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n\r\n'.encode('latin-1')
+        )
+        try:
+            return await asyncio.wait_for(self._read_response(method), self.timeout)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            # A próxima requisição reconecta
+            self.close()
+            raise
+
+    async def _read_response(self, method):
+        head = (await self.reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split(' ', 2)[1])
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if method != 'HEAD':
+            await self._read_body(headers)
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, headers
+
+    async def _read_body(self, headers):
+        if headers.get('transfer-encoding', '').lower() != 'chunked':
+            await self.reader.readexactly(int(headers.get('content-length', 0)))
+            return
+        while True:
+            size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            # O bloco e seu CRLF; o último bloco, vazio, é só o CRLF
+            await self.reader.readexactly(size + 2)
+            if not size:
+                return
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _arun_phase(endpoint, connections, count, result=None):
+    remaining = iter(range(count))
+
+    async def worker(connection):
+        # Um só event loop: os workers se revezam no iterador compartilhado
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                status, headers = await connection.request(endpoint.method, endpoint.path)
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                status, headers = None, {}
+            if result:
+                result.add(status, time.perf_counter() - started, headers.get('x-page-cache') == 'hit')
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(connection) for connection in connections))
+    return time.perf_counter() - started
+
+
+async def arun_endpoint(endpoint, base_url, requests, concurrency, warmup=0, timeout=30):
+    """``run_endpoint`` com ``concurrency`` conexões keep-alive mantidas por um só event loop."""
+    parts = urlsplit(base_url)
+    result = Result(endpoint)
+    connections = [AsyncConnection(parts.hostname, parts.port or 80, timeout) for _ in range(concurrency)]
+    try:
+        # Abre todas antes, para que o servidor mantenha cada conexão durante toda a medição
+        await asyncio.gather(*(connection.connect() for connection in connections))
+        await _arun_phase(endpoint, connections, warmup)
+        result.elapsed = await _arun_phase(endpoint, connections, requests, result)
+    finally:
+        for connection in connections:
+            connection.close()
+    return result
+
+
+def error_rate(summary):
+    """Fração das requisições de ``summary`` que falharam ou receberam status inesperado."""
+    return summary['errors'] / summary['requests'] if summary['requests'] else 0.0
+
+
+def compare(results, baseline, threshold):
+    """Retorna ``(nome, mensagem)`` para cada endpoint que regrediu em relação a ``baseline``."""
+    regressions = []
+    for name, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        if error_rate(current) > error_rate(previous):
+            regressions.append((name, f"taxa de erros {error_rate(previous):.1%} -> {error_rate(current):.1%}"))
+        if 'p95_ms' not in previous:
+            continue
+        if 'p95_ms' not in current:
+            regressions.append((name, f"p95 {previous['p95_ms']} ms -> nenhuma requisição bem-sucedida"))
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append((name, f"p95 {previous['p95_ms']} ms -> {current['p95_ms']} ms"))
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+            regressions.append((name, f"throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s"))
+    return regressions
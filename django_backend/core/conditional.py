@@ -0,0 +1,180 @@
+"""
+GET condicional (ETag / Last-Modified) para páginas e recursos da API.
+
+Os validadores vêm de ``updated_at``: o do próprio objeto nos detalhes e o
+mais recente do queryset filtrado nas listas. O ETag também inclui a
+geração do cache de conteúdo (que muda em exclusões e em alterações de
+categorias/tags que ``updated_at`` não vê), a próxima fronteira de tempo
+(posts agendados e eventos que começam mudam as listas sem nenhum save) e
+o usuário, já que admins veem outro conteúdo. As views de detalhe somam
+os contadores de ``validator_fields``, gravados com ``update()`` sem mexer
+em ``updated_at``. Nenhuma resposta envia Last-Modified: um contador que
+sobe num detalhe, uma exclusão ou um post agendado que entra no ar não
+mudam ``updated_at``, e um ``If-Modified-Since`` receberia 304 para uma
+página que mudou. Só o ETag percebe.
+
+Um ``If-None-Match`` ou ``If-Modified-Since`` que confere recebe 304 antes
+de renderizar template ou serializer, a menos que haja mensagens flash
+esperando exibição. As views de detalhe buscam o objeto antes, então o
+contador de visualizações continua registrando as revalidações.
+"""
+import hashlib
+from calendar import timegm
+
+from asgiref.sync import sync_to_async
+from django.contrib.messages import get_messages
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from . import content_cache
+
+
+def _user_key(request):
+    return request.user.pk if request.user.is_authenticated else 0
+
+
+async def _auser_key(request):
+    user = await request.auser()
+    return user.pk if user.is_authenticated else 0
+
+
+def _validators(last_modified, generation, boundary, user_key, parts):
+    key = ':'.join(str(part) for part in (
+        last_modified.isoformat() if last_modified else '',
+        generation,
+        boundary.isoformat() if boundary else '',
+        user_key,
+        *parts,
+    ))
+    return f'W/"{hashlib.md5(key.encode()).hexdigest()}"', last_modified
+
+
+def make_validators(request, last_modified, *parts):
+    """Retorna ``(etag, last_modified)`` para conteúdo alterado pela última vez em ``last_modified``."""
+    boundary = content_cache.next_boundary()
+    return _validators(last_modified, content_cache.generation(), boundary, _user_key(request), parts)
+
+
+async def amake_validators(request, last_modified, *parts):
+    boundary = await content_cache.anext_boundary()
+    return _validators(
+        last_modified, await content_cache.ageneration(), boundary, await _auser_key(request), parts,
+    )
+
+
+def not_modified(request, etag, last_modified):
+    """Resposta 304 quando a cópia do cliente está atual, senão None."""
+    # A cópia do cliente não tem a mensagem flash que esta resposta mostraria
+    if len(get_messages(request)):
+        return None
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code not in (200, 304):
+        return response
+    response.headers.setdefault('ETag', etag)
+    if last_modified:
+        response.headers.setdefault('Last-Modified', http_date(timegm(last_modified.utctimetuple())))
+    return response
+
+
+def latest_update(request, queryset):
+    """``updated_at`` mais recente de ``queryset``, em cache por URL, usuário e geração."""
+    return content_cache.get_or_build(
+        f'lastmod:{_user_key(request)}:{request.get_full_path()}',
+        lambda: queryset.order_by().aggregate(latest=Max('updated_at'))['latest'],
+        time_bounded=True,
+    )
+
+
+async def alatest_update(request, queryset):
+    async def build():
+        return (await queryset.order_by().aaggregate(latest=Max('updated_at')))['latest']
+    return await content_cache.aget_or_build(
+        f'lastmod:{await _auser_key(request)}:{request.get_full_path()}', build,
+        time_bounded=True,
+    )
+
+
+def respond(request, last_modified, parts, build):
+    """
+    Responde 304 quando a cópia do cliente está atual, senão ``build()``.
+
+    ``parts`` é o que mais a resposta depende (id do objeto, URL).
+    """
+    etag, last_modified = make_validators(request, last_modified, *parts)
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = build()
+    return set_validators(response, etag, last_modified)
+
+
+async def arespond(request, last_modified, parts, build):
+    """Como ``respond``, com ``build`` sendo uma função assíncrona."""
+    etag, last_modified = await amake_validators(request, last_modified, *parts)
+    # Ler as mensagens pode carregar a sessão do banco
+    response = await sync_to_async(not_modified)(request, etag, last_modified)
+    if response is None:
+        response = await build()
+    return set_validators(response, etag, last_modified)
+
+
+def validator_parts(obj, fields):
+    """Partes do ETag de um objeto: pk, ``updated_at`` e os contadores em ``fields``."""
+    return [obj.pk, obj.updated_at.isoformat(), *(getattr(obj, name) for name in fields)]
+
+
+class ConditionalDetailMixin:
+    """Mixin de DetailView que responde revalidações a partir de ``object.updated_at``"""
+
+    # Campos exibidos na página mas alterados com update(), que não mexe em updated_at
+    validator_fields = ()
+
+    def get_validator_parts(self):
+        return validator_parts(self.object, self.validator_fields)
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return respond(
+            request, None, self.get_validator_parts(),
+            lambda: self.render_to_response(self.get_context_data(object=self.object)),
+        )
+
+
+class ConditionalListMixin:
+    """Mixin de ListView que responde revalidações a partir do ``updated_at`` mais recente"""
+
+    def get(self, request, *args, **kwargs):
+        return respond(
+            request, None, [request.get_full_path(), latest_update(request, self.get_queryset())],
+            lambda: super(ConditionalListMixin, self).get(request, *args, **kwargs),
+        )
+
+
+class ConditionalViewSetMixin:
+    """Mixin de ViewSet com ``retrieve`` e ``list`` condicionais"""
+
+    # Como em ConditionalDetailMixin
+    validator_fields = ()
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return respond(
+            request, None, validator_parts(instance, self.validator_fields),
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(
+            self.filter_queryset(self.get_queryset()),
+            lambda: super(ConditionalViewSetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def conditional_list(self, queryset, build):
+        """Para ações de lista extras (destaques, próximos)."""
+        request = self.request
+        return respond(request, None, [request.get_full_path(), latest_update(request, queryset)], build)
@@ -0,0 +1,172 @@
+"""
+Cache de conteúdo publicado, versionado por geração.
+
+Os resultados ficam em ``content:<geração>:<nome>``. Os handlers em
+``core.signals`` incrementam a geração depois que qualquer alteração em
+post, evento, categoria ou tag é confirmada, de modo que todas as entradas
+ficam órfãs de uma vez e a próxima requisição as reconstrói. Entradas
+órfãs expiram com ``CONTENT_CACHE_TIMEOUT``. Só são usados
+``get``/``set``/``add``/``incr``, então qualquer backend de cache serve;
+com vários processos use um compartilhado (arquivo, Redis), pois no
+LocMem a troca de geração fica restrita a um processo.
+
+Listas filtradas por ``timezone.now()`` (posts com ``publication_date``
+futura, eventos com ``start_date`` já passada) mudam sem nenhum sinal.
+Com ``time_bounded=True`` a entrada expira exatamente na próxima
+fronteira de tempo: a próxima publicação agendada ou o próximo início de
+evento, o que vier primeiro (``next_boundary``).
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Event, Post
+
+GENERATION_KEY = 'content:generation'
+
+_MISSING = object()
+
+
+def generation():
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        # Semeado pelo relógio para que um contador despejado não reutilize uma geração antiga
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        value = cache.get(GENERATION_KEY)
+    return value
+
+
+def is_process_local():
+    """Verdadeiro quando cada processo tem a própria cópia do cache (LocMem)"""
+    return isinstance(caches['default'], LocMemCache)
+
+
+def bump():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+
+
+def _default_timeout():
+    return getattr(settings, 'CONTENT_CACHE_TIMEOUT', 86400)
+
+
+def _boundary_queries(now):
+    """``(queryset, campo)`` de cada lista que muda com o tempo."""
+    return [
+        (Post.objects.filter(status='published', publication_date__gt=now), 'publication_date'),
+        (Event.objects.filter(visibility='public', start_date__gt=now), 'start_date'),
+    ]
+
+
+def _compute_boundary(now):
+    moments = [
+        queryset.aggregate(moment=Min(field))['moment']
+        for queryset, field in _boundary_queries(now)
+    ]
+    moments = [moment for moment in moments if moment is not None]
+    return min(moments) if moments else None
+
+
+def next_boundary():
+    """Próximo instante em que uma lista dependente de ``now()`` muda, ou ``None``."""
+    now = timezone.now()
+    key = f'content:{generation()}:boundary'
+    boundary = cache.get(key, _MISSING)
+    if boundary is _MISSING or (boundary is not None and boundary <= now):
+        boundary = _compute_boundary(now)
+        cache.set(key, boundary, seconds_until(boundary) or _default_timeout())
+    return boundary
+
+
+def seconds_until(moment):
+    """Segundos inteiros até ``moment`` (arredondados para cima), ou ``None``."""
+    if moment is None:
+        return None
+    return max(int((moment - timezone.now()).total_seconds()) + 1, 1)
+
+
+def get_or_build(name, builder, timeout=None, time_bounded=False):
+    """
+    Retorna o valor em cache de ``name``, chamando ``builder`` se faltar.
+
+    Com ``time_bounded`` a entrada não sobrevive à próxima fronteira de tempo.
+    """
+    key = f'content:{generation()}:{name}'
+    if time_bounded:
+        boundary = next_boundary()
+        # A fronteira faz parte da chave: ao cruzá-la, a entrada antiga deixa de ser lida
+        key = f'{key}:{boundary.timestamp() if boundary else "none"}'
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = builder()
+        if timeout is None:
+            timeout = _default_timeout()
+        if time_bounded and boundary is not None:
+            timeout = min(timeout, seconds_until(boundary))
+        cache.set(key, value, timeout)
+    return value
+
+
+def cached_list(name, queryset, timeout=None, time_bounded=False):
+    """Avalia ``queryset`` uma vez por geração e guarda as linhas."""
+    return get_or_build(name, lambda: list(queryset), timeout, time_bounded)
+
+
+# Versões assíncronas, para as views de core.async_views
+
+async def ageneration():
+    value = await cache.aget(GENERATION_KEY)
+    if value is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), None)
+        value = await cache.aget(GENERATION_KEY)
+    return value
+
+
+async def _acompute_boundary(now):
+    moments = [
+        (await queryset.aaggregate(moment=Min(field)))['moment']
+        for queryset, field in _boundary_queries(now)
+    ]
+    moments = [moment for moment in moments if moment is not None]
+    return min(moments) if moments else None
+
+
+async def anext_boundary():
+    """Como ``next_boundary``, consultando o banco pelo ORM assíncrono."""
+    now = timezone.now()
+    key = f'content:{await ageneration()}:boundary'
+    boundary = await cache.aget(key, _MISSING)
+    if boundary is _MISSING or (boundary is not None and boundary <= now):
+        boundary = await _acompute_boundary(now)
+        await cache.aset(key, boundary, seconds_until(boundary) or _default_timeout())
+    return boundary
+
+
+async def aget_or_build(name, builder, timeout=None, time_bounded=False):
+    """Como ``get_or_build``, com ``builder`` sendo uma função assíncrona."""
+    key = f'content:{await ageneration()}:{name}'
+    if time_bounded:
+        boundary = await anext_boundary()
+        key = f'{key}:{boundary.timestamp() if boundary else "none"}'
+    value = await cache.aget(key, _MISSING)
+    if value is _MISSING:
+        value = await builder()
+        if timeout is None:
+            timeout = _default_timeout()
+        if time_bounded and boundary is not None:
+            timeout = min(timeout, seconds_until(boundary))
+        await cache.aset(key, value, timeout)
+    return value
+
+
+async def acached_list(name, queryset, timeout=None, time_bounded=False):
+    """Como ``cached_list``, avaliando ``queryset`` pelo ORM assíncrono."""
+    async def build():
+        return [obj async for obj in queryset]
+    return await aget_or_build(name, build, timeout, time_bounded)
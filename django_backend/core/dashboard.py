@@ -0,0 +1,55 @@
+"""Estatísticas do painel administrativo.
+
+Todos os contadores de uma tabela saem de uma única consulta com agregação
+condicional. O resultado fica em cache e é descartado pelos handlers em
+``core.signals`` sempre que um post, evento ou mensagem é salvo ou excluído.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import page_cache
+from .models import ContactMessage, Event, Post
+
+CACHE_KEY = 'dashboard:stats'
+# Rede de segurança para escritas que não disparam signals (ex.: update())
+CACHE_TIMEOUT = 300
+
+
+def compute_stats():
+    now = timezone.now()
+    posts = Post.objects.aggregate(
+        total=Count('pk'),
+        published=Count('pk', filter=Q(status='published')),
+        draft=Count('pk', filter=Q(status='draft')),
+        scheduled=Count('pk', filter=Q(status='published', publication_date__gt=now)),
+        featured=Count('pk', filter=Q(featured=True)),
+    )
+    events = Event.objects.aggregate(
+        total=Count('pk'),
+        upcoming=Count('pk', filter=Q(status='upcoming')),
+        public=Count('pk', filter=Q(visibility='public')),
+        featured=Count('pk', filter=Q(featured=True)),
+    )
+    messages = ContactMessage.objects.aggregate(
+        total=Count('pk'),
+        unread=Count('pk', filter=Q(read=False)),
+    )
+    return {
+        'posts': posts,
+        'events': events,
+        'messages': messages,
+    }
+
+
+def get_stats():
+    stats = cache.get(CACHE_KEY)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(CACHE_KEY, stats, CACHE_TIMEOUT)
+    # Contadores ao vivo, fora do retrato em cache
+    return {**stats, 'page_cache': page_cache.stats()}
+
+
+def invalidate_stats():
+    cache.delete(CACHE_KEY)
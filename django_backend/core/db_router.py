@@ -0,0 +1,123 @@
+"""
+Roteamento entre banco primário e réplicas.
+
+As réplicas ficam em ``DATABASE_REPLICAS`` (aliases de ``DATABASES`` com
+uma cópia de ``default`` mantida fora do Django, por exemplo um arquivo
+SQLite restaurado pelo Litestream ou uma réplica de streaming do
+PostgreSQL). ``PrimaryReplicaRouter`` manda leituras para uma réplica
+saudável apenas enquanto ``ReplicaRoutingMiddleware`` marcou a requisição
+atual como segura (GET/HEAD/OPTIONS); todo o resto, inclusive comandos de
+gerenciamento e workers, lê do primário.
+
+A primeira escrita de uma requisição a fixa no primário, então o restante
+da requisição lê o que escreveu. Leituras dentro de uma transação no
+primário também ficam nele. A saúde das réplicas é verificada com uma
+consulta trivial e a resposta vale por ``DATABASE_REPLICA_CHECK_INTERVAL``
+segundos; sem réplica saudável, as leituras voltam ao primário.
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 30
+
+# None fora de uma requisição; senão, um dict com o estado de roteamento dela
+_request_state = ContextVar('db_routing', default=None)
+
+# alias -> (saudável, verificado_em), por processo
+_health = {}
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def _probe(alias):
+    connection = connections[alias]
+    name = connection.settings_dict['NAME']
+    # Conectar a um arquivo SQLite inexistente criaria um banco vazio sem aviso
+    if connection.vendor == 'sqlite' and not Path(name).exists():
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM django_migrations LIMIT 1')
+        return True
+    except DatabaseError:
+        connection.close()
+        return False
+
+
+def is_healthy(alias):
+    """Se ``alias`` passou na última verificação de saúde, verificando de novo quando vencida."""
+    interval = getattr(settings, 'DATABASE_REPLICA_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+    healthy, checked_at = _health.get(alias, (None, 0))
+    if healthy is None or time.monotonic() - checked_at >= interval:
+        healthy = _probe(alias)
+        if not healthy and _health.get(alias, (True,))[0]:
+            logger.warning('A réplica %r falhou na verificação de saúde; lendo do primário', alias)
+        _health[alias] = (healthy, time.monotonic())
+    return healthy
+
+
+def healthy_replicas():
+    return [alias for alias in replica_aliases() if is_healthy(alias)]
+
+
+@contextmanager
+def request_routing(read_only):
+    """Roteia a requisição envolvida; com ``read_only`` as leituras podem usar réplicas."""
+    token = _request_state.set({'replicas': read_only, 'pinned': not read_only})
+    try:
+        yield
+    finally:
+        _request_state.reset(token)
+
+
+def pin_to_primary():
+    """Manda as leituras restantes da requisição atual para o primário."""
+    state = _request_state.get()
+    if state is not None:
+        state['pinned'] = True
+
+
+class PrimaryReplicaRouter:
+    """Lê das réplicas em requisições seguras e escreve no primário"""
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state['replicas'] or state['pinned']:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        instance = hints.get('instance')
+        # Um objeto lido de uma réplica é gravado de volta no primário
+        if instance is not None and instance._state.db in replica_aliases():
+            return DEFAULT_DB_ALIAS
+        # Senão o Django mantém o banco da própria instância (ex.: carregada
+        # com using()) ou usa o primário
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # As réplicas recebem o schema do primário
+        if db in replica_aliases():
+            return False
+        return None
@@ -3,6 +3,7 @@ from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponseForbidden
+from . import roles
 
 
 def admin_required(view_func):
@@ -10,7 +11,7 @@ def admin_required(view_func):
     @wraps(view_func)
     @login_required
     def wrapper(request, *args, **kwargs):
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.role != 'admin':
+        if not roles.is_admin(request.user):
             messages.error(request, 'Acesso negado. Você precisa ser um administrador para acessar esta área.')
             return redirect('home')
         return view_func(request, *args, **kwargs)
@@ -22,7 +23,7 @@ def reader_or_admin_required(view_func):
     @wraps(view_func)
     @login_required
     def wrapper(request, *args, **kwargs):
-        if not hasattr(request.user, 'userprofile'):
+        if roles.user_role(request.user) is None:
             messages.error(request, 'Perfil de usuário não encontrado.')
             return redirect('home')
         return view_func(request, *args, **kwargs)
@@ -36,7 +37,7 @@ class AdminRequiredMixin:
         if not request.user.is_authenticated:
             return redirect('login')
         
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.role != 'admin':
+        if not roles.is_admin(request.user):
             messages.error(request, 'Acesso negado. Você precisa ser um administrador para acessar esta área.')
             return redirect('home')
         
@@ -50,7 +51,7 @@ class ReaderOrAdminRequiredMixin:
         if not request.user.is_authenticated:
             return redirect('login')
         
-        if not hasattr(request.user, 'userprofile'):
+        if roles.user_role(request.user) is None:
             messages.error(request, 'Perfil de usu��rio não encontrado.')
             return redirect('home')
         
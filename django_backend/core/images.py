@@ -0,0 +1,211 @@
+"""
+Derivados responsivos de imagens.
+
+As imagens enviadas são redimensionadas com o Pillow em variantes WebP e
+JPEG nas larguras de ``IMAGE_DERIVATIVE_WIDTHS``. As variantes ficam ao
+lado do original como ``<nome>.<hash do conteúdo>.<largura>w.<ext>``:
+o mesmo upload gera os mesmos arquivos e um upload substituído nunca
+reaproveita uma URL em cache. Imagens nunca são ampliadas.
+
+Cada modelo com campo ``image`` guarda o resultado em
+``image_derivatives``::
+
+    {"source": "posts/a.png", "width": 1181, "height": 472,
+     "variants": [{"name": "thumbnail", "width": 320, "height": 128,
+                   "webp": "posts/a.3f2c9e1b7a4d.320w.webp",
+                   "jpeg": "posts/a.3f2c9e1b7a4d.320w.jpg"}, ...]}
+
+Quando um save troca a imagem, ``core.signals`` enfileira uma
+``build_derivatives_task`` para o ``manage.py run_worker``, mantendo o
+redimensionamento fora da requisição. Até a tarefa rodar, as páginas usam
+a imagem original. Um arquivo que não pode ser lido faz a tarefa falhar, e
+o worker tenta de novo com backoff; um upload que o Pillow não decodifica
+fica sem derivados. ``manage.py build_image_derivatives`` processa os
+uploads antigos diretamente. As variantes de uma imagem substituída ou
+removida são apagadas quando a nova descrição é confirmada.
+"""
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import content_cache
+from .tasks import enqueue, task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = {
+    'thumbnail': 320,
+    'card': 640,
+    'detail': 1280,
+}
+
+# chave -> (formato do Pillow, extensão, tipo MIME)
+FORMATS = {
+    'webp': ('WEBP', 'webp', 'image/webp'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+def derivative_widths():
+    return getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS)
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == 'JPEG':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def build_derivatives(field_file):
+    """Grava as variantes de ``field_file`` e retorna a descrição delas."""
+    storage = field_file.storage
+    field_file.open('rb')
+    try:
+        data = field_file.read()
+    finally:
+        field_file.close()
+
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    directory, filename = posixpath.split(field_file.name)
+    stem = posixpath.splitext(filename)[0]
+
+    with Image.open(BytesIO(data)) as opened:
+        original = ImageOps.exif_transpose(opened)
+        width, height = original.size
+
+        variants = []
+        for name, target in sorted(derivative_widths().items(), key=lambda item: item[1]):
+            variant_width = min(target, width)
+            if any(variant['width'] == variant_width for variant in variants):
+                continue
+            variant_height = max(round(height * variant_width / width), 1)
+            resized = original.resize((variant_width, variant_height), Image.Resampling.LANCZOS)
+
+            variant = {'name': name, 'width': variant_width, 'height': variant_height}
+            for key, (image_format, extension, _) in FORMATS.items():
+                path = posixpath.join(directory, f'{stem}.{digest}.{variant_width}w.{extension}')
+                if not storage.exists(path):
+                    path = storage.save(path, ContentFile(_encode(resized, image_format)))
+                variant[key] = path
+            variants.append(variant)
+
+    return {
+        'source': field_file.name,
+        'width': width,
+        'height': height,
+        'variants': variants,
+    }
+
+
+def _variant_paths(derivatives):
+    """Caminhos no storage de todas as variantes de ``derivatives``."""
+    return {
+        variant[key]
+        for variant in derivatives.get('variants', [])
+        for key in FORMATS
+        if key in variant
+    }
+
+
+def _delete_variants(storage, paths):
+    """Apaga variantes que não são mais referenciadas; arquivo ausente não é erro."""
+    for path in sorted(paths):
+        try:
+            storage.delete(path)
+        except OSError:
+            logger.warning('Não foi possível apagar o derivado %s', path, exc_info=True)
+
+
+def refresh_derivatives(obj, force=False):
+    """Reconstrói ``obj.image_derivatives`` se a imagem mudou desde a última geração."""
+    current = obj.image_derivatives or {}
+    if not obj.image:
+        derivatives = {}
+    elif current.get('source') == obj.image.name and not force:
+        return current
+    else:
+        try:
+            derivatives = build_derivatives(obj.image)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            # Tentar de novo não conserta um arquivo que o Pillow não abre. Os
+            # demais OSError (arquivo ausente, storage fora do ar) sobem para que
+            # a fila de tarefas tente outra vez
+            logger.warning('Não foi possível decodificar %s, que fica sem derivados', obj.image.name, exc_info=True)
+            derivatives = {}
+
+    if derivatives != current:
+        # update() não dispara post_save, então o handler do sinal não é reexecutado
+        # updated_at também muda: páginas e fragmentos em cache com a imagem mudam
+        updated_at = timezone.now()
+        type(obj).objects.filter(pk=obj.pk).update(image_derivatives=derivatives, updated_at=updated_at)
+        obj.image_derivatives = derivatives
+        obj.updated_at = updated_at
+        content_cache.bump()
+
+        stale = _variant_paths(current) - _variant_paths(derivatives)
+        if stale:
+            # Só após o commit: um update desfeito ainda aponta para esses arquivos
+            storage = obj.image.storage
+            transaction.on_commit(lambda: _delete_variants(storage, stale))
+    return derivatives
+
+
+@task
+def build_derivatives_task(model_label, pk, force=False):
+    obj = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if obj is not None:
+        refresh_derivatives(obj, force=force)
+
+
+def schedule_derivatives(obj):
+    """Enfileira a reconstrução quando ``obj.image`` não corresponde mais aos derivados."""
+    current = obj.image_derivatives or {}
+    if not obj.image:
+        if current:
+            refresh_derivatives(obj)
+    elif current.get('source') != obj.image.name:
+        enqueue(build_derivatives_task, obj._meta.label, obj.pk, unique=True)
+
+
+def variants_for(obj, name):
+    """
+    Variantes de ``obj.image`` com largura até a de ``name``, da mais estreita à mais larga.
+
+    Vazio enquanto os derivados ainda descrevem um upload anterior.
+    """
+    derivatives = obj.image_derivatives or {}
+    if not obj.image or derivatives.get('source') != obj.image.name:
+        return []
+    variants = derivatives.get('variants', [])
+    limit = derivative_widths().get(name)
+    if limit is None:
+        return variants
+    fitting = [variant for variant in variants if variant['width'] <= limit]
+    return fitting or variants[:1]
+
+
+def srcset(storage, variants, key):
+    return ', '.join(f"{storage.url(variant[key])} {variant['width']}w" for variant in variants)
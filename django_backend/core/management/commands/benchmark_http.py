@@ -0,0 +1,149 @@
+import json
+import platform
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import benchmark
+from core.models import Event, Post
+
+
+class Command(BaseCommand):
+    help = 'Mede percentis de latência e vazão das páginas públicas e da API em um servidor em execução'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'endpoints',
+            nargs='*',
+            help='Nomes dos endpoints a medir (padrão: todos)',
+        )
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='Servidor a medir (padrão: http://127.0.0.1:8000)',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Requisições medidas por endpoint (padrão: 500)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Clientes simultâneos (padrão: 8)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=20,
+            help='Requisições de aquecimento, não medidas, por endpoint (padrão: 20)',
+        )
+        parser.add_argument(
+            '--keep-alive',
+            action='store_true',
+            help='Reaproveita conexões em vez de abrir uma por requisição',
+        )
+        parser.add_argument(
+            '--search',
+            default='educação',
+            help='Termo usado na busca do blog (padrão: educação)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Grava os resultados em JSON neste arquivo',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(settings.BASE_DIR / 'benchmarks' / 'baseline.json'),
+            help='JSON de linha de base para comparação (padrão: benchmarks/baseline.json)',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Salva estes resultados como nova linha de base em vez de comparar',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.15,
+            help='Regressão permitida de p95/vazão, em fração (padrão: 0.15)',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests e --concurrency devem ser positivos')
+
+        endpoints = benchmark.public_endpoints(options['search'])
+        if options['endpoints']:
+            known = {endpoint.name for endpoint in endpoints}
+            unknown = set(options['endpoints']) - known
+            if unknown:
+                raise CommandError(f"Endpoints desconhecidos: {', '.join(sorted(unknown))} (disponíveis: {', '.join(sorted(known))})")
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in options['endpoints']]
+
+        results = {
+            'meta': {
+                'base_url': options['base_url'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'keep_alive': options['keep_alive'],
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'posts': Post.objects.count(),
+                'events': Event.objects.count(),
+            },
+            'endpoints': {},
+        }
+
+        self.stdout.write(
+            f"{'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>7}"
+        )
+        for endpoint in endpoints:
+            result = benchmark.run_endpoint(
+                endpoint, options['base_url'], options['requests'], options['concurrency'],
+                options['warmup'], options['keep_alive'],
+            )
+            summary = result.summary()
+            results['endpoints'][endpoint.name] = summary
+            line = (
+                f"{endpoint.name:<20} {summary.get('p50_ms', '-'):>8} {summary.get('p95_ms', '-'):>8} "
+                f"{summary.get('p99_ms', '-'):>8} {summary['throughput_rps']:>8} {summary['errors']:>7}"
+            )
+            self.stdout.write(self.style.ERROR(line) if summary['errors'] else line)
+            if summary['errors']:
+                self.stdout.write(f"    status: {summary['statuses']}")
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Resultados gravados em {options['output']}")
+
+        errored = sorted(name for name, summary in results['endpoints'].items() if summary['errors'])
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            if errored:
+                raise CommandError(f"Erros em {', '.join(errored)}; linha de base não salva")
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Linha de base salva em {baseline_path}'))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'Sem linha de base em {baseline_path}; rode com --save-baseline para criar uma.'))
+            if errored:
+                raise CommandError(f"Erros em {', '.join(errored)}")
+            return
+
+        regressions = benchmark.compare(results, json.loads(baseline_path.read_text()), options['threshold'])
+        for name, message in regressions:
+            self.stdout.write(self.style.ERROR(f'{name}: {message}'))
+        failures = []
+        if errored:
+            failures.append(f"Erros em {', '.join(errored)}")
+        if regressions:
+            failures.append(f"Regressão em relação a {baseline_path}: {', '.join(sorted({name for name, _ in regressions}))}")
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS(f'✅ Nenhuma regressão em relação a {baseline_path}.'))
@@ -0,0 +1,39 @@
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import assets
+
+
+class Command(BaseCommand):
+    help = 'Compila a folha de estilos Tailwind minificada a partir das classes usadas nos templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-minify',
+            action='store_true',
+            help='Mantém a saída legível (para depurar o CSS gerado)',
+        )
+
+    def handle(self, *args, **options):
+        cli = assets.find_cli()
+        if cli is None:
+            raise CommandError(
+                'CLI do Tailwind não encontrada. Rode "npm install" na raiz do repositório '
+                'ou aponte TAILWIND_CLI para o binário standalone do tailwindcss.'
+            )
+
+        output = assets.output_path()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        command = cli + ['--output', str(output), '--content', ','.join(assets.content_globs())]
+        if not options['no_minify']:
+            command.append('--minify')
+
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f'Falha no build do Tailwind:\n{result.stderr.strip()}')
+
+        size = output.stat().st_size / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {output} gerado ({size:.1f} KB). Rode collectstatic para publicá-lo.'
+        ))
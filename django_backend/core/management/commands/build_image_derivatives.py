@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core import images
+from core.models import Event, Post
+
+
+class Command(BaseCommand):
+    help = 'Gera as variantes responsivas das imagens de posts e eventos existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reconstrói mesmo quando os derivados salvos correspondem à imagem atual',
+        )
+
+    def handle(self, *args, **options):
+        built = 0
+        for model in (Post, Event):
+            for obj in model.objects.exclude(image='').exclude(image__isnull=True).iterator():
+                try:
+                    derivatives = images.refresh_derivatives(obj, force=options['force'])
+                except OSError as exc:
+                    self.stdout.write(self.style.ERROR(f'{obj.image.name}: {exc}'))
+                    continue
+                if derivatives:
+                    built += 1
+                    self.stdout.write(f"{obj.image.name}: {len(derivatives['variants'])} variantes")
+                else:
+                    self.stdout.write(self.style.WARNING(f'{obj.image.name}: não foi possível processar'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Derivados prontos para {built} imagens.'))
@@ -0,0 +1,100 @@
+import re
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core import search
+from core.models import Event, Post
+
+# Improvável no texto gerado, então só o autor renomeado casa com ele
+AUTHOR_TOKEN = 'Zumbiquilombola'
+
+WORD_RE = re.compile(r'\w+')
+
+
+class Command(BaseCommand):
+    help = (
+        'Verifica a busca textual do PostgreSQL num banco descartável: os índices GIN do '
+        'post_migrate, buscas por título e autor e o uso dos índices. Ignorado em outros bancos.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(f'Ignorado: o banco é {connection.vendor}, não PostgreSQL.'))
+            return
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            failures = self.check_indexes()
+            call_command(
+                'generate_load_data', posts=20, events=20, messages=1, authors=2, tags=5, categories=2,
+                draft_ratio=0, future_ratio=0, years=1, seed=1, stdout=StringIO(),
+            )
+            failures += self.check_matches()
+            failures += self.check_plans()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if failures:
+            raise CommandError(f"Falha na verificação da busca do PostgreSQL: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('A busca do PostgreSQL funciona e usa seus índices.'))
+
+    def report(self, name, ok, detail):
+        self.stdout.write(f'{name}: {detail}' if ok else self.style.ERROR(f'{name}: {detail}'))
+        return [] if ok else [name]
+
+    def search_indexes(self, cursor, spec):
+        constraints = connection.introspection.get_constraints(cursor, spec.model._meta.db_table)
+        return {name: info for name, info in constraints.items() if name.startswith(spec.index_prefix)}
+
+    def check_indexes(self):
+        # Uma segunda chamada não deve criar nem remover nada
+        search.ensure_index()
+        failures = []
+        with connection.cursor() as cursor:
+            for spec in search.REGISTRY.values():
+                indexes = self.search_indexes(cursor, spec)
+                found = list(indexes) == [spec.index_name] and indexes[spec.index_name]['type'] == 'gin'
+                failures += self.report(
+                    f'índice {spec.index_name}', found,
+                    'único índice GIN de busca' if found else f'encontrados: {sorted(indexes) or "nenhum"}',
+                )
+        return failures
+
+    def check_matches(self):
+        failures = []
+        post = Post.objects.order_by('pk').first()
+        word = max(WORD_RE.findall(post.title), key=len)
+        found = search.search_queryset(Post.objects.all(), word).filter(pk=post.pk).exists()
+        failures += self.report('título do post', found, f"'{word}' encontra o post #{post.pk}")
+
+        # Renomear passa pelo handler de post_save do User que atualiza author_name
+        author = post.author
+        author.first_name = AUTHOR_TOKEN
+        author.save(update_fields=['first_name'])
+        matches = set(search.search_queryset(Post.objects.all(), AUTHOR_TOKEN).values_list('pk', flat=True))
+        expected = set(Post.objects.filter(author=author).values_list('pk', flat=True))
+        failures += self.report(
+            'autor do post', matches == expected,
+            f'{len(matches)} dos {len(expected)} posts do autor renomeado encontrados',
+        )
+
+        event = Event.objects.order_by('pk').first()
+        word = max(WORD_RE.findall(event.title), key=len)
+        found = search.search_queryset(Event.objects.all(), word).filter(pk=event.pk).exists()
+        failures += self.report('título do evento', found, f"'{word}' encontra o evento #{event.pk}")
+        return failures
+
+    def check_plans(self):
+        failures = []
+        for model, spec in search.REGISTRY.items():
+            # Poucas linhas saem mais baratas numa varredura; proibi-la mostra se o índice se aplica
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                plan = search.search_queryset(model.objects.all(), 'educação').explain()
+            used = spec.index_name in plan
+            failures += self.report(f'plano {model.__name__}', used, f'usa {spec.index_name}' if used else plan)
+        return failures
@@ -0,0 +1,141 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+
+# Na verificação de escala toda página é renderizada a partir do banco
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = (
+        'Renderiza as listagens e falha se alguma passar do limite em QUERY_BUDGETS, não responder 200 '
+        'ou fizer mais consultas com o dobro de linhas num banco descartável'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'url_names',
+            nargs='*',
+            help='Nomes de URL a verificar (padrão: todos os de QUERY_BUDGETS)',
+        )
+        parser.add_argument(
+            '--user',
+            help='Usuário para login, nas páginas que exigem autenticação',
+        )
+        parser.add_argument(
+            '--verbose-sql',
+            action='store_true',
+            help='Mostra o SQL capturado das páginas acima do limite',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=4,
+            help='Posts, eventos e mensagens criados para a verificação de escala, e criados de novo (padrão: 4)',
+        )
+        parser.add_argument(
+            '--skip-scaling',
+            action='store_true',
+            help='Só confere os limites no banco atual',
+        )
+
+    def handle(self, *args, **options):
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        names = options['url_names'] or list(budgets)
+        unknown = [name for name in names if name not in budgets]
+        if unknown:
+            raise CommandError(f"Nenhum limite de consultas definido para '{unknown[0]}'")
+        if options['rows'] < 1:
+            raise CommandError('--rows deve ser positivo')
+
+        paths = {}
+        for name in names:
+            try:
+                paths[name] = reverse(name)
+            except NoReverseMatch:
+                self.stdout.write(self.style.WARNING(f'{name}: exige argumentos na URL, ignorado'))
+
+        client = Client(raise_request_exception=False)
+        if options['user']:
+            try:
+                client.force_login(User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"Usuário '{options['user']}' não existe")
+
+        failures = self.check_budgets(client, paths, budgets, options['verbose_sql'])
+        if not options['skip_scaling']:
+            failures += self.check_scaling(paths, options['rows'])
+
+        if failures:
+            raise CommandError(f"Falha na verificação de consultas: {', '.join(dict.fromkeys(failures))}")
+        self.stdout.write(self.style.SUCCESS('✅ Todas as páginas dentro do limite de consultas.'))
+
+    def render(self, client, path):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path)
+        return response, captured
+
+    def check_budgets(self, client, paths, budgets, verbose_sql):
+        failures = []
+        for name, path in paths.items():
+            response, captured = self.render(client, path)
+            count = len(captured)
+            budget = budgets[name]
+
+            line = f'{name} ({path}): {count}/{budget} consultas, status {response.status_code}'
+            # Um redirecionamento ou página de erro faz poucas consultas e passaria despercebido
+            if count > budget or response.status_code != 200:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line))
+                if verbose_sql and count > budget:
+                    for query in captured.captured_queries:
+                        self.stdout.write(f"    {query['sql']}")
+            else:
+                self.stdout.write(line)
+        return failures
+
+    def check_scaling(self, paths, rows):
+        """Renderiza cada página com ``rows`` e depois o dobro de linhas; o número de consultas não pode crescer."""
+        self.stdout.write(f'\nEscala: {rows} e {rows * 2} linhas por modelo num banco descartável')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=NO_CACHE, DATABASE_REPLICAS=[]):
+                client = Client(raise_request_exception=False)
+                user = User.objects.create_user(username='query-budget')
+                user.userprofile.role = 'admin'
+                user.userprofile.save()
+                client.force_login(user)
+                counts = []
+                for seed in (1, 2):
+                    self.seed(rows, seed)
+                    counts.append({name: self.render(client, path) for name, path in paths.items()})
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        failures = []
+        for name, path in paths.items():
+            (small, small_queries), (large, large_queries) = counts[0][name], counts[1][name]
+            line = (
+                f'{name} ({path}): {len(small_queries)} -> {len(large_queries)} consultas, '
+                f'status {small.status_code}/{large.status_code}'
+            )
+            if len(large_queries) > len(small_queries) or {small.status_code, large.status_code} != {200}:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        return failures
+
+    def seed(self, rows, seed):
+        # Linhas publicadas e com datas passadas, para que todas apareçam nas listagens
+        call_command(
+            'generate_load_data', posts=rows, events=rows, messages=rows, authors=2, tags=10, categories=3,
+            featured_ratio=0.5, draft_ratio=0, future_ratio=0, years=1, seed=seed, stdout=StringIO(),
+        )
@@ -0,0 +1,76 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.models import ContactMessage, Event, Post
+
+# O SQLite indica varredura completa como "SCAN <tabela>" sem sufixo "USING ..."
+FULL_SCAN_RE = re.compile(r'\bSCAN (\w+)$')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+# Consultas que precisam usar um índice específico, e não um índice qualquer
+EXPECTED_INDEXES = {
+    'featured_posts': 'post_featured_idx',
+    'featured_events': 'event_featured_idx',
+    'unread_messages': 'contactmessage_unread_idx',
+}
+
+
+def public_queries():
+    """Formatos das consultas das páginas públicas, da API e do dashboard"""
+    now = timezone.now()
+    published = Post.objects.filter(status='published', publication_date__lte=now)
+    public_events = Event.objects.filter(visibility='public', start_date__gt=now)
+    return {
+        'post_list': published.select_related('author', 'category')
+            .order_by('-publication_date', '-id')[:10],
+        'featured_posts': published.filter(featured=True).select_related('author', 'category')[:3],
+        'event_list': public_events.order_by('start_date', 'id')[:13],
+        'featured_events': public_events.filter(featured=True)[:2],
+        'upcoming_events': public_events[:5],
+        'unread_messages': ContactMessage.objects.filter(read=False),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa EXPLAIN QUERY PLAN nas consultas públicas e falha em varreduras completas, '
+        'ordenações temporárias ou consultas que ignoram o índice próprio'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Consultas a verificar (padrão: todas)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('A verificação lê a saída do EXPLAIN QUERY PLAN do SQLite')
+
+        queries = public_queries()
+        names = options['names'] or list(queries)
+        failures = []
+
+        for name in names:
+            if name not in queries:
+                raise CommandError(f"Consulta '{name}' desconhecida. Opções: {', '.join(queries)}")
+            plan = queries[name].explain()
+            expected = EXPECTED_INDEXES.get(name)
+            if expected and f'USING INDEX {expected}' not in plan:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: esperado {expected}'))
+            elif any(FULL_SCAN_RE.search(line.strip()) or TEMP_SORT in line for line in plan.splitlines()):
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}:'))
+            else:
+                self.stdout.write(f'{name}:')
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+
+        if failures:
+            raise CommandError(f"Varredura completa, ordenação temporária ou índice ignorado em: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('✅ Todas as consultas usam índice.'))
@@ -0,0 +1,332 @@
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+from core import content_cache, dashboard, search
+from core.models import Category, ContactMessage, Event, Post, Tag, author_search_name
+
+CATEGORY_NAMES = [
+    'Educação', 'Cultura', 'História', 'Pesquisa', 'Extensão', 'Direitos Humanos',
+    'Literatura', 'Arte', 'Música', 'Religiosidade', 'Território', 'Memória',
+    'Políticas Públicas', 'Saúde', 'Juventude', 'Quilombos', 'Povos Indígenas', 'Línguas',
+]
+TAG_WORDS = [
+    'antirracismo', 'ancestralidade', 'diáspora', 'quilombo', 'capoeira', 'samba',
+    'candomblé', 'umbanda', 'literatura negra', 'lei 10.639', 'lei 11.645', 'cotas',
+    'identidade', 'resistência', 'consciência negra', 'povos originários', 'aldeia',
+    'demarcação', 'oralidade', 'griô', 'afrofuturismo', 'feminismo negro', 'juventude negra',
+    'território', 'memória', 'patrimônio', 'formação docente', 'currículo', 'extensão',
+    'iniciação científica', 'arte afro-brasileira', 'maracatu', 'jongo', 'congado',
+]
+TITLE_OPENINGS = [
+    'Reflexões sobre', 'Um olhar sobre', 'Caminhos para', 'Diálogos sobre', 'Memórias de',
+    'Desafios da', 'Experiências com', 'Notas sobre', 'O papel da', 'Perspectivas para',
+    'Histórias de', 'A importância da', 'Vozes da', 'Práticas de', 'Encontros com',
+]
+TITLE_SUBJECTS = [
+    'educação antirracista', 'cultura afro-brasileira', 'história indígena', 'resistência quilombola',
+    'literatura negra', 'ancestralidade', 'diversidade na escola', 'formação de professores',
+    'cultura popular', 'identidade negra', 'luta por território', 'religiões de matriz africana',
+    'juventude periférica', 'memória coletiva', 'oralidade e tradição', 'arte contemporânea negra',
+]
+TITLE_CONTEXTS = [
+    'na escola pública', 'no ensino médio', 'na universidade', 'no Nordeste', 'no Brasil de hoje',
+    'em sala de aula', 'nas comunidades', 'na extensão universitária', 'no século XXI', 'no Maranhão',
+]
+SENTENCE_STARTS = [
+    'Neste texto discutimos', 'A pesquisa mostra', 'O projeto acompanhou', 'Os estudantes relataram',
+    'A comunidade destacou', 'O debate evidenciou', 'A experiência revelou', 'Os dados indicam',
+    'A roda de conversa abordou', 'O encontro reuniu relatos sobre',
+]
+SENTENCE_OBJECTS = [
+    'a presença da cultura afro-brasileira no currículo', 'as formas de resistência dos povos indígenas',
+    'o impacto das políticas de cotas', 'a valorização dos saberes tradicionais',
+    'a construção de identidades na juventude', 'o enfrentamento ao racismo institucional',
+    'a memória das comunidades quilombolas', 'o papel da oralidade na transmissão de saberes',
+    'a aplicação das leis 10.639 e 11.645', 'a diversidade religiosa no ambiente escolar',
+]
+SENTENCE_ENDS = [
+    'ao longo dos últimos anos.', 'em diferentes contextos.', 'com participação da comunidade.',
+    'a partir de relatos e documentos.', 'em parceria com escolas da região.',
+    'e apontou novos caminhos.', 'sem perder de vista a história.', 'como prática cotidiana.',
+]
+EVENT_KINDS = ['Seminário', 'Roda de conversa', 'Oficina', 'Mesa-redonda', 'Mostra', 'Palestra', 'Sarau', 'Cine-debate']
+LOCATIONS = [
+    'Auditório Central', 'Sala 12 - Bloco B', 'Biblioteca do Campus', 'Anfiteatro', 'Centro de Convivência',
+    'Laboratório de Humanidades', 'Online (Google Meet)', 'Quadra Poliesportiva',
+]
+FIRST_NAMES = [
+    'Ana', 'João', 'Maria', 'José', 'Francisca', 'Antônio', 'Luiza', 'Carlos', 'Raimunda', 'Paulo',
+    'Tereza', 'Pedro', 'Juliana', 'Marcos', 'Iracema', 'Rafael', 'Dandara', 'Tiago', 'Benedita', 'Lucas',
+]
+LAST_NAMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Pereira', 'Costa', 'Rodrigues', 'Almeida', 'Nascimento',
+    'Lima', 'Araújo', 'Ferreira', 'Carvalho', 'Gomes', 'Ribeiro', 'Conceição', 'Barbosa', 'Rocha',
+]
+SUBJECTS = [
+    'Dúvida sobre inscrição', 'Proposta de parceria', 'Sugestão de tema', 'Convite para palestra',
+    'Certificado de participação', 'Informações sobre o projeto', 'Voluntariado', 'Material didático',
+]
+
+# Parágrafos sorteados de um conjunto fixo, para a geração não ficar presa à montagem de texto
+PARAGRAPH_POOL_SIZE = 400
+
+
+class Command(BaseCommand):
+    help = 'Gera grandes volumes de posts, eventos, tags e mensagens sintéticos para testes de escala'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000, help='Posts a criar (padrão: 100000)')
+        parser.add_argument('--events', type=int, default=10000, help='Eventos a criar (padrão: 10000)')
+        parser.add_argument('--messages', type=int, default=10000, help='Mensagens de contato a criar (padrão: 10000)')
+        parser.add_argument('--tags', type=int, default=200, help='Tags disponíveis para associar (padrão: 200)')
+        parser.add_argument('--categories', type=int, default=12, help='Categorias disponíveis para associar (padrão: 12)')
+        parser.add_argument('--authors', type=int, default=10, help='Contas de autor entre as quais os posts são distribuídos (padrão: 10)')
+        parser.add_argument('--tags-per-item', type=int, default=3, help='Máximo de tags por post/evento (padrão: 3)')
+        parser.add_argument('--featured-ratio', type=float, default=0.02, help='Fração de posts e eventos em destaque (padrão: 0.02)')
+        parser.add_argument('--draft-ratio', type=float, default=0.1, help='Fração de posts em rascunho (padrão: 0.1)')
+        parser.add_argument('--future-ratio', type=float, default=0.05, help='Fração de posts agendados para o futuro (padrão: 0.05)')
+        parser.add_argument('--years', type=int, default=5, help='Distribui as datas passadas por esta quantidade de anos (padrão: 5)')
+        parser.add_argument('--seed', type=int, default=42, help='Semente aleatória; a mesma semente gera os mesmos dados (padrão: 42)')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Linhas por transação (padrão: 5000)')
+        parser.add_argument('--skip-index', action='store_true', help='Não reconstrói o índice de busca textual ao final')
+
+    def handle(self, *args, **options):
+        for name in ('featured_ratio', 'draft_ratio', 'future_ratio'):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(f'--{name.replace("_", "-")} deve estar entre 0 e 1')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size deve ser positivo')
+
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING('DEBUG ligado: toda consulta é registrada e a geração fica cerca de duas vezes mais lenta.'))
+
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.now = timezone.now()
+        self.paragraphs = [self.paragraph() for _ in range(PARAGRAPH_POOL_SIZE)]
+
+        categories = self.create_categories(options['categories'])
+        tag_ids = self.create_tags(options['tags'])
+        authors = self.create_authors(options['authors'])
+
+        started = time.monotonic()
+        if options['posts']:
+            self.create_posts(options['posts'], categories, tag_ids, authors)
+        if options['events']:
+            self.create_events(options['events'], tag_ids)
+        if options['messages']:
+            self.create_messages(options['messages'])
+
+        # bulk_create não dispara os handlers de post_save, então o trabalho deles é feito uma vez aqui
+        if not options['skip_index'] and search.is_available():
+            self.stdout.write('Reconstruindo o índice de busca textual...')
+            search.ensure_index()
+            search.rebuild_index(batch_size=options['chunk_size'])
+        dashboard.invalidate_stats()
+        content_cache.bump()
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Concluído em {time.monotonic() - started:.1f}s.'))
+
+    # Texto
+
+    def sentence(self):
+        rng = self.rng
+        return f'{rng.choice(SENTENCE_STARTS)} {rng.choice(SENTENCE_OBJECTS)} {rng.choice(SENTENCE_ENDS)}'
+
+    def paragraph(self):
+        return ' '.join(self.sentence() for _ in range(self.rng.randint(3, 6)))
+
+    def title(self):
+        rng = self.rng
+        return f'{rng.choice(TITLE_OPENINGS)} {rng.choice(TITLE_SUBJECTS)} {rng.choice(TITLE_CONTEXTS)}'
+
+    def body(self):
+        return '\n\n'.join(self.rng.choices(self.paragraphs, k=self.rng.randint(3, 8)))
+
+    def person(self):
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+    def slug(self, model, title, n):
+        # SlugField tem 50 caracteres; o SQLite ignora o limite, o PostgreSQL não
+        suffix = f'-{n}'
+        max_length = model._meta.get_field('slug').max_length
+        return slugify(title)[:max_length - len(suffix)].rstrip('-') + suffix
+
+    def past_datetime(self):
+        return self.now - timedelta(seconds=self.rng.randint(0, self.options['years'] * 365 * 86400))
+
+    def pick_tags(self, tag_ids):
+        if not tag_ids or not self.options['tags_per_item']:
+            return []
+        count = self.rng.randint(0, min(self.options['tags_per_item'], len(tag_ids)))
+        return self.rng.sample(tag_ids, count)
+
+    # Dados de apoio
+
+    def create_categories(self, count):
+        names = [
+            CATEGORY_NAMES[i] if i < len(CATEGORY_NAMES) else f'{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i // len(CATEGORY_NAMES) + 1}'
+            for i in range(max(count, 1))
+        ]
+        Category.objects.bulk_create(
+            [Category(name=name, slug=slugify(name)) for name in names],
+            ignore_conflicts=True,
+        )
+        return list(Category.objects.filter(slug__in=[slugify(name) for name in names]))
+
+    def create_tags(self, count):
+        names = [
+            TAG_WORDS[i] if i < len(TAG_WORDS) else f'{TAG_WORDS[i % len(TAG_WORDS)]} {i // len(TAG_WORDS) + 1}'
+            for i in range(count)
+        ]
+        Tag.objects.bulk_create([Tag(name=name, slug=slugify(name)) for name in names], ignore_conflicts=True)
+        slugs = [slugify(name) for name in names]
+        return list(Tag.objects.filter(slug__in=slugs).order_by('pk').values_list('pk', flat=True))
+
+    def create_authors(self, count):
+        authors = []
+        for i in range(max(count, 1)):
+            first_name, last_name = FIRST_NAMES[i % len(FIRST_NAMES)], LAST_NAMES[i % len(LAST_NAMES)]
+            user, created = User.objects.get_or_create(
+                username=f'autor{i + 1:02d}',
+                defaults={
+                    'email': f'autor{i + 1:02d}@neabi.edu.br',
+                    'first_name': first_name,
+                    'last_name': last_name,
+                },
+            )
+            if created:
+                user.set_unusable_password()
+                user.save()
+                user.userprofile.role = 'admin'
+                user.userprofile.save()
+            authors.append(user)
+        return authors
+
+    # Inserções em lote
+
+    def insert(self, model, total, build, label, tag_ids=None):
+        """Cria ``total`` linhas de ``model`` em transações por lote; ``build(n)`` monta a linha n."""
+        chunk_size = self.options['chunk_size']
+        through = model.tags.through if tag_ids is not None else None
+        # Os slugs continuam a partir do maior id, então execuções repetidas não colidem
+        offset = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        started = time.monotonic()
+        for start in range(0, total, chunk_size):
+            objs = [build(offset + n) for n in range(start, min(start + chunk_size, total))]
+            with transaction.atomic():
+                model.objects.bulk_create(objs, batch_size=chunk_size)
+                if through is not None:
+                    field = f'{model._meta.model_name}_id'
+                    links = [
+                        through(**{field: obj.pk, 'tag_id': tag_id})
+                        for obj in objs
+                        for tag_id in self.pick_tags(tag_ids)
+                    ]
+                    through.objects.bulk_create(links, batch_size=chunk_size)
+            done = start + len(objs)
+            rate = done / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f'  {label}: {done}/{total} ({rate:,.0f}/s)')
+        return total
+
+    def create_posts(self, total, categories, tag_ids, authors):
+        self.stdout.write(f'Criando {total} posts...')
+        options = self.options
+
+        def build(n):
+            rng = self.rng
+            title = self.title()
+            content = self.body()
+            roll = rng.random()
+            if roll < options['draft_ratio']:
+                status, published = 'draft', self.past_datetime()
+            elif roll < options['draft_ratio'] + options['future_ratio']:
+                status, published = 'published', self.now + timedelta(seconds=rng.randint(3600, 90 * 86400))
+            else:
+                status, published = 'published', self.past_datetime()
+            author = rng.choice(authors)
+            return Post(
+                title=title,
+                slug=self.slug(Post, title, n),
+                excerpt=content[:297].rsplit(' ', 1)[0] + '...',
+                content=content,
+                author=author,
+                author_name=author_search_name(author),
+                category=rng.choice(categories),
+                publication_date=published,
+                # Cauda longa, como o tráfego real
+                views=int(rng.paretovariate(1.5) * 20),
+                featured=rng.random() < options['featured_ratio'],
+                status=status,
+            )
+
+        self.insert(Post, total, build, 'posts', tag_ids)
+
+    def create_events(self, total, tag_ids):
+        self.stdout.write(f'Criando {total} eventos...')
+        options = self.options
+        types = [choice for choice, _ in Event.TYPE_CHOICES]
+
+        def build(n):
+            rng = self.rng
+            kind = rng.choice(EVENT_KINDS)
+            subject = rng.choice(TITLE_SUBJECTS)
+            title = f'{kind}: {subject[0].upper()}{subject[1:]}'
+            day = self.now + timedelta(days=rng.randint(-options['years'] * 365, 180))
+            start = day.replace(hour=rng.randint(8, 19), minute=0, second=0, microsecond=0)
+            end = start + timedelta(hours=rng.randint(1, 4))
+            capacity = rng.choice([None, 30, 50, 80, 100, 150, 200, 500])
+            if end < self.now:
+                status = 'completed'
+                registered = rng.randint(capacity // 3, capacity) if capacity else rng.randint(0, 300)
+            elif start < self.now:
+                status = 'ongoing'
+                registered = rng.randint(0, capacity or 300)
+            else:
+                status = 'upcoming'
+                registered = rng.randint(0, capacity or 300)
+            return Event(
+                title=title,
+                slug=self.slug(Event, title, n),
+                description='\n\n'.join(rng.choices(self.paragraphs, k=rng.randint(1, 3))),
+                start_date=start,
+                end_date=end,
+                location=rng.choice(LOCATIONS),
+                visibility='private' if rng.random() < 0.1 else 'public',
+                event_type=rng.choice(types),
+                capacity=capacity,
+                registered=registered,
+                organizer='NEABI',
+                speakers=', '.join(self.person() for _ in range(rng.randint(0, 3))),
+                status=status,
+                featured=rng.random() < options['featured_ratio'],
+                registration_required=rng.random() < 0.7,
+                price='Gratuito' if rng.random() < 0.9 else f'R$ {rng.choice([10, 20, 30, 50])},00',
+            )
+
+        self.insert(Event, total, build, 'eventos', tag_ids)
+
+    def create_messages(self, total):
+        self.stdout.write(f'Criando {total} mensagens de contato...')
+
+        def build(n):
+            rng = self.rng
+            name = self.person()
+            return ContactMessage(
+                name=name,
+                email=f'{slugify(name).replace("-", ".")}{n}@exemplo.com.br',
+                subject=rng.choice(SUBJECTS),
+                message=rng.choice(self.paragraphs),
+                read=rng.random() < 0.6,
+            )
+
+        self.insert(ContactMessage, total, build, 'mensagens')
@@ -0,0 +1,69 @@
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from core import prerender
+
+
+def default_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host not in ('*', '') and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+class Command(BaseCommand):
+    help = 'Pré-renderiza as páginas sem conteúdo do banco (e opcionalmente o site público inteiro) em HTML estático'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Inclui também a home e as listas do blog e de eventos',
+        )
+        parser.add_argument(
+            '--output',
+            help='Diretório de saída (padrão: PRERENDER_ROOT)',
+        )
+        parser.add_argument(
+            '--host',
+            default=default_host(),
+            help='Host para o qual as páginas são renderizadas (usado nas URLs absolutas)',
+        )
+        parser.add_argument(
+            '--secure',
+            action='store_true',
+            help='Renderiza como se a requisição viesse por HTTPS',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Apaga o diretório de saída antes',
+        )
+
+    def handle(self, *args, **options):
+        root = Path(options['output']) if options['output'] else prerender.output_root()
+        if options['clear'] and root.exists():
+            if not root.is_dir():
+                raise CommandError(f'{root} não é um diretório')
+            shutil.rmtree(root)
+        root.mkdir(parents=True, exist_ok=True)
+
+        paths = prerender.static_paths()
+        if options['all']:
+            paths += prerender.content_paths()
+
+        client = Client(HTTP_HOST=options['host'], raise_request_exception=False)
+        written = 0
+        for path in paths:
+            target, error = prerender.render_page(client, path, root, secure=options['secure'])
+            if error:
+                self.stdout.write(self.style.WARNING(f'{path}: ignorada ({error})'))
+            else:
+                written += 1
+                self.stdout.write(f'{path} -> {target}')
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {written} de {len(paths)} páginas pré-renderizadas em {root}.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de busca textual de posts e eventos'
+
+    def handle(self, *args, **options):
+        if search.backend() == 'postgres':
+            search.ensure_index()
+            self.stdout.write('O PostgreSQL mantém os índices GIN de busca sozinho; nada a reconstruir.')
+            return
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING('Este banco não usa o índice FTS; nada a fazer.'))
+            return
+
+        search.ensure_index()
+        total = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} objetos indexados.'))
@@ -0,0 +1,99 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from core import content_cache, tasks
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em fila (processamento de imagens) em um pool de processos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'TASK_WORKER_CONCURRENCY', 2),
+            help='Número máximo de tarefas simultâneas',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Segundos de espera entre consultas à fila quando ocioso',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Encerra quando a fila esvaziar em vez de consultar indefinidamente',
+        )
+
+    def handle(self, *args, **options):
+        if content_cache.is_process_local():
+            raise CommandError(
+                'O worker incrementa a geração do cache de conteúdo após cada tarefa, mas o cache padrão é '
+                'LocMemCache, que os processos web não enxergam. Defina CACHE_BACKEND com um backend '
+                'compartilhado (arquivo, Redis, Memcached).'
+            )
+        concurrency = max(options['concurrency'], 1)
+        poll_interval = options['poll_interval']
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+
+        self.stdout.write(f'Worker iniciado com {concurrency} processos.')
+        # spawn: os filhos configuram o Django do zero em vez de herdar as
+        # conexões de banco abertas do processo pai
+        with ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as pool:
+            running = {}
+            try:
+                while not self.stopping:
+                    while len(running) < concurrency:
+                        task = tasks.claim_next()
+                        if task is None:
+                            break
+                        future = pool.submit(tasks.execute, task.name, task.args, task.kwargs)
+                        running[future] = task
+
+                    if not running:
+                        if options['once']:
+                            break
+                        close_old_connections()
+                        time.sleep(poll_interval)
+                        continue
+
+                    done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.finish(running.pop(future), future)
+            except KeyboardInterrupt:
+                self.stopping = True
+
+            # Aguarda as tarefas já entregues ao pool e registra o resultado
+            for future in list(running):
+                self.finish(running.pop(future), future)
+
+        self.stdout.write('Worker encerrado.')
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def finish(self, task, future):
+        try:
+            future.result()
+        except Exception as exc:
+            retrying = tasks.mark_failed(task, exc)
+            state = 'nova tentativa agendada' if retrying else 'desistiu'
+            self.stdout.write(self.style.ERROR(
+                f'#{task.pk} {task.name} falhou (tentativa {task.attempts}/{task.max_attempts}, {state}): {exc}'
+            ))
+        else:
+            tasks.mark_done(task)
+            self.stdout.write(f'#{task.pk} {task.name} concluída')
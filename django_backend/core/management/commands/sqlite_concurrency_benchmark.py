@@ -0,0 +1,172 @@
+import copy
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.benchmark import percentile
+from core.models import Category, Post
+
+ALIAS = 'sqlite_benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Compara os perfis de conexão do SQLite com leitores e escritores de visualizações concorrentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'profiles',
+            nargs='*',
+            help='Perfis de SQLITE_PROFILES a comparar (padrão: todos)',
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=8,
+            help='Threads executando as consultas da lista e do detalhe do blog (padrão: 8)',
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=4,
+            help='Threads incrementando visualizações em transações (padrão: 4)',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10,
+            help='Segundos de execução por perfil (padrão: 10)',
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=2000,
+            help='Posts no banco descartável (padrão: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(settings.SQLITE_PROFILES)
+        unknown = set(profiles) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Perfis de SQLite desconhecidos: {', '.join(sorted(unknown))}")
+        if settings.DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('O banco padrão não é SQLite')
+
+        rows = []
+        for profile in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                self.stdout.write(f'Perfil {profile}: preparando {options["posts"]} posts...')
+                self.open_database(Path(directory) / 'benchmark.sqlite3', settings.SQLITE_PROFILES[profile])
+                try:
+                    self.seed(options['posts'])
+                    rows.append((profile, self.run(options)))
+                finally:
+                    self.close_database()
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'perfil':<12} {'leituras/s':>10} {'p95 leit.':>9} {'escritas/s':>10} {'p95 escr.':>10} {'locked':>7}"
+        )
+        for profile, result in rows:
+            self.stdout.write(
+                f"{profile:<12} {result['reads'] / result['elapsed']:>10.0f} {result['read_p95']:>7.1f}ms "
+                f"{result['writes'] / result['elapsed']:>10.0f} {result['write_p95']:>8.1f}ms {result['locked']:>7}"
+            )
+
+    def open_database(self, path, options):
+        """Registra um banco SQLite descartável em ALIAS com ``options``."""
+        config = copy.deepcopy(connections.settings['default'])
+        config.update(NAME=str(path), OPTIONS=copy.deepcopy(options))
+        connections.settings[ALIAS] = config
+        # run_syncdb: o app core não tem migrations versionadas
+        call_command('migrate', database=ALIAS, run_syncdb=True, verbosity=0)
+
+    def close_database(self):
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+
+    def seed(self, total):
+        # bulk_create não dispara o signal que criaria o UserProfile no banco padrão
+        author, = User.objects.using(ALIAS).bulk_create([User(username='benchmark')])
+        category = Category.objects.using(ALIAS).create(name='Benchmark', slug='benchmark')
+        Post.objects.using(ALIAS).bulk_create([
+            Post(
+                title=f'Post {n}', slug=f'post-{n}', excerpt='Resumo', content='Conteúdo ' * 200,
+                author=author, category=category, status='published',
+            )
+            for n in range(total)
+        ], batch_size=500)
+
+    def run(self, options):
+        pks = list(Post.objects.using(ALIAS).values_list('pk', flat=True))
+        latencies = {'read': [], 'write': []}
+        outcomes = Counter()
+        lock = threading.Lock()
+        stop = threading.Event()
+        barrier = threading.Barrier(options['readers'] + options['writers'])
+
+        def read(rng):
+            # A lista do blog mais uma página de detalhe
+            posts = Post.objects.using(ALIAS).filter(
+                status='published', publication_date__lte=timezone.now(),
+            ).select_related('author', 'category')
+            list(posts[:9])
+            posts.get(pk=rng.choice(pks))
+
+        def write(rng):
+            # Lê e depois escreve, o formato que falha com um BEGIN adiado
+            with transaction.atomic(using=ALIAS):
+                post = Post.objects.using(ALIAS).only('pk').get(pk=rng.choice(pks))
+                Post.objects.using(ALIAS).filter(pk=post.pk).update(views=F('views') + 1)
+
+        def worker(kind, operation, seed):
+            rng = random.Random(seed)
+            try:
+                barrier.wait()
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        operation(rng)
+                    except OperationalError:
+                        with lock:
+                            outcomes['locked'] += 1
+                        continue
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies[kind].append(elapsed)
+            finally:
+                connections[ALIAS].close()
+
+        threads = [
+            threading.Thread(target=worker, args=('read', read, n)) for n in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=('write', write, 1000 + n)) for n in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'elapsed': elapsed,
+            'reads': len(latencies['read']),
+            'writes': len(latencies['write']),
+            'read_p95': percentile(latencies['read'], 95) * 1000 if latencies['read'] else 0,
+            'write_p95': percentile(latencies['write'], 95) * 1000 if latencies['write'] else 0,
+            'locked': outcomes['locked'],
+        }
@@ -0,0 +1,285 @@
+import json
+import logging
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.messages import get_messages
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from . import db_router, page_cache
+
+logger = logging.getLogger('core.profiling')
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Medições coletadas em uma requisição"""
+
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries.append((sql, repr(params)))
+
+    @property
+    def duplicate_queries(self):
+        return sum(count - 1 for count in Counter(self.queries).values() if count > 1)
+
+
+def _instrument_templates():
+    """Envolve Template.render para medir a renderização externa da requisição."""
+    if getattr(Template.render, 'profiled', False):
+        return
+    original_render = Template.render
+
+    def render(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return original_render(self, context)
+        profile.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            profile.template_depth -= 1
+            if not profile.template_depth:
+                profile.template_time += time.perf_counter() - start
+
+    render.profiled = True
+    Template.render = render
+
+
+class RequestProfilingMiddleware:
+    """Profiling de SQL, templates e memória por requisição.
+
+    Ativado com ``REQUEST_PROFILING = True``; caso contrário o middleware se
+    remove na inicialização e não custa nada. Cada requisição recebe um
+    cabeçalho ``Server-Timing`` e uma linha de log JSON no logger
+    ``core.profiling``, e um aviso é registrado quando a requisição faz mais
+    consultas que o limite em ``QUERY_BUDGETS`` (por nome de URL).
+
+    O pico de alocação usa tracemalloc, que deixa as requisições bem mais
+    lentas e vale para o processo inteiro, então requisições simultâneas
+    dividem a medição. Desative com ``REQUEST_PROFILING_MEMORY = False``.
+
+    O middleware é apenas síncrono: sob ASGI o Django passa cada requisição
+    medida por uma thread, então deixe-o desligado ao medir as views
+    assíncronas.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.trace_memory = getattr(settings, 'REQUEST_PROFILING_MEMORY', True)
+        _instrument_templates()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        total_time = time.perf_counter() - start
+
+        peak_memory = None
+        if self.trace_memory:
+            peak_memory = max(tracemalloc.get_traced_memory()[1] - memory_start, 0)
+
+        self.report(request, response, profile, total_time, peak_memory)
+        return response
+
+    def report(self, request, response, profile, total_time, peak_memory):
+        match = request.resolver_match
+        url_name = match.view_name if match else None
+        query_count = len(profile.queries)
+        duplicates = profile.duplicate_queries
+
+        timings = [
+            f'db;dur={profile.sql_time * 1000:.2f};desc="{query_count} queries, {duplicates} duplicates"',
+            f'tpl;dur={profile.template_time * 1000:.2f};desc="templates"',
+            f'total;dur={total_time * 1000:.2f}',
+        ]
+        if peak_memory is not None:
+            timings.append(f'mem;desc="peak {peak_memory / 1024:.1f} KiB"')
+        response['Server-Timing'] = ', '.join(timings)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'url_name': url_name,
+            'status': response.status_code,
+            'queries': query_count,
+            'duplicate_queries': duplicates,
+            'sql_ms': round(profile.sql_time * 1000, 2),
+            'template_ms': round(profile.template_time * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+            'peak_memory_bytes': peak_memory,
+        }))
+
+        budget = self.budgets.get(url_name)
+        if budget is not None and query_count > budget:
+            logger.warning(
+                'LIMITE DE CONSULTAS EXCEDIDO: %s (%s) fez %d consultas, limite é %d',
+                url_name, request.path, query_count, budget,
+            )
+
+
+class ReplicaRoutingMiddleware:
+    """Permite que requisições seguras leiam das réplicas de ``DATABASE_REPLICAS``.
+
+    Vem primeiro, para que sessão e autenticação também leiam de uma
+    réplica. Métodos não seguros, e o restante de qualquer requisição após
+    sua primeira escrita, usam o primário (veja ``core.db_router``). Se
+    remove quando não há réplicas configuradas.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not db_router.replica_aliases():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with db_router.request_routing(read_only=request.method in self.SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with db_router.request_routing(read_only=request.method in self.SAFE_METHODS):
+            return await self.get_response(request)
+
+
+class LegacySessionBackendMiddleware:
+    """Passa para o ``ProfileModelBackend`` as sessões abertas pelo ``ModelBackend``.
+
+    A sessão guarda o caminho do backend que fez o login, e o Django só a
+    aceita se esse caminho estiver em ``AUTHENTICATION_BACKENDS``. Manter o
+    ``ModelBackend`` na lista verificaria cada senha errada duas vezes;
+    trocar o caminho antes do ``AuthenticationMiddleware`` mantém essas
+    sessões logadas sem isso. Pode sair quando elas expirarem
+    (SESSION_COOKIE_AGE, duas semanas por padrão).
+    """
+
+    LEGACY_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+    BACKEND = 'core.roles.ProfileModelBackend'
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.session.get(BACKEND_SESSION_KEY) == self.LEGACY_BACKEND:
+            request.session[BACKEND_SESSION_KEY] = self.BACKEND
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if await request.session.aget(BACKEND_SESSION_KEY) == self.LEGACY_BACKEND:
+            await request.session.aset(BACKEND_SESSION_KEY, self.BACKEND)
+        return await self.get_response(request)
+
+
+class PageCacheMiddleware:
+    """Serve páginas públicas a visitantes anônimos a partir de ``core.page_cache``.
+
+    Deve vir depois dos middlewares de autenticação e de mensagens.
+    Desativado com ``PAGE_CACHE = False``. As respostas levam
+    ``X-Page-Cache: hit`` ou ``miss``; um acerto ainda respeita
+    ``If-None-Match``/``If-Modified-Since``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PAGE_CACHE', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.url_names = page_cache.url_names()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.store(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return await sync_to_async(self.store)(request, response)
+
+    def store(self, request, response):
+        key = getattr(request, '_page_cache_key', None)
+        if key is not None and not response.has_header('X-Page-Cache'):
+            page_cache.store(key, response)
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method != 'GET'
+            or request.resolver_match.url_name not in self.url_names
+            or request.user.is_authenticated
+            or len(get_messages(request))
+        ):
+            return None
+
+        key = page_cache.cache_key(request)
+        response = page_cache.get(key)
+        if response is None:
+            request._page_cache_key = key
+            return None
+
+        response['X-Page-Cache'] = 'hit'
+        last_modified = response.get('Last-Modified')
+        not_modified = get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+            response=response,
+        )
+        return not_modified
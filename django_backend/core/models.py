@@ -5,6 +5,11 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 
+def author_search_name(user):
+    """Nome completo e username, como indexados na busca em ``Post.author_name``"""
+    return ' '.join(value for value in (user.get_full_name(), user.username) if value)
+
+
 class UserProfile(models.Model):
     ROLE_CHOICES = [
         ('admin', 'Administrador'),
@@ -59,6 +64,9 @@ class Post(models.Model):
     excerpt = models.TextField(max_length=300, verbose_name="Resumo", blank=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="Autor")
     image = models.ImageField(upload_to='posts/', blank=True, null=True, verbose_name="Imagem")
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    # Cópia de author_search_name(author): o índice de busca do PostgreSQL não faz join com auth_user
+    author_name = models.TextField(blank=True, editable=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft', verbose_name="Status")
     publication_date = models.DateTimeField(verbose_name="Data de Publicação", default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
@@ -72,6 +80,16 @@ class Post(models.Model):
         verbose_name = "Post"
         verbose_name_plural = "Posts"
         ordering = ['-publication_date']
+        indexes = [
+            # Lista pública: status='published' AND publication_date<=agora ORDER BY -publication_date, -id
+            models.Index(fields=['status', '-publication_date', '-id'], name='post_status_pub_idx'),
+            # O SQLite só escolhe um índice parcial cuja chave começa pelo termo de igualdade
+            models.Index(
+                fields=['status', '-publication_date'],
+                condition=models.Q(featured=True),
+                name='post_featured_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -89,6 +107,8 @@ class Post(models.Model):
         if not self.excerpt and self.content:
             # Gera excerpt automaticamente se não fornecido
             self.excerpt = self.content[:297] + "..."
+        if self.author_id is not None:
+            self.author_name = author_search_name(self.author)
         super().save(*args, **kwargs)
 
 
@@ -124,6 +144,7 @@ class Event(models.Model):
     speakers = models.TextField(help_text="Lista de palestrantes separados por vírgula", verbose_name="Palestrantes", blank=True)
     tags = models.ManyToManyField(Tag, blank=True, verbose_name="Tags")
     image = models.ImageField(upload_to='events/', blank=True, null=True, verbose_name="Imagem")
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming', verbose_name="Status")
     featured = models.BooleanField(default=False, verbose_name="Destaque")
     registration_required = models.BooleanField(default=True, verbose_name="Inscrição Obrigatória")
@@ -135,6 +156,15 @@ class Event(models.Model):
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
         ordering = ['start_date']
+        indexes = [
+            # Lista pública: visibility='public' AND start_date>agora ORDER BY start_date, id
+            models.Index(fields=['visibility', 'start_date', 'id'], name='event_visibility_start_idx'),
+            models.Index(
+                fields=['visibility', 'start_date'],
+                condition=models.Q(featured=True),
+                name='event_featured_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -180,6 +210,46 @@ class ContactMessage(models.Model):
         verbose_name = "Mensagem de Contato"
         verbose_name_plural = "Mensagens de Contato"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(read=False),
+                name='contactmessage_unread_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
+
+
+class Task(models.Model):
+    """Tarefa em segundo plano executada pelo comando run_worker"""
+    STATUS_CHOICES = [
+        ('pending', 'Pendente'),
+        ('running', 'Em execução'),
+        ('done', 'Concluída'),
+        ('failed', 'Falhou'),
+    ]
+    
+    name = models.CharField(max_length=200, verbose_name="Tarefa")
+    args = models.JSONField(default=list, blank=True, verbose_name="Argumentos")
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name="Argumentos nomeados")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="Status")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name="Máximo de tentativas")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Executar após")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Iniciada em")
+    last_error = models.TextField(blank=True, verbose_name="Último erro")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criada em")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizada em")
+    
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
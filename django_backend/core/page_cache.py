@@ -0,0 +1,98 @@
+"""
+Cache de páginas inteiras para visitantes anônimos.
+
+``core.middleware.PageCacheMiddleware`` serve do cache as páginas públicas
+de ``PAGE_CACHE_URL_NAMES`` quando o visitante é anônimo e não tem mensagens
+pendentes. As entradas são indexadas por host, caminho e os parâmetros de
+``PAGE_CACHE_QUERY_PARAMS`` (ordenados, vazios descartados), então
+parâmetros de rastreamento e a ordem não fragmentam o cache. A chave também
+leva a geração do conteúdo e a próxima fronteira de tempo: os sinais de
+``core.signals`` aposentam todas as páginas de uma vez, e posts agendados ou
+eventos que começam saem da página na hora certa.
+
+Acertos e falhas são contados no cache e expostos por ``stats()``.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import content_cache
+
+DEFAULT_URL_NAMES = ('home', 'blog', 'eventos', 'sobre', 'projetos', 'semana_consciencia_negra')
+DEFAULT_QUERY_PARAMS = ('search', 'category', 'type', 'page', 'cursor', 'count')
+
+HITS_KEY = 'pagecache:hits'
+MISSES_KEY = 'pagecache:misses'
+
+
+def url_names():
+    return set(getattr(settings, 'PAGE_CACHE_URL_NAMES', DEFAULT_URL_NAMES))
+
+
+def cache_key(request):
+    params = getattr(settings, 'PAGE_CACHE_QUERY_PARAMS', DEFAULT_QUERY_PARAMS)
+    query = sorted(
+        (name, value.strip())
+        for name in params
+        for value in request.GET.getlist(name)
+        if value.strip()
+    )
+    url = f'{request.get_host()}{request.path}?{urlencode(query)}'
+    boundary = content_cache.next_boundary()
+    stamp = int(boundary.timestamp()) if boundary else 0
+    return f'pagecache:{content_cache.generation()}:{stamp}:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def get(key):
+    """Resposta em cache para ``key``, ou None."""
+    entry = cache.get(key)
+    _count(HITS_KEY if entry is not None else MISSES_KEY)
+    if entry is None:
+        return None
+    status, headers, content = entry
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response.headers[name] = value
+    return response
+
+
+def store(key, response):
+    """Guarda ``response`` se for um 200 simples, sem cookies."""
+    cache_control = response.get('Cache-Control', '')
+    if (
+        response.status_code != 200
+        or response.streaming
+        or response.cookies
+        or 'private' in cache_control
+        or 'no-store' in cache_control
+    ):
+        return False
+    headers = list(response.items())
+    timeout = getattr(settings, 'CONTENT_CACHE_TIMEOUT', 86400)
+    remaining = content_cache.seconds_until(content_cache.next_boundary())
+    if remaining is not None:
+        timeout = min(timeout, remaining)
+    cache.set(key, (response.status_code, headers, response.content), timeout)
+    return True
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 3) if total else None,
+    }
@@ -0,0 +1,108 @@
+"""
+Páginas HTML pré-renderizadas.
+
+``manage.py prerender_site`` renderiza as páginas pela pilha completa de
+middlewares, como um visitante anônimo as veria, em
+``PRERENDER_ROOT/<caminho>/index.html`` com cópias ``.gz``/``.br``. Por
+padrão só as páginas sem conteúdo do banco (``STATIC_PAGES``) são geradas;
+com ``--all`` entram também a home e as listas do blog e de eventos, como
+um retrato que precisa ser refeito depois de cada publicação. Os detalhes
+de posts e eventos nunca são pré-renderizados: um arquivo servido pularia o
+``record_view`` e mostraria contagens de visualizações e inscrições
+velhas, e renderizá-los registraria visualizações que ninguém fez.
+
+Com ``PRERENDER_SERVE`` ativo, o ``wsgi.py`` coloca
+``PrerenderedPagesMiddleware`` na frente do Django. Ele responde GET/HEAD
+sem query string de visitantes sem cookie de sessão ou de mensagens direto
+desses arquivos, então o site continua servindo barato sob carga e antes de
+o Django aquecer. O resto segue para o Django. A cada acerto, a página em
+cache é conferida com o mtime e o tamanho do arquivo, então uma regeração
+vale sem reiniciar e uma página apagada segue para o Django.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.http.cookie import parse_cookie
+from django.urls import reverse
+
+from .staticfiles import (
+    ASGIStaticFilesMiddleware, StaticFileFinder, StaticFilesMiddleware, compress_file,
+)
+
+STATIC_PAGES = ('sobre', 'projetos', 'semana_consciencia_negra')
+
+# Visitantes com estes cookies podem ver uma página personalizada
+PERSONAL_COOKIES = (settings.SESSION_COOKIE_NAME, 'messages')
+
+
+def output_root():
+    return Path(getattr(settings, 'PRERENDER_ROOT', settings.BASE_DIR / 'prerendered'))
+
+
+def static_paths():
+    return [reverse(name) for name in STATIC_PAGES]
+
+
+def content_paths():
+    """A home e as listas do blog e de eventos."""
+    return [reverse('home'), reverse('blog'), reverse('eventos')]
+
+
+def render_page(client, path, root, secure=False):
+    """Grava ``path`` em ``root``; retorna o arquivo ou uma mensagem de erro."""
+    response = client.get(path, secure=secure)
+    if response.status_code != 200:
+        return None, f'status {response.status_code}'
+    if response.cookies:
+        # ex.: cookie de CSRF: a página tem um formulário que precisa de token válido
+        return None, 'define cookies'
+    target = root / path.strip('/') / 'index.html'
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(response.content)
+    compress_file(str(target))
+    return target, None
+
+
+class PrerenderedPageFinder(StaticFileFinder):
+    """Mapeia ``/caminho/`` para ``PRERENDER_ROOT/caminho/index.html``."""
+
+    cache_control = 'public, max-age=60'
+    revalidate = True
+
+    def __init__(self, root=None, prefix=None):
+        super().__init__(root or output_root(), prefix or '/')
+
+    def find(self, request_path):
+        if not request_path.endswith('/'):
+            return None
+        return super().find(request_path + 'index.html')
+
+
+def _is_personal(cookie_header):
+    cookies = parse_cookie(cookie_header)
+    return any(name in cookies for name in PERSONAL_COOKIES)
+
+
+class PrerenderedPagesMiddleware(StaticFilesMiddleware):
+    """Wrapper WSGI que serve as páginas pré-renderizadas a visitantes anônimos."""
+
+    finder_class = PrerenderedPageFinder
+
+    def find(self, environ):
+        if environ.get('QUERY_STRING') or _is_personal(environ.get('HTTP_COOKIE', '')):
+            return None
+        return super().find(environ)
+
+
+class ASGIPrerenderedPagesMiddleware(ASGIStaticFilesMiddleware):
+    """Versão ASGI de ``PrerenderedPagesMiddleware``."""
+
+    finder_class = PrerenderedPageFinder
+
+    def find(self, scope):
+        if scope['type'] != 'http' or scope.get('query_string'):
+            return None
+        cookie = dict(scope['headers']).get(b'cookie', b'').decode('latin-1')
+        if _is_personal(cookie):
+            return None
+        return super().find(scope)
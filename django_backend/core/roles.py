@@ -0,0 +1,82 @@
+"""Papel (admin/leitor) do usuário da requisição.
+
+``ProfileModelBackend`` carrega o ``UserProfile`` junto com o usuário da
+sessão, em uma única consulta. ``user_role`` lê o papel desse perfil já
+carregado; quando o usuário veio de outro lugar (``authenticate()`` no
+login, por exemplo), consulta o cache e só então o banco. O papel fica
+memorizado no próprio ``request.user``, que vive apenas durante a
+requisição, e no cache entre requisições, de onde o handler
+``invalidate_user_role`` em ``core.signals`` o remove sempre que um perfil
+é salvo (inclusive via ``save_user_profile``) ou excluído.
+"""
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from .models import UserProfile
+
+ADMIN = 'admin'
+
+# Rede de segurança para escritas que não disparam signals (ex.: update())
+CACHE_TIMEOUT = 300
+
+# Guardado no cache para usuários sem perfil
+NO_PROFILE = ''
+
+_MISSING = object()
+
+
+def _cache_key(user_id):
+    return f'role:{user_id}'
+
+
+def _loaded_role(user):
+    """Papel do perfil carregado junto com ``user``, ou _MISSING."""
+    descriptor = User.userprofile
+    if not descriptor.is_cached(user):
+        return _MISSING
+    profile = descriptor.related.get_cached_value(user)
+    return profile.role if profile is not None else NO_PROFILE
+
+
+def user_role(user):
+    """Papel de ``user``, ou None se for anônimo ou não tiver perfil."""
+    if not user.is_authenticated:
+        return None
+    role = getattr(user, '_role', _MISSING)
+    if role is _MISSING:
+        role = _loaded_role(user)
+    if role is _MISSING:
+        role = cache.get(_cache_key(user.pk))
+        if role is None:
+            role = UserProfile.objects.filter(user_id=user.pk).values_list('role', flat=True).first()
+            role = NO_PROFILE if role is None else role
+            cache.set(_cache_key(user.pk), role, CACHE_TIMEOUT)
+    user._role = role
+    return role or None
+
+
+def is_admin(user):
+    return user_role(user) == ADMIN
+
+
+def invalidate(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+class ProfileModelBackend(ModelBackend):
+    """``ModelBackend`` que traz o ``UserProfile`` na mesma consulta do usuário"""
+
+    def get_user(self, user_id):
+        try:
+            user = User._default_manager.select_related('userprofile').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        try:
+            user = await User._default_manager.select_related('userprofile').aget(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,320 @@
+"""Busca textual completa para posts e eventos.
+
+O mecanismo acompanha o banco (veja ``backend``):
+
+* SQLite: cada modelo pesquisável tem uma tabela FTS5 chamada
+  ``<db_table>_fts``, cujo rowid é a chave primária do objeto. As tabelas
+  usam o tokenizador ``unicode61`` com ``remove_diacritics 2``, então
+  "educacao" encontra "Educação". As tabelas são criadas no
+  ``post_migrate`` e mantidas em sincronia pelos handlers de
+  ``post_save``/``post_delete`` em ``core.signals``;
+  ``manage.py rebuild_search_index`` reconstrói o índice.
+* PostgreSQL: um ``tsvector`` com pesos sobre as colunas do próprio modelo,
+  com a configuração ``portuguese`` (radicais e stop words), atendido por
+  um índice GIN de expressão criado no ``post_migrate``. Um índice não
+  pode fazer join com ``auth_user``, então o nome do autor entra pela
+  cópia ``Post.author_name``. O nome do índice traz um hash da expressão:
+  quando ela muda, o ``post_migrate`` cria o novo índice e remove o
+  antigo. O próprio PostgreSQL mantém o índice, então não há nada a
+  sincronizar.
+
+``search_queryset`` é o ponto de entrada único usado pelas views e pela API:
+restringe o queryset aos resultados, ordena por relevância e anota
+``search_rank`` e ``search_snippet``. Em outros bancos usa buscas
+``icontains`` nos mesmos campos.
+"""
+import hashlib
+import re
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import add, or_
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import OperationalError, connection
+from django.db.models import F, Q
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .models import Post, Event
+
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 24
+
+# Configuração de busca textual do PostgreSQL para documentos e consultas
+SEARCH_CONFIG = 'portuguese'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# alias -> se a biblioteca SQLite tem FTS5, verificado uma vez por processo
+_fts5 = {}
+
+
+@dataclass
+class SearchSpec:
+    """Como um modelo é indexado: valores das colunas e buscas alternativas"""
+    model: type
+    title: callable
+    body: callable
+    author: callable
+    lookups: list = field(default_factory=list)
+    # Pesos do bm25 para as colunas título, corpo e autor
+    weights: tuple = (10.0, 1.0, 3.0)
+    # PostgreSQL: ((campos, peso), ...) que formam o tsvector do índice GIN,
+    # e o campo de onde saem os trechos
+    vector: tuple = ()
+    headline: str = ''
+
+    @property
+    def table(self):
+        return f'{self.model._meta.db_table}_fts'
+
+    @property
+    def index_prefix(self):
+        return f'{self.model._meta.db_table}_search_'
+
+    @property
+    def index_name(self):
+        # Muda junto com a expressão, para que um índice antigo não passe por atual
+        digest = hashlib.md5(repr((self.vector, SEARCH_CONFIG)).encode()).hexdigest()[:8]
+        return f'{self.index_prefix}{digest}'
+
+    def document(self, obj):
+        return (self.title(obj), self.body(obj), self.author(obj))
+
+    def search_vector(self):
+        return reduce(add, (
+            SearchVector(*fields, weight=weight, config=SEARCH_CONFIG) for fields, weight in self.vector
+        ))
+
+
+def _join(*values):
+    return ' '.join(strip_tags(value) for value in values if value)
+
+
+REGISTRY = {
+    Post: SearchSpec(
+        model=Post,
+        title=lambda post: post.title,
+        body=lambda post: _join(post.excerpt, post.content),
+        author=lambda post: _join(post.author.get_full_name(), post.author.username),
+        lookups=['title', 'excerpt', 'content', 'author__first_name', 'author__last_name'],
+        vector=((('title',), 'A'), (('excerpt', 'content'), 'B'), (('author_name',), 'C')),
+        headline='content',
+    ),
+    Event: SearchSpec(
+        model=Event,
+        title=lambda event: event.title,
+        body=lambda event: _join(event.description, event.location),
+        author=lambda event: _join(event.organizer, event.speakers),
+        lookups=['title', 'description', 'organizer'],
+        vector=((('title',), 'A'), (('description', 'location'), 'B'), (('organizer', 'speakers'), 'C')),
+        headline='description',
+    ),
+}
+
+
+def backend():
+    """O mecanismo de busca do banco atual: 'fts5', 'postgres' ou None."""
+    if connection.vendor == 'sqlite':
+        return 'fts5' if _has_fts5() else None
+    return {'postgresql': 'postgres'}.get(connection.vendor)
+
+
+def _has_fts5():
+    # fts5() só existe quando o módulo foi compilado ou carregado; builds do
+    # SQLite sem ele usam icontains
+    if connection.alias not in _fts5:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT fts5(NULL)')
+            _fts5[connection.alias] = True
+        except OperationalError:
+            _fts5[connection.alias] = False
+    return _fts5[connection.alias]
+
+
+def is_available():
+    """Se as tabelas FTS5 estão em uso e precisam ser mantidas em sincronia."""
+    return backend() == 'fts5'
+
+
+def has_terms(text):
+    """Se ``text`` tem alguma palavra a buscar."""
+    return bool(_TOKEN_RE.search(text or ''))
+
+
+def build_match_query(text):
+    """Converte texto livre numa consulta FTS5: cada palavra vale como prefixo."""
+    tokens = _TOKEN_RE.findall(text or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def ensure_index():
+    """Cria as tabelas FTS que ainda não existem; retorna os modelos criados."""
+    if backend() == 'postgres':
+        _ensure_postgres_index()
+        return []
+    if not is_available():
+        return []
+    created = []
+    existing = set(connection.introspection.table_names())
+    with connection.cursor() as cursor:
+        for model, spec in REGISTRY.items():
+            if spec.table in existing:
+                continue
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {spec.table} USING fts5("
+                f"title, body, author, tokenize='unicode61 remove_diacritics 2')"
+            )
+            created.append(model)
+    return created
+
+
+def _ensure_postgres_index():
+    # Sem migrações neste projeto, os índices GIN são criados aqui, e os de
+    # uma expressão anterior são removidos
+    with connection.cursor() as cursor, connection.schema_editor() as schema_editor:
+        for model, spec in REGISTRY.items():
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+            if spec.index_name not in constraints:
+                schema_editor.add_index(model, GinIndex(spec.search_vector(), name=spec.index_name))
+            for name in constraints:
+                if name.startswith(spec.index_prefix) and name != spec.index_name:
+                    # Para remover, só o nome do índice importa
+                    schema_editor.remove_index(model, GinIndex(spec.search_vector(), name=name))
+
+
+def index_object(obj):
+    spec = REGISTRY.get(type(obj))
+    if spec is None or not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {spec.table} WHERE rowid = %s', [obj.pk])
+        cursor.execute(
+            f'INSERT INTO {spec.table} (rowid, title, body, author) VALUES (%s, %s, %s, %s)',
+            [obj.pk, *spec.document(obj)],
+        )
+
+
+def remove_object(obj):
+    spec = REGISTRY.get(type(obj))
+    if spec is None or not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {spec.table} WHERE rowid = %s', [obj.pk])
+
+
+def index_author(user):
+    """Atualiza as linhas do índice dos posts de ``user``, ex.: após mudar o nome."""
+    if not is_available():
+        return 0
+    spec = REGISTRY[Post]
+    rows = [
+        [post.pk, *spec.document(post)]
+        for post in Post.objects.filter(author=user).select_related('author')
+    ]
+    if not rows:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {spec.table} WHERE rowid = %s', [[row[0]] for row in rows])
+        return _insert_batch(cursor, spec, rows)
+
+
+def rebuild_index(model=None, batch_size=500):
+    """Recria as linhas do índice de ``model`` (ou de todos os modelos)."""
+    if not is_available():
+        return 0
+    specs = [REGISTRY[model]] if model else REGISTRY.values()
+    total = 0
+    for spec in specs:
+        queryset = spec.model.objects.order_by('pk')
+        if spec.model is Post:
+            queryset = queryset.select_related('author')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {spec.table}')
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                batch.append([obj.pk, *spec.document(obj)])
+                if len(batch) >= batch_size:
+                    total += _insert_batch(cursor, spec, batch)
+                    batch = []
+            total += _insert_batch(cursor, spec, batch)
+    return total
+
+
+def _insert_batch(cursor, spec, rows):
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO {spec.table} (rowid, title, body, author) VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+    return len(rows)
+
+
+def build_tsquery(text):
+    """Converte texto livre numa tsquery do PostgreSQL: cada palavra vale como prefixo."""
+    tokens = _TOKEN_RE.findall(text or '')
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def search_queryset(queryset, text):
+    """Restringe ``queryset`` aos objetos que casam com ``text``, melhores primeiro.
+
+    Os objetos recebem ``search_rank`` (menor é melhor) e ``search_snippet``
+    (trecho bruto, que deve ser exibido com ``highlight``).
+    """
+    spec = REGISTRY[queryset.model]
+    match = build_match_query(text)
+    if not match:
+        return queryset
+
+    engine = backend()
+    if engine == 'postgres':
+        return _postgres_queryset(queryset, spec, text)
+    if engine is None:
+        condition = reduce(or_, (Q(**{f'{lookup}__icontains': text}) for lookup in spec.lookups))
+        return queryset.filter(condition)
+
+    table = spec.table
+    model_table = queryset.model._meta.db_table
+    weights = ', '.join(str(weight) for weight in spec.weights)
+    return queryset.extra(
+        tables=[table],
+        where=[f'{table}.rowid = {model_table}.id', f'{table} MATCH %s'],
+        params=[match],
+        select={
+            'search_rank': f'bm25({table}, {weights})',
+            'search_snippet': (
+                f"snippet({table}, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', {SNIPPET_TOKENS})"
+            ),
+        },
+    ).order_by('search_rank')
+
+
+def _postgres_queryset(queryset, spec, text):
+    # Filtrar pelo alias coloca a própria expressão indexada no WHERE, e é
+    # isso que permite ao planejador usar o índice GIN
+    query = SearchQuery(build_tsquery(text), config=SEARCH_CONFIG, search_type='raw')
+    return queryset.alias(
+        search_document=spec.search_vector(),
+    ).filter(
+        search_document=query,
+    ).annotate(
+        search_rank=-SearchRank(F('search_document'), query),
+        search_snippet=SearchHeadline(
+            spec.headline, query, config=SEARCH_CONFIG,
+            start_sel=SNIPPET_START, stop_sel=SNIPPET_END,
+            max_words=SNIPPET_TOKENS, min_words=SNIPPET_TOKENS // 2, max_fragments=1,
+        ),
+    ).order_by('search_rank')
+
+
+def highlight(snippet):
+    """Escapa um trecho bruto e envolve os termos encontrados em ``<mark>``."""
+    if not snippet:
+        return ''
+    # Os trechos do PostgreSQL vêm do HTML armazenado, não do texto limpo
+    html = escape(strip_tags(snippet)).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+    return mark_safe(html)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from .images import FORMATS, variants_for
 from .models import Post, Event, Category, Tag, ContactMessage, UserProfile
+from .search import highlight
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -21,34 +23,78 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 
+class ResponsiveImageField(serializers.ReadOnlyField):
+    """Imagem com srcset WebP/JPEG a partir de ``image_derivatives``"""
+    
+    def __init__(self, variant='detail', **kwargs):
+        self.variant = variant
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+    
+    def to_representation(self, obj):
+        if not obj.image:
+            return None
+        request = self.context.get('request')
+        absolute = request.build_absolute_uri if request else str
+        variants = variants_for(obj, self.variant)
+        if not variants:
+            return {'src': absolute(obj.image.url), 'width': None, 'height': None, 'srcset': {}}
+        
+        storage = obj.image.storage
+        largest = variants[-1]
+        return {
+            'src': absolute(storage.url(largest['jpeg'])),
+            'width': largest['width'],
+            'height': largest['height'],
+            'srcset': {
+                key: ', '.join(
+                    f"{absolute(storage.url(variant[key]))} {variant['width']}w" for variant in variants
+                )
+                for key in FORMATS
+            },
+        }
+
+
 class PostSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     is_published = serializers.ReadOnlyField()
+    image_variants = ResponsiveImageField()
     
     class Meta:
         model = Post
         fields = [
             'id', 'title', 'slug', 'content', 'excerpt', 'author', 
-            'image', 'status', 'publication_date', 'created_at', 
+            'image', 'image_variants', 'status', 'publication_date', 'created_at', 
             'updated_at', 'category', 'tags', 'views', 'featured', 
             'is_published'
         ]
         read_only_fields = ['slug', 'views', 'created_at', 'updated_at']
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class SearchSnippetMixin(serializers.Serializer):
+    """Inclui o trecho destacado quando a listagem vem de uma busca"""
+    search_snippet = serializers.SerializerMethodField()
+    
+    def get_search_snippet(self, obj):
+        snippet = getattr(obj, 'search_snippet', None)
+        return str(highlight(snippet)) if snippet else None
+
+
+class PostListSerializer(SearchSnippetMixin, serializers.ModelSerializer):
     """Serializer simplificado para listagem de posts"""
     author = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
+    image_variants = ResponsiveImageField(variant='card')
     
     class Meta:
         model = Post
         fields = [
-            'id', 'title', 'slug', 'excerpt', 'author', 'image', 
-            'publication_date', 'category', 'tags', 'views', 'featured'
+            'id', 'title', 'slug', 'excerpt', 'author', 'image', 'image_variants',
+            'publication_date', 'category', 'tags', 'views', 'featured',
+            'search_snippet'
         ]
 
 
@@ -57,13 +103,14 @@ class EventSerializer(serializers.ModelSerializer):
     is_upcoming = serializers.ReadOnlyField()
     is_public_and_upcoming = serializers.ReadOnlyField()
     speakers_list = serializers.ReadOnlyField()
+    image_variants = ResponsiveImageField()
     
     class Meta:
         model = Event
         fields = [
             'id', 'title', 'slug', 'description', 'start_date', 'end_date',
             'location', 'visibility', 'event_type', 'capacity', 'registered',
-            'organizer', 'speakers', 'speakers_list', 'tags', 'image', 'status',
+            'organizer', 'speakers', 'speakers_list', 'tags', 'image', 'image_variants', 'status',
             'featured', 'registration_required', 'price', 'created_at',
             'updated_at', 'is_upcoming', 'is_public_and_upcoming'
         ]
@@ -79,16 +126,17 @@ class EventSerializer(serializers.ModelSerializer):
         return data
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(SearchSnippetMixin, serializers.ModelSerializer):
     """Serializer simplificado para listagem de eventos"""
     tags = TagSerializer(many=True, read_only=True)
+    image_variants = ResponsiveImageField(variant='card')
     
     class Meta:
         model = Event
         fields = [
             'id', 'title', 'slug', 'description', 'start_date', 'end_date',
-            'location', 'event_type', 'organizer', 'tags', 'image', 
-            'featured', 'price'
+            'location', 'event_type', 'organizer', 'tags', 'image', 'image_variants',
+            'featured', 'price', 'search_snippet'
         ]
 
 
@@ -1,7 +1,14 @@
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from . import content_cache, dashboard, images, roles, search
+from .models import UserProfile, Post, Event, Category, Tag, ContactMessage, author_search_name
+
+# Campos do usuário que entram no índice de busca dos seus posts
+AUTHOR_FIELDS = {'first_name', 'last_name', 'username'}
 
 
 @receiver(post_save, sender=User)
@@ -13,3 +20,76 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.userprofile.save()
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_user_role(sender, instance, raw=False, **kwargs):
+    # save_user_profile passa por aqui a cada User.save(); após o commit,
+    # para que nenhuma requisição guarde o papel antigo de novo
+    if not raw:
+        transaction.on_commit(partial(roles.invalidate, instance.user_id))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Event)
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    if not raw:
+        images.schedule_derivatives(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Event)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_object(instance)
+
+
+@receiver(post_save, sender=User)
+def reindex_author_posts(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Usuários novos não têm posts; gravações que não mexem no nome
+    # (last_login a cada login) não alteram o índice
+    if raw or created or (update_fields is not None and not AUTHOR_FIELDS & set(update_fields)):
+        return
+    Post.objects.filter(author=instance).update(author_name=author_search_name(instance))
+    search.index_author(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Event)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+@receiver(post_migrate)
+def create_search_index(sender, **kwargs):
+    if sender.name != 'core':
+        return
+    for model in search.ensure_index():
+        search.rebuild_index(model)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=ContactMessage)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=ContactMessage)
+def invalidate_dashboard_stats(sender, **kwargs):
+    dashboard.invalidate_stats()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+def bump_content_generation(sender, raw=False, **kwargs):
+    # Após o commit, para que nenhuma requisição guarde as linhas antigas na nova geração
+    if not raw:
+        transaction.on_commit(content_cache.bump)
@@ -0,0 +1,298 @@
+"""
+Arquivos estáticos pré-comprimidos com cache de longa duração.
+
+``CompressedManifestStaticFilesStorage`` grava cópias ``.gz`` e ``.br`` ao
+lado de cada asset de texto versionado durante o ``collectstatic``, então a
+compressão acontece uma vez por deploy e não a cada requisição. A saída
+Brotli depende do pacote opcional ``brotli``; sem ele só o gzip é gerado.
+
+``StaticFilesMiddleware`` (WSGI) e ``ASGIStaticFilesMiddleware`` servem
+``STATIC_URL`` direto de ``STATIC_ROOT`` antes do Django: escolhem a melhor
+codificação aceita pelo cliente, entregam o arquivo aberto ao
+``wsgi.file_wrapper`` (que o gunicorn transforma em ``sendfile()``) ou, no
+ASGI, o enviam em blocos lidos fora do event loop, e marcam nomes
+versionados como imutáveis. Toda resposta leva ETag e Last-Modified, e
+requisições condicionais recebem 304 (ou 412) pelo
+``get_conditional_response`` do Django antes de o arquivo ser aberto.
+Deploys pequenos dispensam um servidor web separado para os assets.
+Caminhos não coletados seguem para o Django.
+"""
+import gzip
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from http import HTTPStatus
+from wsgiref.util import FileWrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.cache import get_conditional_response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.ico'}
+
+# (sufixo, Content-Encoding) em ordem de preferência
+ENCODINGS = [('.br', 'br'), ('.gz', 'gzip')]
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=3600'
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+CHUNK_SIZE = 64 * 1024
+
+# Cabeçalhos da resposta completa que o 304 repete
+NOT_MODIFIED_HEADERS = {'ETag', 'Last-Modified', 'Cache-Control', 'Vary'}
+
+
+def compress_file(path):
+    """Grava ``path.gz`` (e ``path.br``) quando ficam menores que ``path``."""
+    with open(path, 'rb') as source:
+        data = source.read()
+
+    written = []
+    candidates = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.append(('.br', lambda: brotli.compress(data, quality=11)))
+    for suffix, compress in candidates:
+        compressed = compress()
+        # Não compensa passar pelo decodificador
+        if len(compressed) >= len(data) * 0.95:
+            continue
+        with open(path + suffix, 'wb') as target:
+            target.write(compressed)
+        written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Storage com manifesto que também grava cópias pré-comprimidas dos arquivos versionados."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if os.path.splitext(hashed_name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                compress_file(self.path(hashed_name))
+
+
+def file_signature(path):
+    """``(mtime, tamanho)`` de ``path`` e de cada cópia codificada; None quando ausente."""
+    stat = os.stat(path)
+    signature = [(stat.st_mtime_ns, stat.st_size)]
+    for suffix, _ in ENCODINGS:
+        try:
+            stat = os.stat(path + suffix)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def make_etag(mtime_ns, size):
+    return f'"{mtime_ns:x}-{size:x}"'
+
+
+class ConditionalRequest:
+    """As partes de ``HttpRequest`` que o ``get_conditional_response`` lê."""
+
+    def __init__(self, method, path, meta):
+        self.method = method
+        self.path = path
+        self.META = meta
+
+
+class StaticFile:
+    """Um arquivo coletado e as variantes codificadas disponíveis para ele."""
+
+    def __init__(self, path, url_path, cache_control=None):
+        self.path = path
+        self.signature = file_signature(path)
+        mtime_ns, size = self.signature[0]
+        self.last_modified = mtime_ns // 10**9
+        content_type, _ = mimetypes.guess_type(path)
+        if content_type and (content_type.startswith('text/') or content_type in ('application/javascript', 'application/json', 'image/svg+xml')):
+            content_type += '; charset=utf-8'
+        self.headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Last-Modified', formatdate(mtime_ns / 1e9, usegmt=True)),
+            ('Cache-Control', cache_control or (
+                IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(url_path) else DEFAULT_CACHE_CONTROL
+            )),
+        ]
+        # Cada codificação é uma representação própria, com seu próprio ETag
+        self.variants = [(None, path, size, make_etag(mtime_ns, size))]
+        for (suffix, encoding), sibling in zip(ENCODINGS, self.signature[1:]):
+            if sibling is not None:
+                self.variants.insert(-1, (encoding, path + suffix, sibling[1], make_etag(*sibling)))
+        if len(self.variants) > 1:
+            self.headers.append(('Vary', 'Accept-Encoding'))
+
+    def is_stale(self):
+        """Verdadeiro quando o arquivo ou uma de suas cópias codificadas mudou desde a leitura."""
+        try:
+            return file_signature(self.path) != self.signature
+        except FileNotFoundError:
+            return True
+
+    def select(self, accept_encoding):
+        """Retorna ``(path, headers, etag)`` da melhor variante aceita pelo cliente."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, path, size, etag in self.variants:
+            if encoding is None or encoding in accepted:
+                headers = self.headers + [('ETag', etag), ('Content-Length', str(size))]
+                if encoding:
+                    headers.append(('Content-Encoding', encoding))
+                return path, headers, etag
+
+    def precondition(self, request, etag, headers):
+        """``(status, headers)`` de uma resposta 304 ou 412, ou None para enviar o arquivo."""
+        response = get_conditional_response(request, etag=etag, last_modified=self.last_modified)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return 304, [(name, value) for name, value in headers if name in NOT_MODIFIED_HEADERS]
+        return response.status_code, [('Content-Length', '0')]
+
+
+def parse_accept_encoding(header):
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q=') and quality[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFileFinder:
+    """Mapeia caminhos sob ``STATIC_URL`` para arquivos em ``STATIC_ROOT``."""
+
+    cache_control = None
+    # Refaz o stat dos arquivos em cache antes de servi-los, para raízes
+    # regravadas com o processo no ar (páginas pré-renderizadas)
+    revalidate = False
+
+    def __init__(self, root=None, prefix=None):
+        self.root = os.path.realpath(root or settings.STATIC_ROOT)
+        self.prefix = prefix or settings.STATIC_URL
+        if not self.prefix.startswith('/'):
+            self.prefix = '/' + self.prefix
+        # Os arquivos coletados só mudam no deploy; os acertos valem pela vida
+        # do processo. Falhas e grafias não canônicas de um caminho não são
+        # guardadas, então o cache nunca passa do número de arquivos em root.
+        self.files = {}
+
+    def find(self, request_path):
+        if not request_path.startswith(self.prefix):
+            return None
+        found = self.files.get(request_path)
+        if found is not None and not (self.revalidate and found.is_stale()):
+            return found
+        self.files.pop(request_path, None)
+
+        relative = request_path[len(self.prefix):]
+        joined = os.path.join(self.root, relative)
+        path = os.path.realpath(joined)
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path) or path.endswith(('.gz', '.br')):
+            return None
+        found = StaticFile(path, relative, self.cache_control)
+        if os.path.normpath(joined) == joined:
+            self.files[request_path] = found
+        return found
+
+
+class StaticFilesMiddleware:
+    """Wrapper WSGI que serve os estáticos coletados antes de a requisição chegar ao Django."""
+
+    finder_class = StaticFileFinder
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.finder = self.finder_class(root, prefix)
+
+    def find(self, environ):
+        if environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+            return None
+        return self.finder.find(environ.get('PATH_INFO', ''))
+
+    def __call__(self, environ, start_response):
+        method = environ.get('REQUEST_METHOD')
+        static_file = self.find(environ)
+        if static_file is None:
+            return self.application(environ, start_response)
+
+        path, headers, etag = static_file.select(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        request = ConditionalRequest(method, environ.get('PATH_INFO', ''), environ)
+        answer = static_file.precondition(request, etag, headers)
+        if answer is not None:
+            status, headers = answer
+            start_response(f'{status} {HTTPStatus(status).phrase}', headers)
+            return []
+        start_response('200 OK', headers)
+        if method == 'HEAD':
+            return []
+        # Servidores como o gunicorn transformam wsgi.file_wrapper em os.sendfile()
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(path, 'rb'), CHUNK_SIZE)
+
+
+class ASGIStaticFilesMiddleware:
+    """Versão ASGI de ``StaticFilesMiddleware``."""
+
+    finder_class = StaticFileFinder
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.finder = self.finder_class(root, prefix)
+
+    def find(self, scope):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            return None
+        return self.finder.find(scope['path'])
+
+    async def __call__(self, scope, receive, send):
+        static_file = self.find(scope)
+        if static_file is None:
+            return await self.application(scope, receive, send)
+
+        meta = {
+            'HTTP_' + name.decode('latin-1').upper().replace('-', '_'): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        path, headers, etag = static_file.select(meta.get('HTTP_ACCEPT_ENCODING', ''))
+        status = 200
+        answer = static_file.precondition(ConditionalRequest(scope['method'], scope['path'], meta), etag, headers)
+        if answer is not None:
+            status, headers = answer
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        if answer is not None or scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        with open(path, 'rb') as file:
+            read = sync_to_async(file.read, thread_sensitive=False)
+            while True:
+                chunk = await read(CHUNK_SIZE)
+                more = len(chunk) == CHUNK_SIZE
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more})
+                if not more:
+                    break
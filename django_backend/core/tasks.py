@@ -0,0 +1,103 @@
+"""
+Tarefas em segundo plano guardadas no banco.
+
+``enqueue`` grava uma linha ``Task`` dentro da transação de quem chama, então
+a tarefa só fica visível quando a requisição que a criou é confirmada.
+``manage.py run_worker`` reserva as linhas pendentes com um UPDATE
+condicional (seguro com vários workers) e as executa em um pool de
+processos. Falhas são repetidas com espera exponencial até
+``max_attempts``. Uma tarefa cujo worker morreu volta para a fila depois de
+``TASK_LOCK_TIMEOUT`` segundos.
+
+Só funções decoradas com ``@task`` podem ser enfileiradas. Elas recebem
+argumentos serializáveis em JSON e precisam ser importáveis pelo caminho.
+"""
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+
+def task(func):
+    """Marca ``func`` como executável pelo worker"""
+    func.task_name = f'{func.__module__}.{func.__name__}'
+    return func
+
+
+def enqueue(func, *args, max_attempts=3, unique=False, **kwargs):
+    """
+    Enfileira ``func(*args, **kwargs)``.
+
+    Com ``unique`` uma tarefa idêntica ainda pendente é reaproveitada. Com
+    ``TASKS_EAGER`` a tarefa roda no próprio processo após o commit.
+    """
+    if not hasattr(func, 'task_name'):
+        raise ValueError(f'{func!r} não está decorada com @task')
+    if getattr(settings, 'TASKS_EAGER', False):
+        transaction.on_commit(lambda: func(*args, **kwargs))
+        return None
+    if unique:
+        pending = Task.objects.filter(
+            name=func.task_name, args=list(args), kwargs=kwargs, status='pending'
+        ).first()
+        if pending is not None:
+            return pending
+    return Task.objects.create(
+        name=func.task_name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+    )
+
+
+def _claimable(now):
+    stale = now - timedelta(seconds=getattr(settings, 'TASK_LOCK_TIMEOUT', 600))
+    return Q(status='pending', run_after__lte=now) | Q(status='running', locked_at__lt=stale)
+
+
+def claim_next():
+    """Reserva atomicamente a próxima tarefa executável, ou retorna None."""
+    now = timezone.now()
+    candidates = Task.objects.filter(_claimable(now)).order_by('run_after', 'id').values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        claimed = Task.objects.filter(_claimable(now), pk=pk).update(
+            status='running',
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def execute(name, args, kwargs):
+    """Ponto de entrada dentro dos processos do worker."""
+    func = import_string(name)
+    if not hasattr(func, 'task_name'):
+        raise ValueError(f'{name} não é uma tarefa')
+    func(*args, **kwargs)
+
+
+def mark_done(task_obj):
+    Task.objects.filter(pk=task_obj.pk).update(status='done', locked_at=None, last_error='')
+
+
+def mark_failed(task_obj, error):
+    message = ''.join(traceback.format_exception(error))
+    if task_obj.attempts >= task_obj.max_attempts:
+        Task.objects.filter(pk=task_obj.pk).update(status='failed', locked_at=None, last_error=message)
+        return False
+    delay = getattr(settings, 'TASK_RETRY_DELAY', 30) * 2 ** (task_obj.attempts - 1)
+    Task.objects.filter(pk=task_obj.pk).update(
+        status='pending',
+        locked_at=None,
+        last_error=message,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    return True
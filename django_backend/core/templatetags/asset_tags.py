@@ -0,0 +1,21 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from core import assets
+
+register = template.Library()
+
+
+@register.simple_tag
+def tailwind_stylesheet():
+    """
+    Aponta para o bundle Tailwind pré-compilado.
+
+    Em DEBUG, antes de rodar ``manage.py build_css``, recorre ao compilador no
+    navegador para que um checkout novo ainda renderize as páginas estilizadas.
+    """
+    if settings.DEBUG and not assets.bundle_available():
+        return format_html('<script src="https://cdn.tailwindcss.com"></script>')
+    return format_html('<link rel="stylesheet" href="{}" />', static(assets.BUNDLE))
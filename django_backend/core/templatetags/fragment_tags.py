@@ -0,0 +1,63 @@
+"""
+Cache de fragmentos indexado pelos objetos que o fragmento mostra.
+
+    {% load fragment_tags %}
+    {% fragment "post_card" post post.views %}...{% endfragment %}
+
+Cada argumento extra varia a chave. Instâncias de modelo contribuem com o
+pk e o ``updated_at``, então o fragmento é refeito exatamente quando o
+objeto exibido é salvo; qualquer outro valor contribui com seu texto. As
+entradas duram ``FRAGMENT_CACHE_TIMEOUT`` segundos; 0 desativa o cache, o
+padrão com DEBUG para que edições de template apareçam na hora.
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+register = template.Library()
+
+
+def _key_part(value):
+    if isinstance(value, Model):
+        updated_at = getattr(value, 'updated_at', None)
+        stamp = updated_at.timestamp() if updated_at else ''
+        return f'{value._meta.label}.{value.pk}@{stamp}'
+    return str(value)
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 0 if settings.DEBUG else 3600)
+        if not timeout:
+            return self.nodelist.render(context)
+
+        parts = [_key_part(var.resolve(context)) for var in self.vary_on]
+        digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+        key = f'fragment:{self.name.resolve(context)}:{digest}'
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, timeout)
+        return content
+
+
+@register.tag
+def fragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"A tag '{bits[0]}' exige o nome do fragmento")
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
@@ -0,0 +1,11 @@
+from django import template
+
+from core.search import highlight as highlight_snippet
+
+register = template.Library()
+
+
+@register.filter
+def highlight(snippet):
+    """Exibe um trecho da busca com os termos encontrados em <mark>"""
+    return highlight_snippet(snippet)
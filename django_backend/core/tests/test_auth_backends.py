@@ -0,0 +1,23 @@
+from unittest import mock
+
+from django.contrib.auth import BACKEND_SESSION_KEY, authenticate
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+
+class AuthenticationBackendTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='leitora', password='senha-certa')
+
+    def test_failed_login_checks_the_password_once(self):
+        with mock.patch.object(User, 'check_password', autospec=True, return_value=False) as check:
+            self.assertIsNone(authenticate(username='leitora', password='senha-errada'))
+        self.assertEqual(check.call_count, 1)
+
+    def test_session_from_model_backend_stays_logged_in(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get('/')
+        self.assertEqual(response.wsgi_request.user, self.user)
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'core.roles.ProfileModelBackend')
@@ -0,0 +1,87 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from core import search
+from core.models import Category, Event, Post
+
+# Improvável em outro texto, então só os posts abaixo casam com ele
+TOKEN = 'Aqualtune'
+
+
+@skipUnless(connection.vendor == 'postgresql', 'busca textual do PostgreSQL')
+class PostgresSearchTests(TestCase):
+    """O tsvector com pesos ordena título, corpo e autor, e os índices GIN do ensure_index se aplicam"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Educação', slug='educacao')
+        cls.writer = User.objects.create_user(username='autora', first_name='Maria', last_name='Firmina')
+        by_author = User.objects.create_user(username='por-autoria', first_name='Luiza', last_name=TOKEN)
+
+        def post(slug, author, title='Sem relação', content='Texto qualquer.'):
+            return Post.objects.create(
+                title=title, slug=slug, content=content, author=author,
+                category=category, status='published',
+            )
+
+        cls.title_match = post('titulo', cls.writer, title=f'{TOKEN} e a resistência')
+        cls.body_match = post('corpo', cls.writer, content=f'A história de {TOKEN} no Brasil.')
+        cls.author_match = post('autoria', by_author)
+        now = timezone.now()
+        Event.objects.create(
+            title='Roda de conversa sobre educação', slug='roda', description='Encontro aberto.',
+            start_date=now, end_date=now + timezone.timedelta(hours=2), location='Auditório', organizer='NEABI',
+        )
+
+    def search(self, text):
+        return list(search.search_queryset(Post.objects.all(), text))
+
+    def search_indexes(self, model):
+        spec = search.REGISTRY[model]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return {name: info['type'] for name, info in constraints.items() if name.startswith(spec.index_prefix)}
+
+    def test_title_ranks_above_body_and_author(self):
+        self.assertEqual(self.search(TOKEN), [self.title_match, self.body_match, self.author_match])
+        ranks = [post.search_rank for post in self.search(TOKEN)]
+        self.assertEqual(len(set(ranks)), 3)
+
+    def test_author_name_follows_a_rename(self):
+        self.assertEqual(self.search('Benguela'), [])
+        self.writer.last_name = 'Benguela'
+        self.writer.save(update_fields=['last_name'])
+        self.assertEqual({post.slug for post in self.search('Benguela')}, {'titulo', 'corpo'})
+
+    def test_ensure_index_is_idempotent(self):
+        search.ensure_index()
+        for model, spec in search.REGISTRY.items():
+            self.assertEqual(self.search_indexes(model), {spec.index_name: 'gin'})
+
+    def test_ensure_index_replaces_a_stale_index(self):
+        spec = search.REGISTRY[Post]
+        stale = GinIndex(SearchVector('title', config=search.SEARCH_CONFIG), name=f'{spec.index_prefix}antigo')
+        # Checagens de FK adiadas dos inserts acima impedem DDL na mesma transação
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        with connection.schema_editor() as schema_editor:
+            schema_editor.remove_index(Post, GinIndex(spec.search_vector(), name=spec.index_name))
+            schema_editor.add_index(Post, stale)
+
+        search.ensure_index()
+        self.assertEqual(self.search_indexes(Post), {spec.index_name: 'gin'})
+
+    def test_queries_use_the_gin_indexes(self):
+        for model, spec in search.REGISTRY.items():
+            # Poucas linhas saem mais baratas numa varredura; proibi-la mostra se o índice se aplica
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                plan = search.search_queryset(model.objects.all(), 'educação').explain()
+            self.assertIn(spec.index_name, plan, model.__name__)
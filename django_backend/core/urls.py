@@ -1,14 +1,18 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Sob ASGI, as páginas mais lidas usam as versões assíncronas
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', read_views.home, name='home'),
     path('sobre/', views.sobre, name='sobre'),
     path('projetos/', views.projetos, name='projetos'),
     path('projetos/semana-consciencia-negra/', views.semana_consciencia_negra, name='semana_consciencia_negra'),
-    path('blog/', views.PostListView.as_view(), name='blog'),
-    path('blog/<slug:slug>/', views.PostDetailView.as_view(), name='post_detail'),
-    path('eventos/', views.EventListView.as_view(), name='eventos'),
-    path('eventos/<slug:slug>/', views.EventDetailView.as_view(), name='event_detail'),
+    path('blog/', read_views.PostListView.as_view(), name='blog'),
+    path('blog/<slug:slug>/', read_views.PostDetailView.as_view(), name='post_detail'),
+    path('eventos/', read_views.EventListView.as_view(), name='eventos'),
+    path('eventos/<slug:slug>/', read_views.EventDetailView.as_view(), name='event_detail'),
     path('contato/', views.contato, name='contato'),
 ]
@@ -0,0 +1,162 @@
+"""Contador de visualizações com buffer para os posts.
+
+As views de detalhe chamam ``record_view`` em vez de salvar o objeto. Os
+incrementos ficam num buffer em memória e são gravados em lote, com updates
+``F()``, por uma thread em segundo plano, de modo que uma visualização nunca
+espera pelo lock de escrita do SQLite. Os valores pendentes são gravados ao
+encerrar o processo.
+
+Quando um lote falha, suas linhas são gravadas uma a uma, para que uma linha
+ruim não segure as demais. Uma linha que continua falhando é registrada no
+log e descartada depois de ``MAX_FLUSH_ATTEMPTS`` tentativas.
+
+Configurações:
+    VIEW_COUNTER_FLUSH_INTERVAL: segundos entre gravações (padrão 10).
+        Use 0 para gravar cada incremento imediatamente.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 10
+
+# Gravações com falha depois das quais as visualizações de uma linha são descartadas
+MAX_FLUSH_ATTEMPTS = 3
+
+_lock = threading.Lock()
+_pending = Counter()
+# (model_label, pk) -> gravações seguidas com falha
+_failures = Counter()
+_flusher = None
+_stop = threading.Event()
+
+
+def get_flush_interval():
+    return getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+
+def record_view(obj, count=1):
+    """Acumula ``count`` visualizações para ``obj`` (modelo com campo ``views``)."""
+    key = (obj._meta.label, obj.pk)
+    if get_flush_interval() <= 0:
+        _write({key: count})
+        return
+    with _lock:
+        _pending[key] += count
+    _ensure_flusher()
+
+
+async def arecord_view(obj, count=1):
+    """``record_view`` para views assíncronas; só a gravação sem buffer sai do event loop."""
+    if get_flush_interval() <= 0:
+        await sync_to_async(_write)({(obj._meta.label, obj.pk): count})
+        return
+    record_view(obj, count)
+
+
+def pending_views(obj):
+    """Retorna as visualizações de ``obj`` ainda não gravadas no banco."""
+    with _lock:
+        return _pending.get((obj._meta.label, obj.pk), 0)
+
+
+def flush():
+    """Grava no banco todos os incrementos acumulados.
+
+    Retorna o número de visualizações gravadas. Se a gravação do lote falhar,
+    cada linha é tentada sozinha; as que ainda falharem voltam para o buffer
+    até somarem ``MAX_FLUSH_ATTEMPTS`` falhas.
+    """
+    global _pending
+    with _lock:
+        if not _pending:
+            return 0
+        batch, _pending = _pending, Counter()
+    try:
+        _write(batch)
+    except Exception:
+        logger.warning('Não foi possível gravar %d contadores de visualização num lote', len(batch), exc_info=True)
+        return _write_rows(batch)
+    with _lock:
+        for key in batch:
+            _failures.pop(key, None)
+    return sum(batch.values())
+
+
+def _write_rows(batch):
+    written = 0
+    failed = Counter()
+    for (label, pk), count in batch.items():
+        try:
+            _write({(label, pk): count})
+        except Exception:
+            logger.exception('Não foi possível gravar %d visualizações de %s #%s', count, label, pk)
+            failed[(label, pk)] = count
+        else:
+            written += count
+
+    with _lock:
+        for key in batch.keys() - failed.keys():
+            _failures.pop(key, None)
+        for key, count in failed.items():
+            _failures[key] += 1
+            if _failures[key] >= MAX_FLUSH_ATTEMPTS:
+                del _failures[key]
+                logger.error(
+                    '%d visualizações de %s #%s descartadas após %d gravações com falha',
+                    count, key[0], key[1], MAX_FLUSH_ATTEMPTS,
+                )
+            else:
+                _pending[key] += count
+    return written
+
+
+def _write(batch):
+    """Aplica ``{(model_label, pk): count}`` com um UPDATE por modelo e valor."""
+    from django.apps import apps
+
+    grouped = defaultdict(list)
+    for (label, pk), count in batch.items():
+        grouped[(label, count)].append(pk)
+
+    with transaction.atomic():
+        for (label, count), pks in grouped.items():
+            model = apps.get_model(label)
+            model._default_manager.filter(pk__in=pks).update(views=F('views') + count)
+
+
+def _run_flusher():
+    while not _stop.wait(get_flush_interval()):
+        flush()
+        try:
+            close_old_connections()
+        except Exception:
+            logger.exception('Não foi possível fechar conexões antigas com o banco')
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        _flusher = threading.Thread(target=_run_flusher, name='view-counter-flusher', daemon=True)
+        _flusher.start()
+
+
+def shutdown():
+    """Para a thread de gravação e grava o que restar no buffer."""
+    _stop.set()
+    flush()
+
+
+atexit.register(shutdown)
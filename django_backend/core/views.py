@@ -1,103 +1,129 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.contrib import messages
 from django.views.generic import ListView, DetailView
 from django.utils import timezone
+from . import content_cache
+from .conditional import ConditionalDetailMixin, ConditionalListMixin
 from .models import Post, Event, Category, Tag
 from .forms import ContactForm
+from .pagination import KeysetPaginationMixin
+from .search import has_terms, search_queryset
+from .view_counter import record_view
+
+
+# Listas cacheadas compartilhadas com as views assíncronas de core.async_views,
+# que passam content_cache.acached_list e aguardam o resultado
+def featured_posts(cached_list=content_cache.cached_list):
+    return cached_list(
+        'featured_posts',
+        Post.objects.filter(
+            status='published',
+            featured=True,
+            publication_date__lte=timezone.now()
+        ).select_related('author', 'category')[:3],
+        time_bounded=True,
+    )
+
+
+def upcoming_events(cached_list=content_cache.cached_list):
+    return cached_list(
+        'home:upcoming_events',
+        Event.objects.filter(
+            visibility='public',
+            start_date__gt=timezone.now()
+        )[:3],
+        time_bounded=True,
+    )
+
+
+def featured_events(cached_list=content_cache.cached_list):
+    return cached_list(
+        'featured_events',
+        Event.objects.filter(
+            visibility='public',
+            featured=True,
+            start_date__gt=timezone.now()
+        )[:2],
+        time_bounded=True,
+    )
+
+
+def category_names(cached_list=content_cache.cached_list):
+    return cached_list('category_names', Category.objects.values_list('name', flat=True))
 
 
 def home(request):
     """Página inicial"""
-    featured_posts = Post.objects.filter(
-        status='published',
-        featured=True,
-        publication_date__lte=timezone.now()
-    )[:3]
-    
-    upcoming_events = Event.objects.filter(
-        visibility='public',
-        start_date__gt=timezone.now()
-    )[:3]
-    
     context = {
-        'featured_posts': featured_posts,
-        'upcoming_events': upcoming_events,
+        'featured_posts': featured_posts(),
+        'upcoming_events': upcoming_events(),
     }
     return render(request, 'pages/home.html', context)
 
 
-class PostListView(ListView):
+class PostListView(ConditionalListMixin, KeysetPaginationMixin, ListView):
     model = Post
     template_name = 'pages/blog.html'
     context_object_name = 'posts'
     paginate_by = 9
+    keyset_ordering = ('-publication_date', '-id')
     
     def get_queryset(self):
         # Apenas posts publicados e dentro do período válido
         queryset = Post.objects.filter(
             status='published',
             publication_date__lte=timezone.now()
-        )
+        ).select_related('author', 'category')
         
         search = self.request.GET.get('search')
         category = self.request.GET.get('category')
         
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(excerpt__icontains=search) |
-                Q(content__icontains=search) |
-                Q(author__first_name__icontains=search) |
-                Q(author__last_name__icontains=search)
-            )
-        
         if category and category != 'Todos':
             queryset = queryset.filter(category__name=category)
         
+        if has_terms(search):
+            # Resultados da busca vêm ordenados por relevância
+            return search_queryset(queryset, search)
+        
         return queryset.order_by('-publication_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = ['Todos'] + list(
-            Category.objects.values_list('name', flat=True)
-        )
-        context['featured_posts'] = Post.objects.filter(
-            status='published',
-            featured=True,
-            publication_date__lte=timezone.now()
-        )[:3]
+        context['categories'] = ['Todos'] + category_names()
+        context['featured_posts'] = featured_posts()
         return context
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalDetailMixin, DetailView):
     model = Post
     template_name = 'pages/post_detail.html'
     context_object_name = 'post'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
+    validator_fields = ('views',)
     
     def get_queryset(self):
         # Apenas posts publicados
         return Post.objects.filter(
             status='published',
             publication_date__lte=timezone.now()
-        )
+        ).select_related('author', 'category').prefetch_related('tags')
     
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        # Incrementar visualizações
+        # Incremento com buffer; gravado depois em lote via F()
+        record_view(obj)
         obj.views += 1
-        obj.save(update_fields=['views'])
         return obj
 
 
-class EventListView(ListView):
+class EventListView(ConditionalListMixin, KeysetPaginationMixin, ListView):
     model = Event
     template_name = 'pages/eventos.html'
     context_object_name = 'events'
     paginate_by = 12
+    keyset_ordering = ('start_date', 'id')
     
     def get_queryset(self):
         # Apenas eventos públicos e futuros
@@ -108,15 +134,11 @@ class EventListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['featured_events'] = Event.objects.filter(
-            visibility='public',
-            featured=True,
-            start_date__gt=timezone.now()
-        )[:2]
+        context['featured_events'] = featured_events()
         return context
 
 
-class EventDetailView(DetailView):
+class EventDetailView(ConditionalDetailMixin, DetailView):
     model = Event
     template_name = 'pages/event_detail.html'
     context_object_name = 'event'
@@ -128,7 +150,7 @@ class EventDetailView(DetailView):
         return Event.objects.filter(
             visibility='public',
             start_date__gt=timezone.now()
-        )
+        ).prefetch_related('tags')
 
 
 def sobre(request):
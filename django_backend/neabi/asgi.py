@@ -0,0 +1,20 @@
+import os
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neabi.settings')
+# Encaminha as páginas mais lidas para core.async_views
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+application = get_asgi_application()
+
+# Serve os estáticos coletados e pré-comprimidos sem um servidor web separado
+from core.staticfiles import ASGIStaticFilesMiddleware  # noqa: E402
+
+application = ASGIStaticFilesMiddleware(application)
+
+if settings.PRERENDER_SERVE:
+    from core.prerender import ASGIPrerenderedPagesMiddleware
+
+    application = ASGIPrerenderedPagesMiddleware(application)
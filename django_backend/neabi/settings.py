@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -27,12 +27,16 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'core.middleware.RequestProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'core.middleware.LegacySessionBackendMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'neabi.urls'
@@ -41,7 +45,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -49,19 +52,113 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Templates compilados ficam em memória; o autoreloader do runserver
+            # limpa o cache quando um arquivo de template muda
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'neabi.wsgi.application'
+ASGI_APPLICATION = 'neabi.asgi.application'
+
+# Serve as páginas mais lidas com as views assíncronas de core/async_views.py;
+# o asgi.py liga esta opção
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
+# Perfis de conexão do SQLite, escolhidos por SQLITE_PROFILE. 'production'
+# coloca o banco em modo WAL, para que leitores sigam enquanto um escritor
+# faz commit, e abre transações de escrita com BEGIN IMMEDIATE, para que
+# escritores concorrentes esperem o busy timeout em vez de falhar com
+# "database is locked" ao promover uma transação de leitura. 'default' é o
+# SQLite como vem e vale enquanto a implantação não definir
+# SQLITE_PROFILE=production: o modo WAL fica gravado no arquivo do banco e
+# deixa arquivos -wal/-shm ao lado dele, o que um checkout de desenvolvimento
+# não deve ganhar de um simples ``manage.py check``.
+# ``manage.py sqlite_concurrency_benchmark`` compara os dois.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # resiste a quedas da aplicação; o WAL faz fsync nos checkpoints
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negativo significa KiB: 64 MiB por conexão
+    'temp_store': 'MEMORY',
+}
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'timeout': 20,  # busy timeout, em segundos
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    },
+}
+SQLITE_PROFILE = config('SQLITE_PROFILE', default='default')
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_PROFILES[SQLITE_PROFILE],
+    }
+}
+
+# O PostgreSQL substitui o SQLite quando POSTGRES_DB está definido. As
+# conexões ficam abertas por POSTGRES_CONN_MAX_AGE segundos e são testadas
+# antes de cada requisição reaproveitá-las, então um servidor reiniciado
+# custa uma verificação falha em vez de uma requisição falha. A busca passa
+# a usar tsvector com índices GIN (veja core/search.py).
+if config('POSTGRES_DB', default=''):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('POSTGRES_DB'),
+        'USER': config('POSTGRES_USER', default='postgres'),
+        'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+        'HOST': config('POSTGRES_HOST', default='localhost'),
+        'PORT': config('POSTGRES_PORT', default='5432'),
+        'CONN_MAX_AGE': config('POSTGRES_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': 5,
+        },
+    }
+    INSTALLED_APPS.append('django.contrib.postgres')
+
+# Réplicas de leitura: arquivos de banco (SQLite) ou hosts (PostgreSQL),
+# separados por vírgula, com cópias do primário sincronizadas fora do Django.
+# Requisições seguras leem de uma réplica saudável; escritas, e tudo depois
+# delas, vão para o primário. Veja core/db_router.py.
+DATABASE_REPLICAS = []
+REPLICA_KEY = 'HOST' if config('POSTGRES_DB', default='') else 'NAME'
+for number, name in enumerate(config('DATABASE_REPLICAS', default='', cast=Csv()), start=1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {**DATABASES['default'], REPLICA_KEY: name, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+DATABASE_REPLICA_CHECK_INTERVAL = config('DATABASE_REPLICA_CHECK_INTERVAL', default=30, cast=int)  # segundos
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Cache
+# LocMem é por processo: com vários workers, use um backend compartilhado
+# (FileBasedCache, RedisCache) em CACHE_BACKEND para que as invalidações
+# de conteúdo cheguem a todos. O manage.py run_worker não inicia com LocMem.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='neabi'),
     }
 }
 
+# ProfileModelBackend carrega o UserProfile junto com o usuário da sessão (ver
+# core.roles). É o único backend: um segundo ModelBackend verificaria de novo
+# a senha de cada login que falha. As sessões abertas antes dele passam para
+# este backend no LegacySessionBackendMiddleware.
+AUTHENTICATION_BACKENDS = [
+    'core.roles.ProfileModelBackend',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -89,6 +186,18 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic publica os estáticos com nomes versionados pelo conteúdo
+# (css/tailwind.<hash>.css) e cópias .gz/.br; gere antes o bundle com
+# manage.py build_css
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -114,6 +223,76 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 9
 }
 
+# Variantes responsivas geradas no upload (ver core.images)
+IMAGE_DERIVATIVE_WIDTHS = {
+    'thumbnail': 320,
+    'card': 640,
+    'detail': 1280,
+}
+
+# Tarefas em segundo plano (manage.py run_worker)
+TASK_WORKER_CONCURRENCY = config('TASK_WORKER_CONCURRENCY', default=2, cast=int)
+TASK_RETRY_DELAY = config('TASK_RETRY_DELAY', default=30, cast=int)  # segundos, dobra a cada falha
+TASK_LOCK_TIMEOUT = config('TASK_LOCK_TIMEOUT', default=600, cast=int)  # retoma tarefas de workers mortos
+TASKS_EAGER = config('TASKS_EAGER', default=False, cast=bool)  # executa no processo, sem worker
+
+# Cache de conteúdo: tempo de vida das entradas órfãs após troca de geração
+CONTENT_CACHE_TIMEOUT = config('CONTENT_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Cache de páginas inteiras para visitantes anônimos (ver core.page_cache)
+PAGE_CACHE = config('PAGE_CACHE', default=True, cast=bool)
+PAGE_CACHE_URL_NAMES = ['home', 'blog', 'eventos', 'sobre', 'projetos', 'semana_consciencia_negra']
+
+# Cache de fragmentos ({% fragment %} em core.templatetags.fragment_tags); 0 desativa
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=0 if DEBUG else 60 * 60, cast=int)
+
+# Páginas pré-renderizadas (manage.py prerender_site), servidas antes do Django quando ativado
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+PRERENDER_SERVE = config('PRERENDER_SERVE', default=False, cast=bool)
+
+# Contador de visualizações: segundos entre gravações em lote
+VIEW_COUNTER_FLUSH_INTERVAL = config('VIEW_COUNTER_FLUSH_INTERVAL', default=10, cast=int)
+
+# Profiling por requisição (cabeçalho Server-Timing e log em core.profiling)
+REQUEST_PROFILING = config('REQUEST_PROFILING', default=False, cast=bool)
+REQUEST_PROFILING_MEMORY = config('REQUEST_PROFILING_MEMORY', default=True, cast=bool)
+
+# Limite de consultas SQL por página, por nome de URL (ver check_query_budgets)
+QUERY_BUDGETS = {
+    'home': 2,
+    'blog': 4,
+    'eventos': 3,
+    'sobre': 0,
+    'projetos': 0,
+    'semana_consciencia_negra': 0,
+    'post-list': 3,
+    'post-featured': 2,
+    'event-list': 3,
+    'event-featured': 2,
+    'event-upcoming': 2,
+    'admin_dashboard': 8,
+    'dashboard-stats': 6,
+    'admin_post_list': 5,
+    'admin_event_list': 5,
+}
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "tailwind"
 CRISPY_TEMPLATE_PACK = "tailwind"
@@ -1,7 +1,18 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neabi.settings')
 
 application = get_wsgi_application()
+
+# Serve os estáticos coletados e pré-comprimidos sem um servidor web separado
+from core.staticfiles import StaticFilesMiddleware  # noqa: E402
+
+application = StaticFilesMiddleware(application)
+
+if settings.PRERENDER_SERVE:
+    from core.prerender import PrerenderedPagesMiddleware
+
+    application = PrerenderedPagesMiddleware(application)
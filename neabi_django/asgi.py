@@ -0,0 +1,19 @@
+import os
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neabi_django.settings')
+# Route the read-heavy pages to core.async_views
+os.environ.setdefault('ASYNC_VIEWS', '1')
+
+application = get_asgi_application()
+
+# Serve collected, pre-compressed static files without a separate web server
+from core.staticfiles import ASGIStaticFilesMiddleware  # noqa: E402
+
+application = ASGIStaticFilesMiddleware(application)
+
+if settings.PRERENDER_SERVE:
+    from core.prerender import ASGIPrerenderedPagesMiddleware
+
+    application = ASGIPrerenderedPagesMiddleware(application)
@@ -31,12 +31,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'core.middleware.RequestProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'neabi_django.urls'
@@ -45,7 +48,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -53,17 +55,102 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates are kept in memory; runserver's autoreloader
+            # resets the cache when a template file changes
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'neabi_django.wsgi.application'
+ASGI_APPLICATION = 'neabi_django.asgi.application'
+
+# Serve the read-heavy pages with the async views in core/async_views.py;
+# asgi.py turns this on
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '') == '1'
 
 # Database
+# SQLite connection profiles, picked with SQLITE_PROFILE. 'production' puts
+# the database in WAL mode, so readers keep going while a writer commits,
+# and opens write transactions with BEGIN IMMEDIATE, so concurrent writers
+# queue on the busy timeout instead of failing with "database is locked"
+# when a read transaction tries to upgrade. 'default' is SQLite as it ships
+# and is used unless the deployment sets SQLITE_PROFILE=production: WAL mode
+# sticks to the database file and leaves -wal/-shm files next to it, which
+# development checkouts should not get from a plain ``manage.py check``.
+# ``manage.py sqlite_concurrency_benchmark`` compares the two.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # durable across app crashes; WAL fsyncs at checkpoints
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negative means KiB: 64 MiB per connection
+    'temp_store': 'MEMORY',
+}
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'timeout': 20,  # busy timeout, seconds
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    },
+}
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_PROFILES[SQLITE_PROFILE],
+    }
+}
+
+# PostgreSQL replaces SQLite when POSTGRES_DB is set. Connections are kept
+# open for POSTGRES_CONN_MAX_AGE seconds and checked before each request
+# reuses them, so a restarted server costs one failed check instead of a
+# failed request. Search switches to the GIN-indexed tsvector path in
+# core/search.py.
+if os.environ.get('POSTGRES_DB'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ['POSTGRES_DB'],
+        'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.environ.get('POSTGRES_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': 5,
+        },
+    }
+    INSTALLED_APPS.append('django.contrib.postgres')
+
+# Read replicas: comma-separated database files (SQLite) or hosts
+# (PostgreSQL) holding copies of the primary, kept in sync outside Django.
+# Safe requests read from a healthy replica, writes and everything after
+# them go to the primary; see core/db_router.py.
+DATABASE_REPLICAS = []
+REPLICA_KEY = 'HOST' if os.environ.get('POSTGRES_DB') else 'NAME'
+for number, name in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), start=1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {**DATABASES['default'], REPLICA_KEY: name.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+DATABASE_REPLICA_CHECK_INTERVAL = 30  # seconds between health checks
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Cache
+# LocMem is per process: with several workers, point CACHE_BACKEND at a
+# shared backend (FileBasedCache, RedisCache) so content invalidations
+# reach every worker. manage.py run_worker refuses to start on LocMem.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'neabi'),
     }
 }
 
@@ -96,6 +183,18 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Static files are published under content-hashed names (css/tailwind.<hash>.css)
+# with .gz/.br siblings by collectstatic; build the Tailwind bundle first with
+# manage.py build_css
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.assets.StaticFilesStorage',
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -125,6 +224,73 @@ MESSAGE_TAGS = {
     messages.ERROR: 'error',
 }
 
+# Responsive image variants built on upload (see core.images)
+IMAGE_DERIVATIVE_WIDTHS = {
+    'thumbnail': 320,
+    'card': 640,
+    'detail': 1280,
+}
+
+# Background tasks (manage.py run_worker)
+TASK_WORKER_CONCURRENCY = 2
+TASK_RETRY_DELAY = 30  # seconds, doubled after each failed attempt
+TASK_LOCK_TIMEOUT = 600  # reclaim jobs whose worker died after this many seconds
+TASKS_EAGER = False  # run jobs in-process after commit, without a worker
+
+# Content cache: lifetime of entries orphaned by a generation bump
+CONTENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Page cache: whole public pages for anonymous visitors (see core.page_cache)
+PAGE_CACHE = True
+PAGE_CACHE_URL_NAMES = ['home', 'blog', 'eventos', 'sobre', 'projetos', 'semana_consciencia_negra']
+
+# Fragment cache ({% fragment %} in core.templatetags.fragment_tags); 0 disables it
+FRAGMENT_CACHE_TIMEOUT = 0 if DEBUG else 60 * 60
+
+# Prerendered pages (manage.py prerender_site); served ahead of Django when enabled
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+PRERENDER_SERVE = os.environ.get('PRERENDER_SERVE', '') == '1'
+
+# View counter: seconds between batched writes of buffered post views
+VIEW_COUNTER_FLUSH_INTERVAL = 10
+
+# Request profiling (Server-Timing headers and core.profiling log lines)
+REQUEST_PROFILING = False
+REQUEST_PROFILING_MEMORY = True
+
+# Maximum SQL queries per page, by URL name. core/tests/test_query_budgets.py
+# asserts them; manage.py check_query_budgets runs them against a live database.
+QUERY_BUDGETS = {
+    'home': 2,
+    'blog': 4,
+    'eventos': 4,
+    'sobre': 0,
+    'projetos': 0,
+    'semana_consciencia_negra': 0,
+    'admin_dashboard': 9,
+    'admin_dashboard_stats': 6,
+    'admin_posts': 4,
+    'admin_events': 4,
+    'admin_messages': 5,
+}
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 # Email configuration (for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -1,6 +1,17 @@
 import os
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neabi_django.settings')
 
 application = get_wsgi_application()
+
+# Serve collected, pre-compressed static files without a separate web server
+from core.staticfiles import StaticFilesMiddleware  # noqa: E402
+
+application = StaticFilesMiddleware(application)
+
+if settings.PRERENDER_SERVE:
+    from core.prerender import PrerenderedPagesMiddleware
+
+    application = PrerenderedPagesMiddleware(application)